@@ -0,0 +1,2 @@
+# app/commands/__init__.py
+# Tareas de mantenimiento ejecutables con `python -m app.commands.<tarea>`
@@ -0,0 +1,29 @@
+"""Recalcular el contador totalAnimales de todas las razas
+
+Uso: python -m app.commands.repair_raza_counts
+
+El comando corre en su propio proceso: solo vacía la caché de respuestas de
+los workers si usan el backend compartido (RESPONSE_CACHE_BACKEND=shared). Con
+el backend en memoria los workers siguen sirviendo los contadores anteriores
+hasta que expire el TTL o se reinicien; en ese caso es preferible
+POST /api/v1/razas/repair-counts, que invalida las cachés del worker que la
+atiende.
+"""
+import asyncio
+import logging
+
+from ..core.database import connect_db, disconnect_db, prisma
+from ..services.raza_service import RazaService
+
+logger = logging.getLogger(__name__)
+
+async def main() -> int:
+    await connect_db()
+    try:
+        return await RazaService(prisma).repair_animal_counts()
+    finally:
+        await disconnect_db()
+
+if __name__ == "__main__":
+    fixed = asyncio.run(main())
+    print(f"Razas corregidas: {fixed}")
@@ -0,0 +1,136 @@
+from prisma import Prisma
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Dimensiones por las que se puede agrupar, en el orden de la celda
+STATS_DIMENSIONS = ("codRaza", "sexo", "edad", "colorPelaje")
+
+# (codRaza, sexo, edad, colorPelaje)
+Cell = Tuple[str, str, int, str]
+
+
+class AnimalStats:
+    """Resumen en memoria de la tabla Animales para los reportes
+
+    Guarda el número de animales por cada combinación de raza, sexo, edad y
+    color de pelaje. Las escrituras de AnimalService lo actualizan de forma
+    incremental y una reconstrucción periódica con `group_by` corrige las
+    desviaciones (escrituras externas a la API).
+    """
+
+    def __init__(self):
+        self._cells: Dict[Cell, int] = {}
+        self.loaded = False
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        # Variaciones recibidas mientras se reconstruye (None si no hay reconstrucción)
+        self._rebuild_deltas: Optional[Dict[Cell, int]] = None
+
+    @staticmethod
+    def _cell(animal: Any) -> Cell:
+        if isinstance(animal, dict):
+            return tuple(animal[name] for name in STATS_DIMENSIONS)
+        return tuple(getattr(animal, name) for name in STATS_DIMENSIONS)
+
+    def add(self, animal: Any, delta: int = 1) -> None:
+        """Sumar (o restar con delta negativo) un animal (modelo o datos de Prisma) a su celda"""
+        if not self.loaded and self._rebuild_deltas is None:
+            return
+        cell = self._cell(animal)
+        if self._rebuild_deltas is not None:
+            self._rebuild_deltas[cell] = self._rebuild_deltas.get(cell, 0) + delta
+        if self.loaded:
+            self._apply(self._cells, cell, delta)
+
+    @staticmethod
+    def _apply(cells: Dict[Cell, int], cell: Cell, delta: int) -> None:
+        count = cells.get(cell, 0) + delta
+        if count > 0:
+            cells[cell] = count
+        else:
+            cells.pop(cell, None)
+
+    def add_many(self, animals: Iterable[Any]) -> None:
+        """Sumar varios animales"""
+        for animal in animals:
+            self.add(animal)
+
+    def move(self, before: Any, after: Any) -> None:
+        """Pasar un animal de la celda de sus valores anteriores a la de los nuevos"""
+        if self._cell(before) != self._cell(after):
+            self.add(before, -1)
+            self.add(after)
+
+    def summarize(self, group_by: List[str], edad_bucket: int = 1) -> Tuple[int, List[dict]]:
+        """Total y conteo por cada combinación de las dimensiones pedidas"""
+        positions = [STATS_DIMENSIONS.index(name) for name in group_by]
+        groups: Dict[tuple, int] = {}
+        total = 0
+        for cell, count in self._cells.items():
+            key = tuple(
+                cell[position] - cell[position] % edad_bucket if STATS_DIMENSIONS[position] == "edad" else cell[position]
+                for position in positions
+            )
+            groups[key] = groups.get(key, 0) + count
+            total += count
+
+        return total, [
+            {**dict(zip(group_by, key)), "count": count}
+            for key, count in sorted(groups.items())
+        ]
+
+    async def rebuild(self, db: Prisma) -> None:
+        """Reconstruir el resumen completo con un GROUP BY en la base de datos
+
+        Las variaciones que llegan mientras se espera la consulta se vuelven a
+        aplicar sobre el resultado, para que el reemplazo no las descarte. Los
+        servicios actualizan el resumen justo después de confirmar la
+        escritura, así que solo una escritura confirmada en el instante previo
+        al GROUP BY podría contarse dos veces (la siguiente reconstrucción lo
+        corrige).
+        """
+        async with self._lock:
+            self._rebuild_deltas = {}
+            try:
+                rows = await db.animal.group_by(by=list(STATS_DIMENSIONS), count=True)
+                cells = {
+                    tuple(row[name] for name in STATS_DIMENSIONS): row["_count"]["_all"]
+                    for row in rows
+                }
+                for cell, delta in self._rebuild_deltas.items():
+                    self._apply(cells, cell, delta)
+                self._cells = cells
+                self.loaded = True
+            finally:
+                self._rebuild_deltas = None
+        logger.info("Resumen de animales reconstruido: %s combinaciones", len(self._cells))
+
+    async def _rebuild_loop(self, db: Prisma, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.rebuild(db)
+            except Exception as e:
+                logger.warning("No se pudo reconstruir el resumen de animales: %s", e)
+
+    def start_rebuild(self, db: Prisma, interval: float) -> None:
+        """Iniciar la reconstrucción periódica en segundo plano"""
+        if self._task is None and interval > 0:
+            self._task = asyncio.create_task(self._rebuild_loop(db, interval))
+
+    async def stop_rebuild(self) -> None:
+        """Detener la reconstrucción periódica"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Instancia global compartida por los servicios
+animal_stats = AnimalStats()
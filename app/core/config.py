@@ -1,10 +1,14 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from typing import Optional
+from typing import Dict, Literal, Optional
 
 class Settings(BaseSettings):
     # Database
     database_url: str = Field(..., alias="DATABASE_URL")
+    # Réplicas de solo lectura separadas por coma (vacío = todo va a la primaria)
+    database_replica_urls: str = Field("", alias="DATABASE_REPLICA_URLS")
+    # Segundos que un cliente lee de la primaria después de escribir (read-your-writes)
+    read_your_writes_seconds: float = 5.0
     
     # API Info
     api_title: str = "Animal Management API"
@@ -24,6 +28,89 @@ class Settings(BaseSettings):
     upload_dir: str = Field(..., alias="UPLOAD_DIR")
     max_file_size: int = Field(..., alias="MAX_FILE_SIZE")
 
+    # Totales de listados (segundos)
+    count_cache_ttl: float = 30.0
+    count_estimate_max_age: float = 300.0
+
+    # Snapshot en memoria de Razas (segundos entre reconciliaciones, 0 = desactivado)
+    raza_snapshot_refresh_seconds: float = 60.0
+
+    # Operaciones en lote
+    bulk_max_items: int = 10000
+    bulk_batch_size: int = 1000
+    bulk_tx_timeout: float = 60.0
+    batch_get_max_codes: int = 5000
+
+    # Agrupación de búsquedas concurrentes por clave (ventana en ms y claves por lote)
+    loader_window_ms: float = 1.0
+    loader_max_batch: int = 100
+
+    # Exportación en streaming
+    export_chunk_size: int = 1000
+
+    # Importación de archivos (bytes y filas por bloque)
+    import_max_file_size: int = 1024 * 1024 * 1024
+    import_batch_size: int = 1000
+
+    # ETag de listados (segundos de validez entre workers)
+    list_etag_ttl: float = 30.0
+
+    # Caché de respuestas de listados y detalles: memory (LRU por proceso), shared
+    # (SQLite compartido por los workers del host, en response_cache_path) o none
+    response_cache_backend: Literal["memory", "shared", "none"] = "memory"
+    response_cache_ttl: float = 30.0
+    response_cache_max_entries: int = 10000
+    response_cache_path: Optional[str] = None
+
+    # Control de admisión delante del motor de Prisma: solicitudes concurrentes
+    # por presupuesto, cola de espera acotada y espera máxima antes de un 503
+    admission_enabled: bool = True
+    admission_read_limit: int = 32
+    admission_write_limit: int = 8
+    admission_bulk_limit: int = 2
+    admission_read_queue: int = 256
+    admission_write_queue: int = 64
+    admission_bulk_queue: int = 4
+    admission_queue_timeout: float = 2.0
+    admission_retry_after: int = 1
+    # Ajuste AIMD de los límites de lectura y escritura según la latencia observada
+    admission_adaptive: bool = False
+    admission_target_latency: float = 0.25
+    admission_min_limit: int = 2
+
+    # Readiness (/ready): validez y plazo del ping a la base de datos (segundos)
+    ready_ping_ttl: float = 2.0
+    ready_ping_timeout: float = 2.0
+    # Calentamiento al arrancar: consultas representativas (en paralelo) antes de aceptar tráfico
+    warmup_enabled: bool = True
+    warmup_concurrency: int = 4
+
+    # Búsqueda de texto: índices FULLTEXT de MySQL o índice invertido en memoria
+    search_backend: Literal["fulltext", "memory"] = "fulltext"
+    search_max_results: int = 1000
+    # Índice en memoria: segundos entre recargas completas (recoge las escrituras
+    # de otros workers; 0 = desactivado)
+    search_index_refresh_seconds: float = 300.0
+
+    # Resumen en memoria para estadísticas (segundos entre reconstrucciones, 0 = desactivado)
+    animal_stats_rebuild_seconds: float = 300.0
+
+    # Logging: cola en memoria con un hilo escritor, JSON por línea y muestreo de
+    # INFO/DEBUG por prefijo de logger (p. ej. {"app.services": 0.1})
+    log_level: str = "INFO"
+    log_format: Literal["json", "text"] = "json"
+    log_queue_size: int = 10000
+    log_sampling: Dict[str, float] = {}
+
+    # Métricas en formato Prometheus en /metrics
+    metrics_enabled: bool = True
+
+    # Trazas de consultas por solicitud (cabecera Server-Timing, archivo JSON lines opcional
+    # y aviso de N+1 en modo debug a partir de este número de consultas con la misma forma)
+    trace_enabled: bool = True
+    trace_span_file: Optional[str] = None
+    trace_n_plus_one_threshold: int = 5
+
     class Config:
         env_file = ".env"
         case_sensitive = False
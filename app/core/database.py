@@ -1,32 +1,197 @@
 from prisma import Prisma
-from typing import AsyncGenerator
+from fastapi import Request
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Iterator, List, Optional
+import time
 import logging
 
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
+from .config import settings
+from ..utils.admission import AdmissionTicket, current_ticket, limiter_for
+from ..utils.metrics import db_connected, db_connection_events_total, record_query
+from ..utils.tracing import record_span
+
 logger = logging.getLogger(__name__)
 
+class InstrumentedPrisma(Prisma):
+    """Cliente de Prisma que mide y traza cada consulta enviada al motor
+
+    Todas las operaciones (incluidas query_raw/execute_raw) pasan por
+    `_execute`; las copias que crea `tx()` conservan la clase, así que las
+    consultas dentro de transacciones también se miden.
+    """
+
+    __slots__ = ()
+
+    async def _execute(self, method: str, arguments: dict, *args: Any, **kwargs: Any) -> Any:
+        # Turno de admisión de la solicitud en curso (ninguno en tareas de fondo)
+        ticket = current_ticket.get()
+        if ticket is not None:
+            await ticket.ensure()
+        start = time.perf_counter()
+        try:
+            return await super()._execute(method, arguments, *args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            record_query(method, duration)
+            model = kwargs.get("model")
+            record_span(getattr(model, "__name__", None), method, arguments, start, duration)
+
+    def _copy(self) -> Prisma:
+        new = super()._copy()
+        # Misma estructura (__slots__ vacío): basta con cambiar la clase de la copia
+        new.__class__ = type(self)
+        return new
+
 # Instancia global de Prisma
-prisma = Prisma()
+prisma = InstrumentedPrisma()
+
+# Clientes de las réplicas de solo lectura (DATABASE_REPLICA_URLS)
+replicas: List[InstrumentedPrisma] = [
+    InstrumentedPrisma(datasource={"url": url.strip()})
+    for url in settings.database_replica_urls.split(",")
+    if url.strip()
+]
+
+# Identidad del cliente HTTP de la solicitud en curso (la fija get_db)
+current_client: ContextVar[Optional[str]] = ContextVar("current_client", default=None)
+
+# Lecturas forzadas a la primaria en el contexto actual (ver ReadRouter.primary_reads)
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+
+# Clientes recordados como máximo antes de purgar los que ya expiraron
+MAX_PINNED_CLIENTS = 10000
+
+class ReadRouter:
+    """Reparte las lecturas entre las réplicas en round-robin
+
+    Un cliente que acaba de escribir queda fijado a la primaria durante
+    `window` segundos para que lea sus propias escrituras a pesar del retraso
+    de replicación. El registro es por proceso: con varios workers solo queda
+    fijado en el worker que atendió la escritura.
+    """
+
+    def __init__(self, primary: Prisma, replicas: List[Prisma], window: float):
+        self.primary = primary
+        self.replicas = replicas
+        self.window = window
+        self._next = 0
+        self._pinned: Dict[str, float] = {}
+
+    def mark_write(self, client: Optional[str]) -> None:
+        """Fijar el cliente a la primaria durante la ventana de read-your-writes"""
+        if client is None or not self.replicas:
+            return
+        now = time.monotonic()
+        if len(self._pinned) >= MAX_PINNED_CLIENTS:
+            self._pinned = {key: until for key, until in self._pinned.items() if until > now}
+        self._pinned[client] = now + self.window
+
+    def is_pinned(self, client: Optional[str]) -> bool:
+        until = self._pinned.get(client) if client is not None else None
+        return until is not None and until > time.monotonic()
+
+    @contextmanager
+    def primary_reads(self) -> Iterator[None]:
+        """Leer de la primaria dentro del bloque (y en las tareas que se creen en él)"""
+        token = _primary_reads.set(True)
+        try:
+            yield
+        finally:
+            _primary_reads.reset(token)
+
+    def reader(self, db: Prisma) -> Prisma:
+        """Cliente para una lectura hecha con `db`
+
+        Solo se desvían las lecturas sobre la primaria global (no las de una
+        transacción) de clientes que no acaban de escribir; si ninguna réplica
+        está conectada se lee de la primaria.
+        """
+        if (
+            db is not self.primary or not self.replicas
+            or _primary_reads.get() or self.is_pinned(current_client.get())
+        ):
+            return db
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next]
+            self._next = (self._next + 1) % len(self.replicas)
+            if replica.is_connected():
+                return replica
+        return db
+
+read_router = ReadRouter(prisma, replicas, settings.read_your_writes_seconds)
 
 async def connect_db():
     """Conectar a la base de datos"""
     try:
         await prisma.connect()
+        db_connection_events_total.inc("connect")
+        db_connected.set(1)
         logger.info("✅ Conexión a la base de datos establecida")
     except Exception as e:
-        logger.error(f"❌ Error conectando a la base de datos: {e}")
+        db_connection_events_total.inc("connect_error")
+        logger.error("❌ Error conectando a la base de datos: %s", e)
         raise
+    
+    # Una réplica caída no impide arrancar: sus lecturas van a la primaria
+    for index, replica in enumerate(replicas, start=1):
+        try:
+            await replica.connect()
+            logger.info("✅ Conexión a la réplica %s establecida", index)
+        except Exception as e:
+            db_connection_events_total.inc("connect_error")
+            logger.error("❌ Error conectando a la réplica %s: %s", index, e)
 
 async def disconnect_db():
     """Desconectar de la base de datos"""
+    for replica in replicas:
+        if replica.is_connected():
+            await replica.disconnect()
     try:
         await prisma.disconnect()
+        db_connection_events_total.inc("disconnect")
+        db_connected.set(0)
         logger.info("✅ Desconexión de la base de datos exitosa")
     except Exception as e:
-        logger.error(f"❌ Error desconectando de la base de datos: {e}")
+        db_connection_events_total.inc("disconnect_error")
+        logger.error("❌ Error desconectando de la base de datos: %s", e)
         raise
 
-async def get_db() -> AsyncGenerator[Prisma, None]:
-    """Dependency para obtener la instancia de Prisma"""
-    yield prisma
+@asynccontextmanager
+async def _request_db(request: Request, writes: bool) -> AsyncIterator[Prisma]:
+    """Cliente, admisión y read-your-writes de una solicitud"""
+    # Cabecera X-Client-Id para distinguir clientes detrás de un mismo proxy
+    client = request.headers.get("x-client-id") or (request.client.host if request.client else None)
+    current_client.set(client)
+    
+    # Control de admisión: las lecturas esperan turno con su primera consulta
+    # (los aciertos de caché y los 304 no lo ocupan); escrituras y lotes lo
+    # toman aquí para no esperar con una transacción o un streaming abiertos
+    limiter = limiter_for(request)
+    ticket = AdmissionTicket(limiter) if limiter is not None else None
+    current_ticket.set(ticket)
+    if ticket is not None and limiter.budget != "read":
+        await ticket.ensure()
+    
+    if writes:
+        read_router.mark_write(client)
+    try:
+        yield prisma
+    finally:
+        # El turno se conserva hasta terminar la respuesta (incluido el streaming)
+        if ticket is not None:
+            ticket.release()
+        if writes:
+            # La ventana cuenta desde el final de la escritura (también si
+            # falló); la marca inicial cubre lecturas que lleguen antes
+            read_router.mark_write(client)
+
+async def get_db(request: Request) -> AsyncGenerator[Prisma, None]:
+    """Dependency para obtener la instancia de Prisma (rutas de solo lectura)"""
+    async with _request_db(request, writes=False) as db:
+        yield db
+
+async def get_write_db(request: Request) -> AsyncGenerator[Prisma, None]:
+    """Dependency para las rutas que escriben: fija al cliente a la primaria"""
+    async with _request_db(request, writes=True) as db:
+        yield db
@@ -0,0 +1,202 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional, TextIO
+
+from .config import settings
+from ..utils.metrics import Counter, registry
+
+# Identificador de la solicitud en curso (lo fija RequestIdMiddleware)
+current_request_id: ContextVar[Optional[str]] = ContextVar("current_request_id", default=None)
+
+# Identificadores recibidos en X-Request-ID que se aceptan tal cual
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+# Atributos propios de LogRecord: el resto son campos pasados con `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "request_id"}
+
+log_records_dropped_total = registry.register(Counter(
+    "log_records_dropped_total", "Registros de log descartados por cola llena o muestreo", ("reason",)
+))
+
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por línea con la solicitud y los campos de `extra=`"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            entry["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    """Añadir el identificador de la solicitud (se lee en el hilo que emite el registro)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = current_request_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Conservar solo una fracción de los registros INFO/DEBUG de los loggers indicados
+
+    `rates` asocia un prefijo de logger con la fracción conservada (0..1); se
+    aplica el prefijo más largo. Los avisos y errores nunca se descartan.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self._cache: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._cache.get(name)
+        if rate is None:
+            rate = next(
+                (value for prefix, value in self.rates if name == prefix or name.startswith(prefix + ".")),
+                1.0
+            )
+            self._cache[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        log_records_dropped_total.inc("sampled")
+        return False
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que nunca bloquea al que emite: con la cola llena descarta el registro"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolver el mensaje y la traza aquí; el formato final lo hace el hilo escritor
+        record = logging.makeLogRecord(vars(record))
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped_total.inc("queue_full")
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    queue_size: Optional[int] = None,
+    sampling: Optional[Dict[str, float]] = None,
+    stream: Optional[TextIO] = None
+) -> logging.handlers.QueueListener:
+    """Configurar el logger raíz: cola en memoria y un hilo que escribe en `stream`
+
+    Los loggers solo encolan el registro (con el id de la solicitud y tras el
+    muestreo); el formato y la escritura, que pueden bloquear, ocurren en el
+    hilo del QueueListener, fuera del event loop. Reemplaza cualquier
+    configuración anterior del logger raíz.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    log_format = log_format or settings.log_format
+    writer = logging.StreamHandler(stream or sys.stderr)
+    writer.setFormatter(
+        JsonFormatter() if log_format == "json"
+        else logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s")
+    )
+
+    handler = NonBlockingQueueHandler(queue.Queue(queue_size or settings.log_queue_size))
+    handler.addFilter(SamplingFilter(settings.log_sampling if sampling is None else sampling))
+    handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level or settings.log_level)
+
+    _listener = logging.handlers.QueueListener(handler.queue, writer, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Escribir los registros pendientes y detener el hilo escritor"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+class RequestIdMiddleware:
+    """Middleware ASGI: identificador por solicitud en los logs y en la cabecera X-Request-ID
+
+    Se respeta el X-Request-ID recibido si es un identificador razonable
+    (para seguir una solicitud a través del proxy); si no, se genera uno.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = current_request_id.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request_id.reset(token)
@@ -0,0 +1,114 @@
+from prisma import Prisma
+from prisma.models import Raza
+from typing import Dict, Iterable, List, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RazaSnapshot:
+    """Copia en memoria y versionada de la tabla Razas
+
+    La tabla es pequeña y cambia poco, así que se carga completa al arrancar.
+    Las escrituras de RazaService la actualizan al momento y una reconciliación
+    periódica recoge los cambios hechos fuera de la aplicación. Cada cambio
+    reemplaza el diccionario completo, de modo que los lectores nunca ven un
+    estado a medias.
+
+    Las escrituras que llegan mientras una carga espera a la base de datos se
+    registran y se vuelven a aplicar sobre el resultado de la carga, que
+    puede ser anterior a ellas.
+    """
+
+    def __init__(self):
+        self._razas: Dict[str, Raza] = {}
+        self.version = 0
+        self.loaded = False
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        # Escrituras durante la carga en curso: código -> raza (None si se quitó)
+        self._load_writes: Optional[Dict[str, Optional[Raza]]] = None
+
+    def get(self, cod_raza: str) -> Optional[Raza]:
+        """Obtener una raza del snapshot"""
+        return self._razas.get(cod_raza)
+
+    def all(self) -> List[Raza]:
+        """Obtener todas las razas ordenadas por código"""
+        return [self._razas[cod] for cod in sorted(self._razas)]
+
+    def put(self, raza: Raza) -> None:
+        """Insertar o reemplazar una raza"""
+        razas = dict(self._razas)
+        razas[raza.codRaza] = raza
+        self._record({raza.codRaza: raza})
+        self._replace(razas)
+
+    def put_many(self, razas: Iterable[Raza]) -> None:
+        """Insertar o reemplazar varias razas con un único cambio de versión"""
+        changes = {raza.codRaza: raza for raza in razas}
+        merged = dict(self._razas)
+        merged.update(changes)
+        self._record(changes)
+        self._replace(merged)
+
+    def remove(self, cod_raza: str) -> None:
+        """Quitar una raza del snapshot"""
+        self._record({cod_raza: None})
+        if cod_raza in self._razas:
+            razas = dict(self._razas)
+            del razas[cod_raza]
+            self._replace(razas)
+
+    def _record(self, changes: Dict[str, Optional[Raza]]) -> None:
+        if self._load_writes is not None:
+            self._load_writes.update(changes)
+
+    def _replace(self, razas: Dict[str, Raza]) -> None:
+        self._razas = razas
+        self.version += 1
+
+    async def load(self, db: Prisma) -> None:
+        """Cargar (o recargar) la tabla completa desde la base de datos"""
+        async with self._lock:
+            self._load_writes = {}
+            try:
+                loaded = {raza.codRaza: raza for raza in await db.raza.find_many()}
+                for cod_raza, raza in self._load_writes.items():
+                    if raza is None:
+                        loaded.pop(cod_raza, None)
+                    else:
+                        loaded[cod_raza] = raza
+                self._replace(loaded)
+                self.loaded = True
+            finally:
+                self._load_writes = None
+        logger.info("Snapshot de razas cargado: %s razas (versión %s)", len(loaded), self.version)
+
+    async def _reconcile_loop(self, db: Prisma, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.load(db)
+            except Exception as e:
+                logger.warning("No se pudo reconciliar el snapshot de razas: %s", e)
+
+    def start_reconcile(self, db: Prisma, interval: float) -> None:
+        """Iniciar la reconciliación periódica en segundo plano"""
+        if self._task is None and interval > 0:
+            self._task = asyncio.create_task(self._reconcile_loop(db, interval))
+
+    async def stop_reconcile(self) -> None:
+        """Detener la reconciliación periódica"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Instancia global compartida por los servicios
+raza_snapshot = RazaSnapshot()
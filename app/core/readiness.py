@@ -0,0 +1,102 @@
+from prisma import Prisma
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from .config import settings
+from ..utils.metrics import Gauge, registry
+
+logger = logging.getLogger(__name__)
+
+startup_phase_seconds = registry.register(Gauge(
+    "startup_phase_seconds", "Duración de cada fase del arranque", ("phase",)
+))
+app_ready = registry.register(Gauge(
+    "app_ready", "1 si el worker terminó el arranque y acepta tráfico"
+))
+
+
+class StartupTimer:
+    """Duración de las fases del arranque, registrada en el log y en /metrics"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.phases[name] = duration
+            startup_phase_seconds.set(round(duration, 6), name)
+            logger.info("⏱️ Arranque - %s: %.1f ms", name, duration * 1000)
+
+    def finish(self) -> float:
+        """Registrar la duración total del arranque"""
+        total = time.perf_counter() - self._started
+        self.phases["total"] = total
+        startup_phase_seconds.set(round(total, 6), "total")
+        logger.info("⏱️ Arranque completo en %.1f ms", total * 1000)
+        return total
+
+
+class Readiness:
+    """Estado de preparación del worker para /ready
+
+    El worker está listo cuando terminó el arranque (incluido el
+    calentamiento) y la base de datos responde. El ping se cachea `ttl`
+    segundos y las comprobaciones concurrentes comparten el mismo ping, así que
+    un sondeo frecuente no añade carga a la base de datos.
+    """
+
+    def __init__(self, ttl: float, timeout: float):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.ready = False
+        self._result: Tuple[bool, Optional[str]] = (False, "sin comprobar")
+        self._checked_at = float("-inf")
+        self._pending: Optional[asyncio.Future] = None
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        app_ready.set(1)
+
+    def mark_not_ready(self) -> None:
+        self.ready = False
+        app_ready.set(0)
+
+    async def ping(self, db: Prisma) -> Tuple[bool, Optional[str]]:
+        """Resultado del último ping vigente: (accesible, error)"""
+        if time.monotonic() - self._checked_at < self.ttl:
+            return self._result
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._ping(db))
+        # shield: si se cancela una solicitud el ping sigue para las demás
+        return await asyncio.shield(self._pending)
+
+    async def _ping(self, db: Prisma) -> Tuple[bool, Optional[str]]:
+        try:
+            if not db.is_connected():
+                result = (False, "sin conexión")
+            else:
+                await asyncio.wait_for(db.query_raw("SELECT 1"), self.timeout)
+                result = (True, None)
+        except asyncio.TimeoutError:
+            result = (False, f"sin respuesta en {self.timeout} s")
+        except Exception as e:
+            result = (False, str(e) or type(e).__name__)
+
+        self._result = result
+        self._checked_at = time.monotonic()
+        self._pending = None
+        return result
+
+
+# Instancias globales del proceso
+startup_timer = StartupTimer()
+readiness = Readiness(ttl=settings.ready_ping_ttl, timeout=settings.ready_ping_timeout)
@@ -0,0 +1,175 @@
+from prisma import Prisma
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import math
+import re
+import unicodedata
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (tipo, código): "animal" o "raza" y su clave primaria
+DocumentKey = Tuple[str, str]
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Separar un texto en términos en minúsculas y sin tildes"""
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    plain = "".join(char for char in normalized if not unicodedata.combining(char))
+    return _TOKEN.findall(plain)
+
+
+class SearchIndex:
+    """Índice invertido en memoria sobre las descripciones de animales y razas
+
+    Alternativa al índice FULLTEXT de MySQL para despliegues locales (SQLite)
+    y pruebas: se carga completo al arrancar y los servicios lo actualizan en
+    cada escritura. Mientras no esté cargado, las actualizaciones se ignoran.
+
+    El índice es del proceso: con varios workers, las escrituras atendidas por
+    otro worker solo aparecen tras la siguiente recarga periódica
+    (`search_index_refresh_seconds`). Para resultados al momento con varios
+    workers, usar el backend FULLTEXT.
+    """
+
+    def __init__(self):
+        self._documents: Dict[DocumentKey, str] = {}
+        self._terms: Dict[DocumentKey, Set[str]] = {}
+        self._postings: Dict[str, Set[DocumentKey]] = {}
+        self.loaded = False
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        # Escrituras durante la carga en curso: documento -> descripción (None si se quitó)
+        self._load_writes: Optional[Dict[DocumentKey, Optional[str]]] = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def put(self, tipo: str, codigo: str, descripcion: str) -> None:
+        """Indexar (o reindexar) un documento"""
+        if self._load_writes is not None:
+            self._load_writes[(tipo, codigo)] = descripcion
+        if not self.loaded:
+            return
+        key = (tipo, codigo)
+        self._remove(key)
+        terms = set(tokenize(descripcion))
+        self._documents[key] = descripcion
+        self._terms[key] = terms
+        for term in terms:
+            self._postings.setdefault(term, set()).add(key)
+
+    def remove(self, tipo: str, codigo: str) -> None:
+        """Quitar un documento del índice"""
+        if self._load_writes is not None:
+            self._load_writes[(tipo, codigo)] = None
+        if self.loaded:
+            self._remove((tipo, codigo))
+
+    def _remove(self, key: DocumentKey) -> None:
+        for term in self._terms.pop(key, ()):
+            postings = self._postings[term]
+            postings.discard(key)
+            if not postings:
+                del self._postings[term]
+        self._documents.pop(key, None)
+
+    def search(
+        self,
+        query: str,
+        offset: int,
+        limit: int,
+        tipo: Optional[str] = None
+    ) -> List[Tuple[str, str, str, float]]:
+        """Documentos que contienen algún término, ordenados por relevancia (tf-idf)"""
+        total = len(self._documents)
+        scores: Dict[DocumentKey, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + total / len(postings))
+            for key in postings:
+                if tipo is None or key[0] == tipo:
+                    scores[key] = scores.get(key, 0.0) + idf
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [
+            (key[0], key[1], self._documents[key], score)
+            for key, score in ranked[offset:offset + limit]
+        ]
+
+    async def load(self, db: Prisma, chunk_size: int = 1000) -> None:
+        """Construir el índice completo desde la base de datos
+
+        Se construye aparte y se reemplaza al final, así que las búsquedas
+        nunca ven un índice a medias; las escrituras recibidas durante la
+        carga se vuelven a aplicar sobre el resultado.
+        """
+        async with self._lock:
+            self._load_writes = {}
+            try:
+                fresh = await self._build(db, chunk_size)
+                for (tipo, codigo), descripcion in self._load_writes.items():
+                    if descripcion is None:
+                        fresh.remove(tipo, codigo)
+                    else:
+                        fresh.put(tipo, codigo, descripcion)
+                self._documents, self._terms, self._postings = fresh._documents, fresh._terms, fresh._postings
+                self.loaded = True
+            finally:
+                self._load_writes = None
+
+        logger.info("Índice de búsqueda cargado: %s documentos, %s términos", len(self), len(self._postings))
+
+    @staticmethod
+    async def _build(db: Prisma, chunk_size: int) -> "SearchIndex":
+        fresh = SearchIndex()
+        fresh.loaded = True
+
+        for raza in await db.raza.find_many():
+            fresh.put("raza", raza.codRaza, raza.descripcion)
+
+        # Recorrido por clave primaria en bloques para no cargar la tabla de una vez
+        last_code = None
+        while True:
+            animals = await db.animal.find_many(
+                where={"codAnimal": {"gt": last_code}} if last_code is not None else {},
+                take=chunk_size,
+                order={"codAnimal": "asc"}
+            )
+            for animal in animals:
+                fresh.put("animal", animal.codAnimal, animal.descripcion)
+            if len(animals) < chunk_size:
+                break
+            last_code = animals[-1].codAnimal
+        return fresh
+
+    async def _reload_loop(self, db: Prisma, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.load(db)
+            except Exception as e:
+                logger.warning("No se pudo recargar el índice de búsqueda: %s", e)
+
+    def start_reload(self, db: Prisma, interval: float) -> None:
+        """Iniciar la recarga periódica en segundo plano"""
+        if self._task is None and interval > 0:
+            self._task = asyncio.create_task(self._reload_loop(db, interval))
+
+    async def stop_reload(self) -> None:
+        """Detener la recarga periódica"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Instancia global compartida por los servicios
+search_index = SearchIndex()
@@ -1,19 +1,25 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
 import logging
 
 from .core.config import settings
-from .core.database import connect_db, disconnect_db
-from .routes import animal_routes, raza_routes
+from .core.logging_config import RequestIdMiddleware, setup_logging
+from .core.database import connect_db, disconnect_db, prisma
+from .core.animal_stats import animal_stats
+from .core.raza_snapshot import raza_snapshot
+from .core.readiness import readiness, startup_timer
+from .core.search_index import search_index
+from .routes import animal_routes, raza_routes, import_routes, productos, search_routes
+from .services.warmup_service import WarmupService
 from .utils.exceptions import BaseAPIException
+from .utils.loader import loader_stats
+from .utils.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from .utils.tracing import TracingMiddleware
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Configurar logging (cola + hilo escritor, JSON con id de solicitud)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 @asynccontextmanager
@@ -21,13 +27,33 @@ async def lifespan(app: FastAPI):
     """Gestión del ciclo de vida de la aplicación"""
     # Startup
     logger.info("🚀 Iniciando la aplicación...")
-    await connect_db()
+    with startup_timer.phase("conexión a la base de datos"):
+        await connect_db()
+    with startup_timer.phase("snapshot de razas"):
+        await raza_snapshot.load(prisma)
+    raza_snapshot.start_reconcile(prisma, settings.raza_snapshot_refresh_seconds)
+    if settings.search_backend == "memory":
+        with startup_timer.phase("índice de búsqueda"):
+            await search_index.load(prisma)
+        search_index.start_reload(prisma, settings.search_index_refresh_seconds)
+    with startup_timer.phase("resumen de estadísticas"):
+        await animal_stats.rebuild(prisma)
+    animal_stats.start_rebuild(prisma, settings.animal_stats_rebuild_seconds)
+    if settings.warmup_enabled:
+        with startup_timer.phase("calentamiento"):
+            await WarmupService(prisma).warm_up()
+    startup_timer.finish()
+    readiness.mark_ready()
     logger.info("✅ Aplicación iniciada correctamente")
     
     yield
     
     # Shutdown
     logger.info("🔄 Cerrando la aplicación...")
+    readiness.mark_not_ready()
+    await raza_snapshot.stop_reconcile()
+    await animal_stats.stop_rebuild()
+    await search_index.stop_reload()
     await disconnect_db()
     logger.info("✅ Aplicación cerrada correctamente")
 
@@ -51,6 +77,17 @@ app.add_middleware(
     allow_headers=settings.cors_headers,
 )
 
+# Trazas de consultas por solicitud (Server-Timing, archivo de spans, aviso de N+1)
+if settings.trace_enabled:
+    app.add_middleware(TracingMiddleware)
+
+# Métricas por plantilla de ruta (middleware ASGI puro, sin copiar el cuerpo)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# Id de solicitud en los logs y en X-Request-ID (el más externo: cubre a los demás)
+app.add_middleware(RequestIdMiddleware)
+
 # Manejador de excepciones personalizado
 @app.exception_handler(BaseAPIException)
 async def api_exception_handler(request, exc: BaseAPIException):
@@ -60,12 +97,13 @@ async def api_exception_handler(request, exc: BaseAPIException):
             "error": True,
             "message": exc.detail,
             "status_code": exc.status_code
-        }
+        },
+        headers=exc.headers
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc: Exception):
-    logger.error(f"Error no manejado: {exc}")
+    logger.error("Error no manejado: %s", exc, exc_info=exc)
     return JSONResponse(
         status_code=500,
         content={
@@ -88,16 +126,48 @@ async def root():
 
 @app.get("/health", tags=["Health"])
 async def health_check():
-    """Verificación de salud de la API"""
+    """Verificación de salud de la API (el proceso responde; ver /ready para la base de datos)"""
     return {
         "status": "healthy",
         "message": "API funcionando correctamente",
         "version": settings.api_version
     }
 
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """Preparación para recibir tráfico: arranque completo y base de datos accesible"""
+    database_ok, error = await readiness.ping(prisma)
+    ready = readiness.ready and database_ok
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "started": readiness.ready,
+            "database": "ok" if database_ok else error,
+            "startup_ms": {name: round(duration * 1000, 1) for name, duration in startup_timer.phases.items()}
+        },
+        headers=None if ready else {"Retry-After": str(settings.admission_retry_after)}
+    )
+
+if settings.metrics_enabled:
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def metrics():
+        """Métricas de la aplicación y del motor de Prisma en formato Prometheus"""
+        body = registry.render()
+        if prisma.is_connected():
+            try:
+                # Pool de conexiones y consultas del motor (preview feature "metrics")
+                body += await prisma.get_metrics(format="prometheus")
+            except Exception as e:
+                logger.warning("No se pudieron obtener las métricas del motor de Prisma: %s", e)
+        return Response(content=body, media_type=CONTENT_TYPE)
+
 # Incluir routers
 app.include_router(animal_routes.router, prefix="/api/v1")
 app.include_router(raza_routes.router, prefix="/api/v1")
+app.include_router(import_routes.router, prefix="/api/v1")
+app.include_router(productos.router, prefix="/api/v1")
+app.include_router(search_routes.router, prefix="/api/v1")
 
 # Información adicional para el desarrollador
 if settings.debug:
@@ -109,3 +179,8 @@ if settings.debug:
             "debug": settings.debug,
             "database_url": settings.database_url.split("@")[-1] if "@" in settings.database_url else "No configurada"
         }
+
+    @app.get("/debug/loaders", tags=["Debug"], include_in_schema=False)
+    async def debug_loaders():
+        """Contadores de agrupación de búsquedas por clave"""
+        return {name: stats.as_dict() for name, stats in loader_stats.items()}
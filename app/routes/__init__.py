@@ -2,7 +2,10 @@
 
 from .animal_routes import router as animal_router # Asumiendo que tus rutas están en un APIRouter llamado 'router'
 from .raza_routes import router as raza_router
+from .import_routes import router as import_router
+from .productos import router as producto_router
+from .search_routes import router as search_router
 
 __all__ = [
-    "animal_router", "raza_router"
+    "animal_router", "raza_router", "import_router", "producto_router", "search_router"
 ]
\ No newline at end of file
@@ -1,69 +1,272 @@
-from fastapi import APIRouter, Depends, Query, Path
-from typing import List
+from fastapi import APIRouter, Depends, Query, Path, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
 from prisma import Prisma
 
-from ..core.database import get_db
+from ..core.database import get_db, get_write_db
 from ..services.animal_service import AnimalService
 from ..schemas.animal import (
     AnimalCreate, 
     AnimalUpdate, 
     AnimalResponse, 
-    AnimalListResponse
+    AnimalFilter,
+    AnimalListResponse,
+    AnimalBulkCreate,
+    AnimalBulkResponse,
+    AnimalBatchGet,
+    AnimalBatchResponse,
+    AnimalStatsGroup,
+    AnimalStatsResponse
 )
+from ..core.animal_stats import STATS_DIMENSIONS
+from ..utils.count_cache import TotalMode
+from ..utils.etags import (
+    row_etag,
+    list_etag,
+    is_not_modified,
+    not_modified_response,
+    parse_if_match
+)
+from ..utils.export import ANIMAL_EXPORT_FIELDS, encode_csv, encode_ndjson
+from ..utils.fieldsets import parse_fields, parse_include, project_model, public_fields, with_items
+from ..utils.response_cache import ANIMAL_TABLE, animal_tag, raza_animals_tag, raza_tag, response_cache
+from ..utils.responses import fast_json_response
 from ..utils.exceptions import NotFoundError, AlreadyExistsError, ValidationError
 
 router = APIRouter(prefix="/animales", tags=["Animales"])
 
+ANIMAL_RELATIONS = ("raza",)
+
+def _animal_etag(animal, include_raza: bool = True) -> str:
+    """ETag de un animal: su versión y la de la raza que incluye la respuesta"""
+    if not include_raza:
+        return row_etag(animal.version)
+    return row_etag(animal.version, animal.raza.version if animal.raza else 0)
+
+def _animal_view(fields: Optional[str], include: Optional[str]) -> tuple[type, bool]:
+    """Esquema de respuesta reducido a `fields` / `include` y si hace falta la raza
+
+    Sin parámetros se devuelve el animal completo con su raza; con `fields`
+    la raza solo se incluye si se pide explícitamente con `include=raza`.
+    """
+    selected = parse_fields(fields, AnimalResponse, ANIMAL_RELATIONS, required=("cod_animal",))
+    relations = parse_include(include, ANIMAL_RELATIONS, default=ANIMAL_RELATIONS if selected is None else ())
+    exclude = {name for name in ANIMAL_RELATIONS if name not in relations}
+    if selected is not None:
+        exclude |= {name for name in public_fields(AnimalResponse, ANIMAL_RELATIONS).values() if name not in selected}
+    return project_model(AnimalResponse, frozenset(exclude)), "raza" in relations
+
+def _split_values(value: Optional[str]) -> Optional[List[str]]:
+    """Separar un filtro de varios valores (A,B,C); None si no se indicó"""
+    if value is None:
+        return None
+    values = [item.strip() for item in value.split(",") if item.strip()]
+    return values or None
+
 @router.post("/", response_model=AnimalResponse, status_code=201)
 async def crear_animal(
     animal_data: AnimalCreate,
-    db: Prisma = Depends(get_db)
+    db: Prisma = Depends(get_write_db)
 ):
     """Crear un nuevo animal"""
     service = AnimalService(db)
-    return await service.create_animal(animal_data)
+    animal = await service.create_animal(animal_data)
+    return fast_json_response(
+        AnimalResponse, animal, status_code=201, headers={"ETag": _animal_etag(animal)}
+    )
+
+@router.post("/bulk", response_model=AnimalBulkResponse)
+async def crear_animales_en_lote(
+    bulk_data: AnimalBulkCreate,
+    db: Prisma = Depends(get_write_db)
+):
+    """Crear muchos animales en una sola solicitud con reporte por elemento"""
+    service = AnimalService(db)
+    return await service.create_animals_bulk(bulk_data.animals)
 
 @router.get("/", response_model=AnimalListResponse)
 async def listar_animales(
+    request: Request,
     page: int = Query(1, ge=1, description="Número de página"),
     size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en next_cursor (activa la paginación por cursor)"),
+    include_total: bool = Query(True, description="Incluir el total de registros en la respuesta"),
+    total_mode: TotalMode = Query("exact", description="exact: total vigente; estimated: admite un total cacheado con antigüedad acotada"),
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por coma (p. ej. codAnimal,descripcion)"),
+    include: Optional[str] = Query(None, description="Relaciones a incluir (raza); por defecto solo si no se indica fields"),
+    sexo: Optional[str] = Query(None, description="Sexo (uno o varios separados por coma: M,F)"),
+    edad_min: Optional[int] = Query(None, ge=0, le=50, description="Edad mínima (inclusive)"),
+    edad_max: Optional[int] = Query(None, ge=0, le=50, description="Edad máxima (inclusive)"),
+    cod_raza: Optional[str] = Query(None, description="Código de raza (uno o varios separados por coma)"),
+    color_pelaje: Optional[str] = Query(None, description="Color del pelaje (uno o varios separados por coma)"),
+    color_ojos: Optional[str] = Query(None, description="Color de los ojos (uno o varios separados por coma)"),
     db: Prisma = Depends(get_db)
 ):
-    """Obtener lista de animales con paginación"""
+    """Obtener lista de animales con paginación y filtros combinables"""
+    if edad_min is not None and edad_max is not None and edad_min > edad_max:
+        raise ValidationError("edad_min no puede ser mayor que edad_max")
+    filters = AnimalFilter(
+        sexo=_split_values(sexo),
+        edad_min=edad_min,
+        edad_max=edad_max,
+        cod_raza=_split_values(cod_raza),
+        color_pelaje=_split_values(color_pelaje),
+        color_ojos=_split_values(color_ojos)
+    )
+    
+    schema, include_raza = _animal_view(fields, include)
+    etag = list_etag(request, "animal", "raza") if include_raza else list_etag(request, "animal")
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    cached = await response_cache.lookup(request)
+    if cached is not None:
+        return cached
+    
     service = AnimalService(db)
     skip = (page - 1) * size
-    animals, total = await service.get_all_animals(skip=skip, limit=size)
+    animals, total, next_cursor = await service.get_all_animals(
+        skip=skip,
+        limit=size,
+        cursor=cursor,
+        include_total=include_total,
+        total_mode=total_mode,
+        include_raza=include_raza,
+        filters=filters
+    )
     
-    return AnimalListResponse(
+    response = fast_json_response(with_items(AnimalListResponse, "animals", schema), dict(
         animals=animals,
         total=total,
-        page=page,
-        size=size
+        page=page if cursor is None else None,
+        size=size,
+        next_cursor=next_cursor
+    ), headers={"ETag": etag})
+    tags = {ANIMAL_TABLE}
+    if include_raza:
+        tags.update(raza_tag(animal.codRaza) for animal in animals)
+    return await response_cache.store(request, response, tags)
+
+@router.get("/export")
+async def exportar_animales(
+    formato: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="Formato de exportación"),
+    cod_raza: Optional[str] = Query(None, description="Exportar solo los animales de esta raza"),
+    db: Prisma = Depends(get_db)
+):
+    """Exportar todos los animales en streaming (NDJSON o CSV)"""
+    service = AnimalService(db)
+    chunks = service.iter_animals(cod_raza=cod_raza)
+    
+    if formato == "csv":
+        body = encode_csv(chunks, ANIMAL_EXPORT_FIELDS)
+        media_type = "text/csv; charset=utf-8"
+    else:
+        body = encode_ndjson(chunks, ANIMAL_EXPORT_FIELDS)
+        media_type = "application/x-ndjson"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="animales.{formato}"'}
     )
 
+@router.get("/stats", response_model=AnimalStatsResponse)
+async def estadisticas_animales(
+    group_by: str = Query("codRaza,sexo", description=f"Dimensiones separadas por coma: {', '.join(STATS_DIMENSIONS)}"),
+    edad_bucket: int = Query(5, ge=1, le=50, description="Amplitud de los tramos de edad (años)"),
+    db: Prisma = Depends(get_db)
+):
+    """Conteo de animales agrupado por raza, sexo, tramo de edad y/o color de pelaje"""
+    dimensions = list(dict.fromkeys(_split_values(group_by) or []))
+    unknown = [name for name in dimensions if name not in STATS_DIMENSIONS]
+    if unknown:
+        raise ValidationError(
+            f"Dimensiones no válidas: {', '.join(unknown)}. "
+            f"Dimensiones disponibles: {', '.join(STATS_DIMENSIONS)}"
+        )
+    
+    service = AnimalService(db)
+    total, groups = await service.get_stats(dimensions, edad_bucket)
+    
+    # Cada grupo solo lleva las dimensiones pedidas
+    exclude = frozenset(
+        name for alias, name in public_fields(AnimalStatsGroup, ("count",)).items()
+        if alias not in dimensions
+    )
+    schema = with_items(AnimalStatsResponse, "groups", project_model(AnimalStatsGroup, exclude))
+    return fast_json_response(schema, dict(
+        total=total,
+        group_by=dimensions,
+        edad_bucket=edad_bucket,
+        groups=groups
+    ))
+
+@router.post("/batch-get", response_model=AnimalBatchResponse)
+async def obtener_animales_por_codigos(
+    batch_data: AnimalBatchGet,
+    db: Prisma = Depends(get_db)
+):
+    """Obtener varios animales por código en una sola consulta"""
+    service = AnimalService(db)
+    animals, missing = await service.get_animals_by_codes(batch_data.codes)
+    return fast_json_response(AnimalBatchResponse, dict(animals=animals, missing=missing))
+
+@router.get("/batch-get", response_model=AnimalBatchResponse)
+async def obtener_animales_por_codigos_query(
+    codes: str = Query(..., min_length=1, description="Códigos separados por coma (A,B,C)"),
+    db: Prisma = Depends(get_db)
+):
+    """Obtener varios animales por código en una sola consulta"""
+    service = AnimalService(db)
+    code_list = [code.strip() for code in codes.split(",") if code.strip()]
+    if not code_list:
+        raise ValidationError("Debe indicar al menos un código")
+    animals, missing = await service.get_animals_by_codes(code_list)
+    return fast_json_response(AnimalBatchResponse, dict(animals=animals, missing=missing))
+
 @router.get("/{cod_animal}", response_model=AnimalResponse)
 async def obtener_animal(
+    request: Request,
     cod_animal: str = Path(..., description="Código del animal"),
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por coma (p. ej. codAnimal,descripcion)"),
+    include: Optional[str] = Query(None, description="Relaciones a incluir (raza); por defecto solo si no se indica fields"),
     db: Prisma = Depends(get_db)
 ):
     """Obtener un animal específico por su código"""
+    schema, include_raza = _animal_view(fields, include)
+    cached = await response_cache.lookup(request)
+    if cached is not None:
+        return cached
+    
     service = AnimalService(db)
-    return await service.get_animal_by_code(cod_animal)
+    animal = await service.get_animal_by_code(cod_animal)
+    
+    etag = _animal_etag(animal, include_raza)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    response = fast_json_response(schema, animal, headers={"ETag": etag})
+    tags = {animal_tag(cod_animal)}
+    if include_raza:
+        tags.add(raza_tag(animal.codRaza))
+    return await response_cache.store(request, response, tags)
 
 @router.put("/{cod_animal}", response_model=AnimalResponse)
 async def actualizar_animal(
+    request: Request,
     animal_data: AnimalUpdate,
     cod_animal: str = Path(..., description="Código del animal"),
-    db: Prisma = Depends(get_db)
+    db: Prisma = Depends(get_write_db)
 ):
-    """Actualizar un animal existente"""
+    """Actualizar un animal existente (admite If-Match para concurrencia optimista)"""
     service = AnimalService(db)
-    return await service.update_animal(cod_animal, animal_data)
+    animal = await service.update_animal(
+        cod_animal, animal_data, expected_version=parse_if_match(request)
+    )
+    return fast_json_response(AnimalResponse, animal, headers={"ETag": _animal_etag(animal)})
 
 @router.delete("/{cod_animal}", status_code=204)
 async def eliminar_animal(
     cod_animal: str = Path(..., description="Código del animal"),
-    db: Prisma = Depends(get_db)
+    db: Prisma = Depends(get_write_db)
 ):
     """Eliminar un animal"""
     service = AnimalService(db)
@@ -71,23 +274,46 @@ async def eliminar_animal(
 
 @router.get("/raza/{cod_raza}", response_model=AnimalListResponse)
 async def listar_animales_por_raza(
+    request: Request,
     cod_raza: str = Path(..., description="Código de la raza"),
     page: int = Query(1, ge=1, description="Número de página"),
     size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en next_cursor (activa la paginación por cursor)"),
+    include_total: bool = Query(True, description="Incluir el total de registros en la respuesta"),
+    total_mode: TotalMode = Query("exact", description="exact: total vigente; estimated: admite un total cacheado con antigüedad acotada"),
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por coma (p. ej. codAnimal,descripcion)"),
+    include: Optional[str] = Query(None, description="Relaciones a incluir (raza); por defecto solo si no se indica fields"),
     db: Prisma = Depends(get_db)
 ):
     """Obtener animales de una raza específica"""
+    schema, include_raza = _animal_view(fields, include)
+    etag = list_etag(request, "animal", "raza") if include_raza else list_etag(request, "animal")
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    cached = await response_cache.lookup(request)
+    if cached is not None:
+        return cached
+    
     service = AnimalService(db)
     skip = (page - 1) * size
-    animals, total = await service.get_animals_by_raza(
+    animals, total, next_cursor = await service.get_animals_by_raza(
         cod_raza=cod_raza, 
         skip=skip, 
-        limit=size
+        limit=size,
+        cursor=cursor,
+        include_total=include_total,
+        total_mode=total_mode,
+        include_raza=include_raza
     )
     
-    return AnimalListResponse(
+    response = fast_json_response(with_items(AnimalListResponse, "animals", schema), dict(
         animals=animals,
         total=total,
-        page=page,
-        size=size
-    )
\ No newline at end of file
+        page=page if cursor is None else None,
+        size=size,
+        next_cursor=next_cursor
+    ), headers={"ETag": etag})
+    tags = {raza_animals_tag(cod_raza)}
+    if include_raza:
+        tags.add(raza_tag(cod_raza))
+    return await response_cache.store(request, response, tags)
\ No newline at end of file
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, File, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Literal, Optional
+from prisma import Prisma
+
+from ..core.config import settings
+from ..core.database import get_db, get_write_db
+from ..schemas.importacion import ImportProgress
+from ..services.import_service import ImportService
+from ..utils.exceptions import ValidationError
+from ..utils.importers import detect_format, iter_batches, iter_rows
+
+router = APIRouter(prefix="/import", tags=["Importación"])
+
+def _open_batches(file: UploadFile, formato: Optional[str]):
+    """Validar el archivo subido y preparar su lectura por bloques"""
+    if file.size is not None and file.size > settings.import_max_file_size:
+        raise ValidationError(
+            f"El archivo supera el tamaño máximo permitido ({settings.import_max_file_size} bytes)"
+        )
+    formato = detect_format(file.filename, formato)
+    return iter_batches(iter_rows(file.file, formato), settings.import_batch_size)
+
+async def _stream_progress(progress: AsyncIterator[ImportProgress]) -> AsyncIterator[bytes]:
+    async for item in progress:
+        yield (item.model_dump_json() + "\n").encode("utf-8")
+
+@router.post("/animales")
+async def importar_animales(
+    file: UploadFile = File(..., description="Archivo CSV o NDJSON con animales"),
+    formato: Optional[Literal["csv", "ndjson"]] = Query(None, alias="format", description="Formato del archivo"),
+    db: Prisma = Depends(get_write_db)
+):
+    """Importar animales desde un archivo, informando el avance en NDJSON"""
+    batches = _open_batches(file, formato)
+    service = ImportService(db)
+    return StreamingResponse(
+        _stream_progress(service.import_animals(batches)),
+        media_type="application/x-ndjson"
+    )
+
+@router.post("/razas")
+async def importar_razas(
+    file: UploadFile = File(..., description="Archivo CSV o NDJSON con razas"),
+    formato: Optional[Literal["csv", "ndjson"]] = Query(None, alias="format", description="Formato del archivo"),
+    db: Prisma = Depends(get_write_db)
+):
+    """Importar razas desde un archivo, informando el avance en NDJSON"""
+    batches = _open_batches(file, formato)
+    service = ImportService(db)
+    return StreamingResponse(
+        _stream_progress(service.import_razas(batches)),
+        media_type="application/x-ndjson"
+    )
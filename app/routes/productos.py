@@ -1,25 +1,43 @@
-# ============== ROUTES ==============
+from fastapi import APIRouter, Depends, Query, Path
+from typing import Optional
+from prisma import Prisma
 
-# app/routes/productos.py
-from fastapi import APIRouter, HTTPException
-from app.services.producto_service import ProductoService
+from ..core.database import get_db
+from ..services.producto_service import ProductoService
+from ..schemas.producto import ProductoResponse, ProductoListResponse
 
-router = APIRouter(prefix="/api/productos", tags=["productos"])
+router = APIRouter(prefix="/productos", tags=["Productos"])
 
-@router.get("/")
-async def obtener_productos():
-    response = await ProductoService.get_all()
+@router.get("/", response_model=ProductoListResponse)
+async def listar_productos(
+    size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en next_cursor"),
+    db: Prisma = Depends(get_db)
+):
+    """Obtener lista de productos con paginación por cursor"""
+    service = ProductoService(db)
+    productos, next_cursor = await service.get_all_productos(limit=size, cursor=cursor)
     
-    if response["status"] != 200:
-        raise HTTPException(status_code=response["status"], detail=response["message"])
-    
-    return response
+    return ProductoListResponse(
+        productos=productos,
+        size=size,
+        next_cursor=next_cursor
+    )
 
-@router.get("/{producto_id}")
-async def obtener_producto(producto_id: int):
-    response = await ProductoService.get_one(producto_id)
-    
-    if response["status"] != 200:
-        raise HTTPException(status_code=response["status"], detail=response["message"])
-    
-    return response
+@router.get("/codigo/{codigo}", response_model=ProductoResponse)
+async def obtener_producto_por_codigo(
+    codigo: str = Path(..., description="Código único del producto"),
+    db: Prisma = Depends(get_db)
+):
+    """Obtener un producto por su código"""
+    service = ProductoService(db)
+    return await service.get_producto_by_codigo(codigo)
+
+@router.get("/{producto_id}", response_model=ProductoResponse)
+async def obtener_producto(
+    producto_id: int = Path(..., description="Id del producto"),
+    db: Prisma = Depends(get_db)
+):
+    """Obtener un producto por su id"""
+    service = ProductoService(db)
+    return await service.get_producto_by_id(producto_id)
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, Query, Path
-from typing import List
+from fastapi import APIRouter, Depends, Query, Path, Request
+from typing import List, Optional
 from prisma import Prisma
 
-from ..core.database import get_db
+from ..core.database import get_db, get_write_db
 from ..services.raza_service import RazaService
 from ..schemas.raza import (
     RazaCreate, 
@@ -11,6 +11,16 @@ from ..schemas.raza import (
     RazaListResponse,
     RazaWithAnimalsResponse
 )
+from ..utils.count_cache import TotalMode
+from ..utils.etags import (
+    row_etag,
+    list_etag,
+    is_not_modified,
+    not_modified_response,
+    parse_if_match
+)
+from ..utils.response_cache import RAZA_TABLE, raza_count_tag, raza_tag, response_cache
+from ..utils.responses import fast_json_response
 from ..utils.exceptions import NotFoundError, AlreadyExistsError, ValidationError
 
 router = APIRouter(prefix="/razas", tags=["Razas"])
@@ -18,74 +28,137 @@ router = APIRouter(prefix="/razas", tags=["Razas"])
 @router.post("/", response_model=RazaResponse, status_code=201)
 async def crear_raza(
     raza_data: RazaCreate,
-    db: Prisma = Depends(get_db)
+    db: Prisma = Depends(get_write_db)
 ):
     """Crear una nueva raza"""
     service = RazaService(db)
-    return await service.create_raza(raza_data)
+    raza = await service.create_raza(raza_data)
+    return fast_json_response(
+        RazaResponse, raza, status_code=201, headers={"ETag": row_etag(raza.version)}
+    )
+
+@router.post("/repair-counts")
+async def reparar_contadores(
+    db: Prisma = Depends(get_write_db)
+):
+    """Recalcular el contador de animales de cada raza e invalidar las cachés de este worker"""
+    service = RazaService(db)
+    fixed = await service.repair_animal_counts()
+    return {"fixed": fixed}
 
 @router.get("/", response_model=RazaListResponse)
 async def listar_razas(
+    request: Request,
     page: int = Query(1, ge=1, description="Número de página"),
     size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en next_cursor (activa la paginación por cursor)"),
+    include_total: bool = Query(True, description="Incluir el total de registros en la respuesta"),
+    total_mode: TotalMode = Query("exact", description="exact: total vigente; estimated: admite un total cacheado con antigüedad acotada"),
     db: Prisma = Depends(get_db)
 ):
     """Obtener lista de razas con paginación"""
+    etag = list_etag(request, "raza")
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    cached = await response_cache.lookup(request)
+    if cached is not None:
+        return cached
+    
     service = RazaService(db)
     skip = (page - 1) * size
-    razas, total = await service.get_all_razas(skip=skip, limit=size)
+    razas, total, next_cursor = await service.get_all_razas(
+        skip=skip,
+        limit=size,
+        cursor=cursor,
+        include_total=include_total,
+        total_mode=total_mode
+    )
     
-    return RazaListResponse(
+    response = fast_json_response(RazaListResponse, dict(
         razas=razas,
         total=total,
-        page=page,
-        size=size
-    )
+        page=page if cursor is None else None,
+        size=size,
+        next_cursor=next_cursor
+    ), headers={"ETag": etag})
+    return await response_cache.store(request, response, {RAZA_TABLE})
 
 @router.get("/with-count", response_model=List[RazaWithAnimalsResponse])
 async def listar_razas_con_conteo(
+    request: Request,
     page: int = Query(1, ge=1, description="Número de página"),
     size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
     db: Prisma = Depends(get_db)
 ):
     """Obtener lista de razas con conteo de animales"""
+    etag = list_etag(request, "raza", "animal")
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    cached = await response_cache.lookup(request)
+    if cached is not None:
+        return cached
+    
     service = RazaService(db)
     skip = (page - 1) * size
-    razas, total = await service.get_razas_with_animal_count(skip=skip, limit=size)
-    return razas
+    razas, _ = await service.get_razas_with_animal_count(skip=skip, limit=size, include_total=False)
+    response = fast_json_response(List[RazaWithAnimalsResponse], razas, headers={"ETag": etag})
+    tags = {RAZA_TABLE} | {raza_count_tag(raza.cod_raza) for raza in razas}
+    return await response_cache.store(request, response, tags)
 
 @router.get("/{cod_raza}", response_model=RazaResponse)
 async def obtener_raza(
+    request: Request,
     cod_raza: str = Path(..., description="Código de la raza"),
     db: Prisma = Depends(get_db)
 ):
     """Obtener una raza específica por su código"""
+    cached = await response_cache.lookup(request)
+    if cached is not None:
+        return cached
+    
     service = RazaService(db)
-    return await service.get_raza_by_code(cod_raza)
+    raza = await service.get_raza_by_code(cod_raza)
+    
+    etag = row_etag(raza.version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    response = fast_json_response(RazaResponse, raza, headers={"ETag": etag})
+    return await response_cache.store(request, response, {raza_tag(cod_raza)})
 
 @router.get("/{cod_raza}/with-count", response_model=RazaWithAnimalsResponse)
 async def obtener_raza_con_conteo(
+    request: Request,
     cod_raza: str = Path(..., description="Código de la raza"),
     db: Prisma = Depends(get_db)
 ):
     """Obtener una raza con el conteo de sus animales"""
+    cached = await response_cache.lookup(request)
+    if cached is not None:
+        return cached
+    
     service = RazaService(db)
-    return await service.get_raza_with_animals_count(cod_raza)
+    raza = await service.get_raza_with_animals_count(cod_raza)
+    response = fast_json_response(RazaWithAnimalsResponse, raza)
+    return await response_cache.store(request, response, {raza_tag(cod_raza), raza_count_tag(cod_raza)})
 
 @router.put("/{cod_raza}", response_model=RazaResponse)
 async def actualizar_raza(
+    request: Request,
     raza_data: RazaUpdate,
     cod_raza: str = Path(..., description="Código de la raza"),
-    db: Prisma = Depends(get_db)
+    db: Prisma = Depends(get_write_db)
 ):
-    """Actualizar una raza existente"""
+    """Actualizar una raza existente (admite If-Match para concurrencia optimista)"""
     service = RazaService(db)
-    return await service.update_raza(cod_raza, raza_data)
+    raza = await service.update_raza(
+        cod_raza, raza_data, expected_version=parse_if_match(request)
+    )
+    return fast_json_response(RazaResponse, raza, headers={"ETag": row_etag(raza.version)})
 
 @router.delete("/{cod_raza}", status_code=204)
 async def eliminar_raza(
     cod_raza: str = Path(..., description="Código de la raza"),
-    db: Prisma = Depends(get_db)
+    db: Prisma = Depends(get_write_db)
 ):
     """Eliminar una raza (solo si no tiene animales asociados)"""
     service = RazaService(db)
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from prisma import Prisma
+
+from ..core.database import get_db
+from ..services.search_service import SearchService
+from ..schemas.search import SearchResponse, SearchType
+from ..utils.responses import fast_json_response
+
+router = APIRouter(prefix="/search", tags=["Búsqueda"])
+
+@router.get("", response_model=SearchResponse)
+async def buscar(
+    q: str = Query(..., min_length=1, max_length=255, description="Texto a buscar en las descripciones"),
+    tipo: Optional[SearchType] = Query(None, description="Limitar la búsqueda a animales o a razas"),
+    size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en next_cursor"),
+    db: Prisma = Depends(get_db)
+):
+    """Buscar animales y razas por descripción, ordenados por relevancia"""
+    service = SearchService(db)
+    results, next_cursor = await service.search(q, limit=size, cursor=cursor, tipo=tipo)
+    return fast_json_response(SearchResponse, dict(
+        results=results,
+        size=size,
+        next_cursor=next_cursor
+    ))
@@ -1,9 +1,27 @@
 # app/schemas/__init__.py
 
-from .animal import AnimalCreate, AnimalUpdate, AnimalResponse, AnimalListResponse
-from .raza import RazaCreate, RazaUpdate, RazaResponse, RazaListResponse, RazaWithAnimalsResponse
+from .animal import (
+    AnimalCreate, AnimalUpdate, AnimalResponse, AnimalFilter, AnimalListResponse,
+    AnimalStatsGroup, AnimalStatsResponse,
+    AnimalBulkCreate, AnimalBulkItemResult, AnimalBulkResponse,
+    AnimalBatchGet, AnimalBatchResponse
+)
+from .raza import (
+    RazaCreate, RazaUpdate, RazaResponse, RazaListResponse, RazaWithAnimalsResponse,
+    RazaBulkItemResult, RazaBulkResponse
+)
+from .importacion import ImportRowError, ImportProgress
+from .producto import ProductoResponse, ProductoListResponse
+from .search import SearchResult, SearchResponse
 
 __all__ = [
-    "AnimalCreate", "AnimalUpdate", "AnimalResponse", "AnimalListResponse",
-    "RazaCreate", "RazaUpdate", "RazaResponse", "RazaListResponse", "RazaWithAnimalsResponse"
+    "AnimalCreate", "AnimalUpdate", "AnimalResponse", "AnimalFilter", "AnimalListResponse",
+    "AnimalStatsGroup", "AnimalStatsResponse",
+    "AnimalBulkCreate", "AnimalBulkItemResult", "AnimalBulkResponse",
+    "AnimalBatchGet", "AnimalBatchResponse",
+    "RazaCreate", "RazaUpdate", "RazaResponse", "RazaListResponse", "RazaWithAnimalsResponse",
+    "RazaBulkItemResult", "RazaBulkResponse",
+    "ImportRowError", "ImportProgress",
+    "ProductoResponse", "ProductoListResponse",
+    "SearchResult", "SearchResponse"
 ]
\ No newline at end of file
@@ -33,9 +33,63 @@ class AnimalResponse(AnimalBase):
         from_attributes = True
         populate_by_name = True
 
+class AnimalFilter(BaseModel):
+    """Filtros combinables para el listado de animales (listas = cualquiera de los valores)"""
+    sexo: Optional[list[str]] = None
+    edad_min: Optional[int] = Field(None, ge=0, le=50)
+    edad_max: Optional[int] = Field(None, ge=0, le=50)
+    cod_raza: Optional[list[str]] = None
+    color_pelaje: Optional[list[str]] = None
+    color_ojos: Optional[list[str]] = None
+
 class AnimalListResponse(BaseModel):
     """Esquema para lista de animales"""
     animals: list[AnimalResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
+    next_cursor: Optional[str] = None
+
+class AnimalStatsGroup(BaseModel):
+    """Conteo de animales de una combinación de dimensiones"""
+    cod_raza: Optional[str] = Field(None, alias="codRaza")
+    sexo: Optional[str] = None
+    edad: Optional[int] = Field(None, description="Edad inicial del tramo")
+    color_pelaje: Optional[str] = Field(None, alias="colorPelaje")
+    count: int
+    
+    class Config:
+        populate_by_name = True
+
+class AnimalStatsResponse(BaseModel):
+    """Esquema de respuesta para las estadísticas de animales"""
+    total: int
+    group_by: list[str]
+    edad_bucket: int
+    groups: list[AnimalStatsGroup]
+
+class AnimalBulkCreate(BaseModel):
+    """Esquema para crear animales en lote"""
+    animals: list[AnimalCreate] = Field(..., min_length=1, description="Animales a crear")
+
+class AnimalBulkItemResult(BaseModel):
+    """Resultado de un animal dentro de una creación en lote"""
+    index: int
+    cod_animal: str
+    success: bool
+    error: Optional[str] = None
+
+class AnimalBulkResponse(BaseModel):
+    """Esquema de respuesta para la creación en lote"""
+    created: int
+    failed: int
+    results: list[AnimalBulkItemResult]
+
+class AnimalBatchGet(BaseModel):
+    """Esquema para obtener varios animales por código"""
+    codes: list[str] = Field(..., min_length=1, description="Códigos de los animales")
+
+class AnimalBatchResponse(BaseModel):
+    """Esquema de respuesta para la obtención por lote"""
+    animals: list[AnimalResponse]
+    missing: list[str]
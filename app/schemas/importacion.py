@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List
+
+class ImportRowError(BaseModel):
+    """Error de una fila del archivo importado"""
+    row: int
+    error: str
+
+class ImportProgress(BaseModel):
+    """Avance de una importación, emitido tras cada bloque procesado"""
+    done: bool = False
+    processed: int
+    created: int
+    failed: int
+    errors: List[ImportRowError] = []
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+class ProductoResponse(BaseModel):
+    """Esquema de respuesta para Producto"""
+    id: int
+    codigo: str
+    nombre: str
+    descripcion: str
+    cantidad: int
+    precio: int
+    impuesto: int
+    imagen_url: Optional[str] = Field(None, alias="imagenUrl")
+    created_at: datetime = Field(..., alias="createdAt")
+    updated_at: datetime = Field(..., alias="updatedAt")
+
+    class Config:
+        from_attributes = True
+        populate_by_name = True
+
+class ProductoListResponse(BaseModel):
+    """Esquema para lista de productos"""
+    productos: List[ProductoResponse]
+    size: int
+    next_cursor: Optional[str] = None
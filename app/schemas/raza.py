@@ -28,6 +28,20 @@ class RazaWithAnimalsResponse(RazaResponse):
 class RazaListResponse(BaseModel):
     """Esquema para lista de razas"""
     razas: List[RazaResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
+    next_cursor: Optional[str] = None
+
+class RazaBulkItemResult(BaseModel):
+    """Resultado de una raza dentro de una creación en lote"""
+    index: int
+    cod_raza: str
+    success: bool
+    error: Optional[str] = None
+
+class RazaBulkResponse(BaseModel):
+    """Esquema de respuesta para la creación en lote de razas"""
+    created: int
+    failed: int
+    results: List[RazaBulkItemResult]
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+SearchType = Literal["animal", "raza"]
+
+class SearchResult(BaseModel):
+    """Coincidencia de la búsqueda de texto"""
+    tipo: SearchType
+    codigo: str
+    descripcion: str
+    score: float
+
+class SearchResponse(BaseModel):
+    """Esquema de respuesta de la búsqueda de texto"""
+    results: List[SearchResult]
+    size: int
+    next_cursor: Optional[str] = None
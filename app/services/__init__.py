@@ -2,7 +2,12 @@
 
 from .animal_service import AnimalService
 from .raza_service import RazaService
+from .import_service import ImportService
+from .producto_service import ProductoService
+from .search_service import SearchService
+from .warmup_service import WarmupService
 
 __all__ = [
-    "AnimalService", "RazaService"
+    "AnimalService", "RazaService", "ImportService", "ProductoService", "SearchService",
+    "WarmupService"
 ]
\ No newline at end of file
@@ -1,87 +1,393 @@
 from prisma import Prisma
-from typing import List, Optional
-from ..schemas.animal import AnimalCreate, AnimalUpdate, AnimalResponse
-from ..utils.exceptions import NotFoundError, AlreadyExistsError
+from prisma.errors import UniqueViolationError
+from datetime import timedelta
+from typing import AsyncIterator, Dict, List, Optional
+from ..core.config import settings
+from ..core.database import read_router
+from ..core.animal_stats import STATS_DIMENSIONS, animal_stats
+from ..core.raza_snapshot import raza_snapshot
+from ..core.search_index import search_index
+from ..schemas.animal import (
+    AnimalCreate,
+    AnimalUpdate,
+    AnimalResponse,
+    AnimalFilter,
+    AnimalBulkItemResult,
+    AnimalBulkResponse
+)
+from ..utils.exceptions import NotFoundError, AlreadyExistsError, ValidationError, PreconditionFailedError
+from ..utils.etags import table_versions
+from ..utils.pagination import decode_cursor, split_page
+from ..utils.count_cache import count_cache, TotalMode
+from ..utils.loader import BatchLoader, get_loader
+from ..utils.response_cache import (
+    ANIMAL_TABLE, animal_tag, raza_animals_tag, raza_count_tag, response_cache
+)
+from ..utils.metrics import instrument_service
 import logging
 
 logger = logging.getLogger(__name__)
 
+@instrument_service
 class AnimalService:
     def __init__(self, db: Prisma):
         self.db = db
 
+    @property
+    def reader(self) -> Prisma:
+        """Cliente para lecturas: una réplica salvo que el cliente acabe de escribir"""
+        return read_router.reader(self.db)
+
+    def _raza_include(self, include_raza: bool = True) -> Optional[dict]:
+        """Pedir el JOIN con Razas solo si se necesita y el snapshot en memoria no está cargado"""
+        return None if not include_raza or raza_snapshot.loaded else {"raza": True}
+
+    async def _attach_razas(self, animals: list, include_raza: bool = True) -> list:
+        """Completar la raza de cada animal desde el snapshot en memoria"""
+        if not include_raza or not raza_snapshot.loaded:
+            return animals
+        
+        # Razas creadas fuera de la aplicación desde la última reconciliación
+        missing = {animal.codRaza for animal in animals if raza_snapshot.get(animal.codRaza) is None}
+        if missing:
+            razas = await self.reader.raza.find_many(
+                where={"codRaza": {"in": list(missing)}}
+            )
+            raza_snapshot.put_many(razas)
+        
+        for animal in animals:
+            animal.raza = raza_snapshot.get(animal.codRaza)
+        return animals
+
+    @staticmethod
+    def _create_data(animal_data: AnimalCreate) -> dict:
+        """Datos de Prisma para insertar un animal"""
+        return {
+            "codAnimal": animal_data.cod_animal,
+            "descripcion": animal_data.descripcion,
+            "sexo": animal_data.sexo,
+            "edad": animal_data.edad,
+            "codRaza": animal_data.cod_raza,
+            "colorPelaje": animal_data.color_pelaje,
+            "colorOjos": animal_data.color_ojos,
+        }
+
+    @staticmethod
+    async def _adjust_raza_counts(client: Prisma, deltas: Dict[str, int]) -> None:
+        """Aplicar variaciones al contador totalAnimales de cada raza (dentro de la transacción del llamador)
+
+        Debe llamarse ANTES de insertar o reasignar animales: la actualización
+        toma el bloqueo exclusivo de la fila de la raza. Si el animal se
+        escribiera primero, la comprobación de la FK tomaría un bloqueo
+        compartido sobre la raza y dos transacciones de la misma raza se
+        bloquearían mutuamente al pasar a exclusivo. El orden por código solo
+        evita ciclos entre razas distintas.
+        """
+        for cod_raza in sorted(deltas):
+            if deltas[cod_raza]:
+                raza = await client.raza.update(
+                    where={"codRaza": cod_raza},
+                    data={"totalAnimales": {"increment": deltas[cod_raza]}}
+                )
+                if raza is None:
+                    raise NotFoundError(f"Raza con código {cod_raza} no encontrada")
+
+    def _filter_where(self, filters: Optional[AnimalFilter]) -> dict:
+        """Traducir los filtros del listado a un único WHERE de Prisma"""
+        where = {}
+        if filters is None:
+            return where
+        
+        for field, column in (
+            ("sexo", "sexo"),
+            ("cod_raza", "codRaza"),
+            ("color_pelaje", "colorPelaje"),
+            ("color_ojos", "colorOjos"),
+        ):
+            values = getattr(filters, field)
+            if values:
+                where[column] = values[0] if len(values) == 1 else {"in": values}
+        
+        edad = {}
+        if filters.edad_min is not None:
+            edad["gte"] = filters.edad_min
+        if filters.edad_max is not None:
+            edad["lte"] = filters.edad_max
+        if edad:
+            where["edad"] = edad
+        
+        return where
+
+    async def _find_by_codes(self, codes: List[str]) -> dict:
+        """Buscar varios animales con una consulta IN (...) y devolverlos por código"""
+        animals = await self.reader.animal.find_many(
+            where={"codAnimal": {"in": codes}},
+            include=self._raza_include()
+        )
+        await self._attach_razas(animals)
+        return {animal.codAnimal: animal for animal in animals}
+
+    def _loader(self) -> BatchLoader:
+        """Loader que agrupa las búsquedas concurrentes de animales por código"""
+        db = self.reader
+        return get_loader(
+            "animal",
+            db,
+            lambda codes: AnimalService(db)._find_by_codes(codes),
+            window=settings.loader_window_ms / 1000,
+            max_batch=settings.loader_max_batch
+        )
+
     async def create_animal(self, animal_data: AnimalCreate) -> AnimalResponse:
         """Crear un nuevo animal"""
         try:
-            # Verificar si ya existe un animal con ese código
-            existing = await self.db.animal.find_unique(
-                where={"codAnimal": animal_data.cod_animal}
-            )
-            if existing:
+            # Incrementar el contador de la raza (valida y bloquea la raza) y crear
+            # el animal en la misma transacción; la clave primaria valida el código
+            try:
+                async with self.db.tx() as tx:
+                    await self._adjust_raza_counts(tx, {animal_data.cod_raza: 1})
+                    animal = await tx.animal.create(
+                        data=self._create_data(animal_data),
+                        include=self._raza_include()
+                    )
+            except UniqueViolationError:
                 raise AlreadyExistsError(f"Animal con código {animal_data.cod_animal} ya existe")
             
-            # Verificar si la raza existe
-            raza = await self.db.raza.find_unique(
-                where={"codRaza": animal_data.cod_raza}
-            )
-            if not raza:
-                raise NotFoundError(f"Raza con código {animal_data.cod_raza} no encontrada")
+            animal_stats.add(animal)
+            await self._attach_razas([animal])
             
-            # Crear el animal
-            animal = await self.db.animal.create(
-                data={
-                    "codAnimal": animal_data.cod_animal,
-                    "descripcion": animal_data.descripcion,
-                    "sexo": animal_data.sexo,
-                    "edad": animal_data.edad,
-                    "codRaza": animal_data.cod_raza,
-                    "colorPelaje": animal_data.color_pelaje,
-                    "colorOjos": animal_data.color_ojos,
-                },
-                include={"raza": True}
+            search_index.put("animal", animal.codAnimal, animal.descripcion)
+            count_cache.invalidate("animal", "*", f"raza:{animal.codRaza}")
+            table_versions.bump("animal")
+            await response_cache.invalidate(
+                ANIMAL_TABLE, raza_animals_tag(animal.codRaza), raza_count_tag(animal.codRaza)
             )
-            
-            logger.info(f"Animal creado: {animal.codAnimal}")
+            logger.info("Animal creado: %s", animal.codAnimal)
             return animal
             
         except Exception as e:
-            logger.error(f"Error creando animal: {e}")
+            logger.error("Error creando animal: %s", e)
             raise
 
+    async def create_animals_bulk(self, items: List[AnimalCreate]) -> AnimalBulkResponse:
+        """Crear animales en lote con validación por conjuntos e inserción por bloques"""
+        if len(items) > settings.bulk_max_items:
+            raise ValidationError(
+                f"Se permiten como máximo {settings.bulk_max_items} animales por solicitud"
+            )
+        
+        results: List[Optional[AnimalBulkItemResult]] = [None] * len(items)
+        
+        def fail(index: int, item: AnimalCreate, error: str) -> None:
+            results[index] = AnimalBulkItemResult(
+                index=index, cod_animal=item.cod_animal, success=False, error=error
+            )
+        
+        # Códigos repetidos dentro de la misma solicitud
+        candidates = []
+        seen = set()
+        for index, item in enumerate(items):
+            if item.cod_animal in seen:
+                fail(index, item, "Código duplicado en la solicitud")
+                continue
+            seen.add(item.cod_animal)
+            candidates.append((index, item))
+        
+        # Una sola consulta para los códigos que ya existen
+        existing = await self.db.animal.find_many(
+            where={"codAnimal": {"in": [item.cod_animal for _, item in candidates]}}
+        )
+        existing_codes = {animal.codAnimal for animal in existing}
+        
+        # Una sola consulta para las razas que no estén en el snapshot (p. ej.
+        # creadas por otro worker); las eliminadas se detectan en la transacción
+        cod_razas = {item.cod_raza for _, item in candidates}
+        unknown = [cod for cod in cod_razas if raza_snapshot.get(cod) is None]
+        if unknown:
+            razas = await self.db.raza.find_many(
+                where={"codRaza": {"in": unknown}}
+            )
+            raza_snapshot.put_many(razas)
+        
+        rows = []
+        for index, item in candidates:
+            if item.cod_animal in existing_codes:
+                fail(index, item, f"Animal con código {item.cod_animal} ya existe")
+            elif raza_snapshot.get(item.cod_raza) is None:
+                fail(index, item, f"Raza con código {item.cod_raza} no encontrada")
+            else:
+                rows.append((index, item))
+        
+        # Insertar por bloques dentro de una transacción
+        if rows:
+            try:
+                async with self.db.tx(timeout=timedelta(seconds=settings.bulk_tx_timeout)) as tx:
+                    # Bloquear las razas del lote; las que ya no existen (eliminadas
+                    # por otro worker) fallan por elemento en lugar de abortar el lote
+                    cod_razas = sorted({item.cod_raza for _, item in rows})
+                    locked = await tx.query_raw(
+                        "SELECT `CodRaza` AS codRaza FROM `Razas` WHERE `CodRaza` IN ("
+                        + ", ".join("?" * len(cod_razas)) + ") ORDER BY `CodRaza` FOR UPDATE",
+                        *cod_razas
+                    )
+                    found = {row["codRaza"] for row in locked}
+                    for cod_raza in set(cod_razas) - found:
+                        raza_snapshot.remove(cod_raza)
+                    for index, item in rows:
+                        if item.cod_raza not in found:
+                            fail(index, item, f"Raza con código {item.cod_raza} no encontrada")
+                    rows = [(index, item) for index, item in rows if item.cod_raza in found]
+                    
+                    # Contadores antes de insertar: las razas ya están bloqueadas en exclusiva
+                    deltas: Dict[str, int] = {}
+                    for _, item in rows:
+                        deltas[item.cod_raza] = deltas.get(item.cod_raza, 0) + 1
+                    if deltas:
+                        await self._adjust_raza_counts(tx, deltas)
+                    for start in range(0, len(rows), settings.bulk_batch_size):
+                        batch = rows[start:start + settings.bulk_batch_size]
+                        await tx.animal.create_many(
+                            data=[self._create_data(item) for _, item in batch]
+                        )
+            except UniqueViolationError:
+                # Otro proceso insertó alguno de los códigos tras la verificación
+                raise AlreadyExistsError(
+                    "Algunos animales del lote fueron creados concurrentemente; no se insertó ninguno"
+                )
+        
+        if rows:
+            for index, item in rows:
+                results[index] = AnimalBulkItemResult(
+                    index=index, cod_animal=item.cod_animal, success=True
+                )
+                search_index.put("animal", item.cod_animal, item.descripcion)
+                animal_stats.add(self._create_data(item))
+            count_cache.invalidate(
+                "animal", "*", *{f"raza:{item.cod_raza}" for _, item in rows}
+            )
+            table_versions.bump("animal")
+            razas = {item.cod_raza for _, item in rows}
+            await response_cache.invalidate(
+                ANIMAL_TABLE,
+                *(raza_animals_tag(cod_raza) for cod_raza in razas),
+                *(raza_count_tag(cod_raza) for cod_raza in razas)
+            )
+        
+        logger.info("Creación en lote: %d creados, %d con error", len(rows), len(items) - len(rows))
+        return AnimalBulkResponse(
+            created=len(rows),
+            failed=len(items) - len(rows),
+            results=results
+        )
+
     async def get_animal_by_code(self, cod_animal: str) -> AnimalResponse:
         """Obtener un animal por su código"""
-        animal = await self.db.animal.find_unique(
-            where={"codAnimal": cod_animal},
-            include={"raza": True}
-        )
+        animal = await self._loader().load(cod_animal)
         
         if not animal:
             raise NotFoundError(f"Animal con código {cod_animal} no encontrado")
         
         return animal
 
-    async def get_all_animals(self, skip: int = 0, limit: int = 100) -> tuple[List[AnimalResponse], int]:
-        """Obtener todos los animales con paginación"""
-        animals = await self.db.animal.find_many(
+    async def get_animals_by_codes(self, codes: List[str]) -> tuple[List[AnimalResponse], List[str]]:
+        """Obtener varios animales con una sola consulta, en el orden solicitado"""
+        codes = list(dict.fromkeys(codes))
+        if len(codes) > settings.batch_get_max_codes:
+            raise ValidationError(
+                f"Se permiten como máximo {settings.batch_get_max_codes} códigos por solicitud"
+            )
+        
+        by_code = await self._find_by_codes(codes)
+        animals = [by_code[code] for code in codes if code in by_code]
+        missing = [code for code in codes if code not in by_code]
+        return animals, missing
+
+    async def get_all_animals(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        total_mode: TotalMode = "exact",
+        include_raza: bool = True,
+        filters: Optional[AnimalFilter] = None
+    ) -> tuple[List[AnimalResponse], Optional[int], Optional[str]]:
+        """Obtener todos los animales (opcionalmente filtrados) con paginación por offset o por cursor"""
+        filter_where = self._filter_where(filters)
+        where = dict(filter_where)
+        if cursor is not None:
+            # Paginación por cursor: búsqueda directa sobre la clave primaria
+            where["codAnimal"] = {"gt": decode_cursor(cursor)}
+            skip = 0
+
+        reader = self.reader
+        animals = await reader.animal.find_many(
+            where=where,
             skip=skip,
-            take=limit,
-            include={"raza": True},
+            take=limit + 1,
+            include=self._raza_include(include_raza),
             order={"codAnimal": "asc"}
         )
+        animals, next_cursor = split_page(animals, limit, "codAnimal")
+        await self._attach_razas(animals, include_raza)
         
-        total = await self.db.animal.count()
+        total = None
+        if include_total and filter_where:
+            # Las combinaciones de filtros no se cachean: el conteo usa los mismos índices
+            total = await reader.animal.count(where=filter_where)
+        elif include_total:
+            # Los totales cacheados se cuentan en la primaria para no compartir uno atrasado
+            total = await count_cache.get_or_count(
+                "animal", "*", lambda: self.db.animal.count(), total_mode
+            )
         
-        return animals, total
+        return animals, total, next_cursor
 
-    async def update_animal(self, cod_animal: str, animal_data: AnimalUpdate) -> AnimalResponse:
-        """Actualizar un animal"""
-        # Verificar si el animal existe
-        existing = await self.db.animal.find_unique(
-            where={"codAnimal": cod_animal}
-        )
-        if not existing:
-            raise NotFoundError(f"Animal con código {cod_animal} no encontrado")
+    async def iter_animals(
+        self,
+        cod_raza: Optional[str] = None,
+        chunk_size: Optional[int] = None
+    ) -> AsyncIterator[List[AnimalResponse]]:
+        """Recorrer la tabla de animales en bloques ordenados por clave primaria"""
+        chunk_size = chunk_size or settings.export_chunk_size
+        last_code = None
+        # Toda la exportación desde el mismo servidor
+        reader = self.reader
         
+        while True:
+            where = {}
+            if cod_raza is not None:
+                where["codRaza"] = cod_raza
+            if last_code is not None:
+                where["codAnimal"] = {"gt": last_code}
+            
+            animals = await reader.animal.find_many(
+                where=where,
+                take=chunk_size,
+                order={"codAnimal": "asc"}
+            )
+            if not animals:
+                return
+            
+            yield animals
+            
+            if len(animals) < chunk_size:
+                return
+            last_code = animals[-1].codAnimal
+
+    async def get_stats(self, group_by: List[str], edad_bucket: int = 1) -> tuple[int, List[dict]]:
+        """Obtener conteos agrupados desde el resumen en memoria (sin recorrer Animales)"""
+        if not animal_stats.loaded:
+            await animal_stats.rebuild(self.db)
+        return animal_stats.summarize(group_by, edad_bucket)
+
+    async def update_animal(
+        self,
+        cod_animal: str,
+        animal_data: AnimalUpdate,
+        expected_version: Optional[int] = None
+    ) -> AnimalResponse:
+        """Actualizar un animal (con control optimista de versión si se indica)"""
         # Preparar datos para actualizar (solo campos no nulos)
         update_data = {}
         if animal_data.descripcion is not None:
@@ -91,57 +397,122 @@ class AnimalService:
         if animal_data.edad is not None:
             update_data["edad"] = animal_data.edad
         if animal_data.cod_raza is not None:
-            # Verificar si la nueva raza existe
-            raza = await self.db.raza.find_unique(
-                where={"codRaza": animal_data.cod_raza}
-            )
-            if not raza:
-                raise NotFoundError(f"Raza con código {animal_data.cod_raza} no encontrada")
             update_data["codRaza"] = animal_data.cod_raza
         if animal_data.color_pelaje is not None:
             update_data["colorPelaje"] = animal_data.color_pelaje
         if animal_data.color_ojos is not None:
             update_data["colorOjos"] = animal_data.color_ojos
         
-        # Actualizar el animal
-        animal = await self.db.animal.update(
-            where={"codAnimal": cod_animal},
-            data=update_data,
-            include={"raza": True}
-        )
+        # Actualizar el animal; con If-Match la versión forma parte del WHERE
+        where = {"codAnimal": cod_animal}
+        if expected_version is not None:
+            where["version"] = expected_version
+        data = {**update_data, "version": {"increment": 1}}
+        
+        # Valores anteriores (para el resumen y los contadores), solo si cambia alguna dimensión
+        previous = None
+        previous_raza = None
+        moves_raza = "codRaza" in update_data
+        if moves_raza or (animal_stats.loaded and any(name in update_data for name in STATS_DIMENSIONS)):
+            # La fila se bloquea para que dos actualizaciones concurrentes no lean
+            # los mismos valores anteriores; en una reasignación de raza el
+            # contador se mueve de la raza anterior a la nueva en la misma transacción
+            async with self.db.tx() as tx:
+                rows = await tx.query_raw(
+                    "SELECT `CodRaza` AS codRaza, `Sexo` AS sexo, `Edad` AS edad, `ColorPelaje` AS colorPelaje "
+                    "FROM `Animales` WHERE `CodAnimal` = ? FOR UPDATE",
+                    cod_animal
+                )
+                previous = rows[0] if rows else None
+                if moves_raza and previous is not None and previous["codRaza"] != update_data["codRaza"]:
+                    # Bloquear ambas razas (al mover el contador) antes de reasignar el animal
+                    previous_raza = previous["codRaza"]
+                    await self._adjust_raza_counts(tx, {previous_raza: -1, update_data["codRaza"]: 1})
+                animal = await tx.animal.update(where=where, data=data, include=self._raza_include())
+                if animal is None and previous_raza is not None:
+                    # La fila está bloqueada, así que solo falla la versión: deshacer los contadores
+                    raise PreconditionFailedError(f"Animal con código {cod_animal} fue modificado por otra solicitud")
+        else:
+            animal = await self.db.animal.update(where=where, data=data, include=self._raza_include())
+        
+        if animal is None:
+            # Solo en el camino de error se distingue "no existe" de "otra versión"
+            if expected_version is not None and await self.db.animal.find_unique(
+                where={"codAnimal": cod_animal}
+            ):
+                raise PreconditionFailedError(f"Animal con código {cod_animal} fue modificado por otra solicitud")
+            raise NotFoundError(f"Animal con código {cod_animal} no encontrado")
         
-        logger.info(f"Animal actualizado: {cod_animal}")
+        if previous is not None:
+            animal_stats.move(previous, animal)
+        await self._attach_razas([animal])
+        
+        if "descripcion" in update_data:
+            search_index.put("animal", animal.codAnimal, animal.descripcion)
+        if previous_raza is not None:
+            count_cache.invalidate("animal", f"raza:{previous_raza}", f"raza:{animal.codRaza}")
+        table_versions.bump("animal")
+        tags = [ANIMAL_TABLE, animal_tag(cod_animal), raza_animals_tag(animal.codRaza)]
+        if previous_raza is not None:
+            tags += [raza_animals_tag(previous_raza), raza_count_tag(previous_raza), raza_count_tag(animal.codRaza)]
+        await response_cache.invalidate(*tags)
+        logger.info("Animal actualizado: %s", cod_animal)
         return animal
 
     async def delete_animal(self, cod_animal: str) -> bool:
         """Eliminar un animal"""
-        # Verificar si el animal existe
-        existing = await self.db.animal.find_unique(
-            where={"codAnimal": cod_animal}
-        )
-        if not existing:
+        async with self.db.tx() as tx:
+            animal = await tx.animal.delete(
+                where={"codAnimal": cod_animal}
+            )
+            if animal:
+                await self._adjust_raza_counts(tx, {animal.codRaza: -1})
+        if not animal:
             raise NotFoundError(f"Animal con código {cod_animal} no encontrado")
         
-        # Eliminar el animal
-        await self.db.animal.delete(
-            where={"codAnimal": cod_animal}
+        search_index.remove("animal", cod_animal)
+        animal_stats.add(animal, -1)
+        count_cache.invalidate("animal", "*", f"raza:{animal.codRaza}")
+        table_versions.bump("animal")
+        await response_cache.invalidate(
+            ANIMAL_TABLE, animal_tag(cod_animal), raza_animals_tag(animal.codRaza), raza_count_tag(animal.codRaza)
         )
-        
-        logger.info(f"Animal eliminado: {cod_animal}")
+        logger.info("Animal eliminado: %s", cod_animal)
         return True
 
-    async def get_animals_by_raza(self, cod_raza: str, skip: int = 0, limit: int = 100) -> tuple[List[AnimalResponse], int]:
+    async def get_animals_by_raza(
+        self,
+        cod_raza: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        total_mode: TotalMode = "exact",
+        include_raza: bool = True
+    ) -> tuple[List[AnimalResponse], Optional[int], Optional[str]]:
         """Obtener animales por raza"""
-        animals = await self.db.animal.find_many(
-            where={"codRaza": cod_raza},
+        where = {"codRaza": cod_raza}
+        if cursor is not None:
+            where["codAnimal"] = {"gt": decode_cursor(cursor)}
+            skip = 0
+
+        animals = await self.reader.animal.find_many(
+            where=where,
             skip=skip,
-            take=limit,
-            include={"raza": True},
+            take=limit + 1,
+            include=self._raza_include(include_raza),
             order={"codAnimal": "asc"}
         )
+        animals, next_cursor = split_page(animals, limit, "codAnimal")
+        await self._attach_razas(animals, include_raza)
         
-        total = await self.db.animal.count(
-            where={"codRaza": cod_raza}
-        )
+        total = None
+        if include_total:
+            total = await count_cache.get_or_count(
+                "animal",
+                f"raza:{cod_raza}",
+                lambda: self.db.animal.count(where={"codRaza": cod_raza}),
+                total_mode
+            )
         
-        return animals, total
\ No newline at end of file
+        return animals, total, next_cursor
\ No newline at end of file
@@ -0,0 +1,77 @@
+from prisma import Prisma
+from pydantic import BaseModel, ValidationError as PydanticValidationError
+from typing import AsyncIterator, Awaitable, Callable, List, Type
+from ..schemas.animal import AnimalCreate
+from ..schemas.raza import RazaCreate
+from ..schemas.importacion import ImportRowError, ImportProgress
+from ..utils.exceptions import BaseAPIException
+from ..utils.importers import ImportRow, format_validation_error
+from .animal_service import AnimalService
+from .raza_service import RazaService
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ImportService:
+    def __init__(self, db: Prisma):
+        self.db = db
+
+    async def import_animals(self, batches: AsyncIterator[List[ImportRow]]) -> AsyncIterator[ImportProgress]:
+        """Importar animales bloque a bloque, emitiendo el avance tras cada bloque"""
+        service = AnimalService(self.db)
+        async for progress in self._import(batches, AnimalCreate, service.create_animals_bulk):
+            yield progress
+
+    async def import_razas(self, batches: AsyncIterator[List[ImportRow]]) -> AsyncIterator[ImportProgress]:
+        """Importar razas bloque a bloque, emitiendo el avance tras cada bloque"""
+        service = RazaService(self.db)
+        async for progress in self._import(batches, RazaCreate, service.create_razas_bulk):
+            yield progress
+
+    async def _import(
+        self,
+        batches: AsyncIterator[List[ImportRow]],
+        schema: Type[BaseModel],
+        create_bulk: Callable[[list], Awaitable]
+    ) -> AsyncIterator[ImportProgress]:
+        processed = created = failed = 0
+
+        async for batch in batches:
+            errors = []
+            items = []
+            row_numbers = []
+
+            # Validar cada fila con el esquema de creación
+            for row_number, record in batch:
+                if isinstance(record, str):
+                    errors.append(ImportRowError(row=row_number, error=record))
+                    continue
+                try:
+                    items.append(schema.model_validate(record))
+                    row_numbers.append(row_number)
+                except PydanticValidationError as e:
+                    errors.append(ImportRowError(row=row_number, error=format_validation_error(e)))
+
+            # Escribir el bloque en una transacción
+            if items:
+                try:
+                    report = await create_bulk(items)
+                    created += report.created
+                    errors.extend(
+                        ImportRowError(row=row_numbers[result.index], error=result.error)
+                        for result in report.results
+                        if not result.success
+                    )
+                except BaseAPIException as e:
+                    # El bloque se revierte completo (raza inexistente, código
+                    # creado concurrentemente...): sus filas se informan como
+                    # fallidas y la importación sigue con el siguiente bloque
+                    errors.extend(ImportRowError(row=row, error=e.detail) for row in row_numbers)
+
+            processed += len(batch)
+            failed += len(errors)
+            errors.sort(key=lambda error: error.row)
+            yield ImportProgress(processed=processed, created=created, failed=failed, errors=errors)
+
+        logger.info("Importación finalizada: %s filas, %s creadas, %s con error", processed, created, failed)
+        yield ImportProgress(done=True, processed=processed, created=created, failed=failed)
@@ -1,61 +1,53 @@
 from prisma import Prisma
-from typing import Dict, Any
+from typing import List, Optional
+from ..schemas.producto import ProductoResponse
+from ..utils.exceptions import NotFoundError
+from ..utils.pagination import decode_cursor, split_page
+from ..utils.metrics import instrument_service
+import logging
 
-prisma = Prisma()
+logger = logging.getLogger(__name__)
 
+@instrument_service
 class ProductoService:
-    @staticmethod
-    async def get_all() -> Dict[str, Any]:
-        try:
-            await prisma.connect()
-            productos = await prisma.producto.find_many()
-            await prisma.disconnect()
-            
-            if not productos:
-                return {
-                    'message': 'No se encontraron productos',
-                    'status': 404,
-                    'data': {'productos': []}
-                }
-                
-            return {
-                'message': 'Productos encontrados',
-                'status': 200,
-                'data': {'productos': productos}
-            }
-            
-        except Exception as e:
-            print(f"Error tipo: {type(e).__name__}, mensaje: {e}")
-            return {
-                'message': 'Algo salió mal, contacta al administrador',
-                'status': 500,
-                'data': None
-            }
+    def __init__(self, db: Prisma):
+        self.db = db
 
-    @staticmethod
-    async def get_one(id: int) -> Dict[str, Any]:
-        try:
-            await prisma.connect()
-            producto = await prisma.producto.find_unique(where={'id': id})
-            await prisma.disconnect()
-            
-            if not producto:
-                return {
-                    'message': 'Producto no encontrado',
-                    'status': 404,
-                    'data': None
-                }
-                
-            return {
-                'message': 'Producto encontrado',
-                'status': 200,
-                'data': {'producto': producto}
-            }
-            
-        except Exception as e:
-            print(f"Error tipo: {type(e).__name__}, mensaje: {e}")
-            return {
-                'message': 'Algo salió mal, contacta al administrador',
-                'status': 500,
-                'data': None
-            }
+    async def get_all_productos(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> tuple[List[ProductoResponse], Optional[str]]:
+        """Obtener productos con paginación por cursor sobre el id"""
+        where = {}
+        if cursor is not None:
+            where["id"] = {"gt": decode_cursor(cursor, key_type=int)}
+
+        productos = await self.db.producto.find_many(
+            where=where,
+            take=limit + 1,
+            order={"id": "asc"}
+        )
+        return split_page(productos, limit, "id")
+
+    async def get_producto_by_id(self, producto_id: int) -> ProductoResponse:
+        """Obtener un producto por su id"""
+        producto = await self.db.producto.find_unique(
+            where={"id": producto_id}
+        )
+        
+        if not producto:
+            raise NotFoundError(f"Producto con id {producto_id} no encontrado")
+        
+        return producto
+
+    async def get_producto_by_codigo(self, codigo: str) -> ProductoResponse:
+        """Obtener un producto por su código"""
+        producto = await self.db.producto.find_unique(
+            where={"codigo": codigo}
+        )
+        
+        if not producto:
+            raise NotFoundError(f"Producto con código {codigo} no encontrado")
+        
+        return producto
@@ -1,56 +1,172 @@
 from prisma import Prisma
-from typing import List
-from ..schemas.raza import RazaCreate, RazaUpdate, RazaResponse, RazaWithAnimalsResponse
-from ..utils.exceptions import NotFoundError, AlreadyExistsError, ValidationError
+from prisma.errors import ForeignKeyViolationError, UniqueViolationError
+from datetime import timedelta
+from typing import List, Optional
+from ..core.config import settings
+from ..core.database import read_router
+from ..core.raza_snapshot import raza_snapshot
+from ..core.search_index import search_index
+from ..schemas.raza import (
+    RazaCreate,
+    RazaUpdate,
+    RazaResponse,
+    RazaWithAnimalsResponse,
+    RazaBulkItemResult,
+    RazaBulkResponse
+)
+from ..utils.exceptions import NotFoundError, AlreadyExistsError, ValidationError, PreconditionFailedError
+from ..utils.etags import table_versions
+from ..utils.pagination import decode_cursor, split_page
+from ..utils.count_cache import count_cache, TotalMode
+from ..utils.loader import BatchLoader, get_loader
+from ..utils.response_cache import RAZA_TABLE, raza_count_tag, raza_tag, response_cache
+from ..utils.metrics import instrument_service
 import logging
 
 logger = logging.getLogger(__name__)
 
+@instrument_service
 class RazaService:
     def __init__(self, db: Prisma):
         self.db = db
 
+    @property
+    def reader(self) -> Prisma:
+        """Cliente para lecturas: una réplica salvo que el cliente acabe de escribir"""
+        return read_router.reader(self.db)
+
+    def _loader(self) -> BatchLoader:
+        """Loader que agrupa las búsquedas concurrentes de razas fuera del snapshot"""
+        db = self.reader
+
+        async def load_many(codes: List[str]) -> dict:
+            razas = await db.raza.find_many(where={"codRaza": {"in": codes}})
+            return {raza.codRaza: raza for raza in razas}
+
+        return get_loader(
+            "raza",
+            db,
+            load_many,
+            window=settings.loader_window_ms / 1000,
+            max_batch=settings.loader_max_batch
+        )
+
     async def create_raza(self, raza_data: RazaCreate) -> RazaResponse:
         """Crear una nueva raza"""
         try:
-            # Verificar si ya existe una raza con ese código
-            existing = await self.db.raza.find_unique(
-                where={"codRaza": raza_data.cod_raza}
-            )
-            if existing:
+            # Crear la raza; la clave primaria detecta los duplicados
+            try:
+                raza = await self.db.raza.create(
+                    data={
+                        "codRaza": raza_data.cod_raza,
+                        "descripcion": raza_data.descripcion,
+                    }
+                )
+            except UniqueViolationError:
                 raise AlreadyExistsError(f"Raza con código {raza_data.cod_raza} ya existe")
             
-            # Crear la raza
-            raza = await self.db.raza.create(
-                data={
-                    "codRaza": raza_data.cod_raza,
-                    "descripcion": raza_data.descripcion,
-                }
-            )
-            
-            logger.info(f"Raza creada: {raza.codRaza}")
+            raza_snapshot.put(raza)
+            search_index.put("raza", raza.codRaza, raza.descripcion)
+            count_cache.invalidate("raza")
+            table_versions.bump("raza")
+            await response_cache.invalidate(RAZA_TABLE)
+            logger.info("Raza creada: %s", raza.codRaza)
             return raza
             
         except Exception as e:
-            logger.error(f"Error creando raza: {e}")
+            logger.error("Error creando raza: %s", e)
             raise
 
+    async def create_razas_bulk(self, items: List[RazaCreate]) -> RazaBulkResponse:
+        """Crear razas en lote con una verificación por conjuntos y create_many"""
+        if len(items) > settings.bulk_max_items:
+            raise ValidationError(
+                f"Se permiten como máximo {settings.bulk_max_items} razas por solicitud"
+            )
+        
+        results: List[Optional[RazaBulkItemResult]] = [None] * len(items)
+        
+        candidates = []
+        seen = set()
+        for index, item in enumerate(items):
+            if item.cod_raza in seen:
+                results[index] = RazaBulkItemResult(
+                    index=index, cod_raza=item.cod_raza, success=False,
+                    error="Código duplicado en la solicitud"
+                )
+                continue
+            seen.add(item.cod_raza)
+            candidates.append((index, item))
+        
+        # Una sola consulta para los códigos que ya existen
+        existing = await self.db.raza.find_many(
+            where={"codRaza": {"in": [item.cod_raza for _, item in candidates]}}
+        )
+        existing_codes = {raza.codRaza for raza in existing}
+        
+        rows = []
+        for index, item in candidates:
+            if item.cod_raza in existing_codes:
+                results[index] = RazaBulkItemResult(
+                    index=index, cod_raza=item.cod_raza, success=False,
+                    error=f"Raza con código {item.cod_raza} ya existe"
+                )
+            else:
+                rows.append((index, item))
+        
+        if rows:
+            try:
+                async with self.db.tx(timeout=timedelta(seconds=settings.bulk_tx_timeout)) as tx:
+                    for start in range(0, len(rows), settings.bulk_batch_size):
+                        batch = rows[start:start + settings.bulk_batch_size]
+                        await tx.raza.create_many(
+                            data=[
+                                {"codRaza": item.cod_raza, "descripcion": item.descripcion}
+                                for _, item in batch
+                            ]
+                        )
+            except UniqueViolationError:
+                raise AlreadyExistsError(
+                    "Algunas razas del lote fueron creadas concurrentemente; no se insertó ninguna"
+                )
+            
+            for index, item in rows:
+                results[index] = RazaBulkItemResult(
+                    index=index, cod_raza=item.cod_raza, success=True
+                )
+                search_index.put("raza", item.cod_raza, item.descripcion)
+            # La tabla es pequeña: recargarla entera mantiene el snapshot exacto
+            await raza_snapshot.load(self.db)
+            count_cache.invalidate("raza")
+            table_versions.bump("raza")
+            await response_cache.invalidate(RAZA_TABLE)
+        
+        logger.info("Creación de razas en lote: %d creadas, %d con error", len(rows), len(items) - len(rows))
+        return RazaBulkResponse(
+            created=len(rows),
+            failed=len(items) - len(rows),
+            results=results
+        )
+
     async def get_raza_by_code(self, cod_raza: str) -> RazaResponse:
         """Obtener una raza por su código"""
-        raza = await self.db.raza.find_unique(
-            where={"codRaza": cod_raza}
-        )
+        raza = raza_snapshot.get(cod_raza)
+        if raza is not None:
+            return raza
+        
+        raza = await self._loader().load(cod_raza)
         
         if not raza:
             raise NotFoundError(f"Raza con código {cod_raza} no encontrada")
         
+        raza_snapshot.put(raza)
         return raza
 
     async def get_raza_with_animals_count(self, cod_raza: str) -> RazaWithAnimalsResponse:
         """Obtener una raza con el conteo de sus animales"""
-        raza = await self.db.raza.find_unique(
-            where={"codRaza": cod_raza},
-            include={"_count": {"select": {"animales": True}}}
+        # El conteo se lee del contador mantenido por AnimalService
+        raza = await self.reader.raza.find_unique(
+            where={"codRaza": cod_raza}
         )
         
         if not raza:
@@ -60,32 +176,48 @@ class RazaService:
         raza_response = RazaWithAnimalsResponse(
             cod_raza=raza.codRaza,
             descripcion=raza.descripcion,
-            total_animales=raza._count.animales if hasattr(raza, '_count') else 0
+            total_animales=raza.totalAnimales
         )
         
         return raza_response
 
-    async def get_all_razas(self, skip: int = 0, limit: int = 100) -> tuple[List[RazaResponse], int]:
-        """Obtener todas las razas con paginación"""
-        razas = await self.db.raza.find_many(
+    async def get_all_razas(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        total_mode: TotalMode = "exact"
+    ) -> tuple[List[RazaResponse], Optional[int], Optional[str]]:
+        """Obtener todas las razas con paginación por offset o por cursor"""
+        where = {}
+        if cursor is not None:
+            where["codRaza"] = {"gt": decode_cursor(cursor)}
+            skip = 0
+
+        razas = await self.reader.raza.find_many(
+            where=where,
             skip=skip,
-            take=limit,
+            take=limit + 1,
             order={"codRaza": "asc"}
         )
+        razas, next_cursor = split_page(razas, limit, "codRaza")
         
-        total = await self.db.raza.count()
+        total = None
+        if include_total:
+            total = await count_cache.get_or_count(
+                "raza", "*", lambda: self.db.raza.count(), total_mode
+            )
         
-        return razas, total
+        return razas, total, next_cursor
 
-    async def update_raza(self, cod_raza: str, raza_data: RazaUpdate) -> RazaResponse:
-        """Actualizar una raza"""
-        # Verificar si la raza existe
-        existing = await self.db.raza.find_unique(
-            where={"codRaza": cod_raza}
-        )
-        if not existing:
-            raise NotFoundError(f"Raza con código {cod_raza} no encontrada")
-        
+    async def update_raza(
+        self,
+        cod_raza: str,
+        raza_data: RazaUpdate,
+        expected_version: Optional[int] = None
+    ) -> RazaResponse:
+        """Actualizar una raza (con control optimista de versión si se indica)"""
         # Preparar datos para actualizar (solo campos no nulos)
         update_data = {}
         if raza_data.descripcion is not None:
@@ -94,61 +226,105 @@ class RazaService:
         if not update_data:
             raise ValidationError("No se proporcionaron datos para actualizar")
         
-        # Actualizar la raza
+        # Actualizar la raza; con If-Match la versión forma parte del WHERE
+        where = {"codRaza": cod_raza}
+        if expected_version is not None:
+            where["version"] = expected_version
         raza = await self.db.raza.update(
-            where={"codRaza": cod_raza},
-            data=update_data
+            where=where,
+            data={**update_data, "version": {"increment": 1}}
         )
         
-        logger.info(f"Raza actualizada: {cod_raza}")
+        if raza is None:
+            # Solo en el camino de error se distingue "no existe" de "otra versión"
+            if expected_version is not None and await self.db.raza.find_unique(
+                where={"codRaza": cod_raza}
+            ):
+                raise PreconditionFailedError(f"Raza con código {cod_raza} fue modificada por otra solicitud")
+            raise NotFoundError(f"Raza con código {cod_raza} no encontrada")
+        
+        raza_snapshot.put(raza)
+        search_index.put("raza", raza.codRaza, raza.descripcion)
+        # Los animales incluyen su raza: sus listados también cambian
+        table_versions.bump("raza", "animal")
+        await response_cache.invalidate(RAZA_TABLE, raza_tag(cod_raza))
+        logger.info("Raza actualizada: %s", cod_raza)
         return raza
 
     async def delete_raza(self, cod_raza: str) -> bool:
         """Eliminar una raza"""
-        # Verificar si la raza existe
-        existing = await self.db.raza.find_unique(
-            where={"codRaza": cod_raza}
-        )
-        if not existing:
-            raise NotFoundError(f"Raza con código {cod_raza} no encontrada")
-        
-        # Verificar si hay animales asociados a esta raza
-        animals_count = await self.db.animal.count(
-            where={"codRaza": cod_raza}
-        )
-        
-        if animals_count > 0:
+        # La FK (ON DELETE RESTRICT) impide borrar razas con animales asociados
+        try:
+            raza = await self.db.raza.delete(
+                where={"codRaza": cod_raza}
+            )
+        except ForeignKeyViolationError:
             raise ValidationError(
-                f"No se puede eliminar la raza {cod_raza} porque tiene {animals_count} animales asociados"
+                f"No se puede eliminar la raza {cod_raza} porque tiene animales asociados"
             )
         
-        # Eliminar la raza
-        await self.db.raza.delete(
-            where={"codRaza": cod_raza}
-        )
+        if not raza:
+            raise NotFoundError(f"Raza con código {cod_raza} no encontrada")
         
-        logger.info(f"Raza eliminada: {cod_raza}")
+        raza_snapshot.remove(cod_raza)
+        search_index.remove("raza", cod_raza)
+        count_cache.invalidate("raza")
+        table_versions.bump("raza")
+        await response_cache.invalidate(RAZA_TABLE, raza_tag(cod_raza), raza_count_tag(cod_raza))
+        logger.info("Raza eliminada: %s", cod_raza)
         return True
 
-    async def get_razas_with_animal_count(self, skip: int = 0, limit: int = 100) -> tuple[List[RazaWithAnimalsResponse], int]:
+    async def get_razas_with_animal_count(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        include_total: bool = True,
+        total_mode: TotalMode = "exact"
+    ) -> tuple[List[RazaWithAnimalsResponse], Optional[int]]:
         """Obtener todas las razas con conteo de animales"""
-        razas = await self.db.raza.find_many(
+        razas = await self.reader.raza.find_many(
             skip=skip,
             take=limit,
-            include={"_count": {"select": {"animales": True}}},
             order={"codRaza": "asc"}
         )
         
-        total = await self.db.raza.count()
+        total = None
+        if include_total:
+            total = await count_cache.get_or_count(
+                "raza", "*", lambda: self.db.raza.count(), total_mode
+            )
         
         # Convertir a response schema
         razas_response = [
             RazaWithAnimalsResponse(
                 cod_raza=raza.codRaza,
                 descripcion=raza.descripcion,
-                total_animales=raza._count.animales if hasattr(raza, '_count') else 0
+                total_animales=raza.totalAnimales
             )
             for raza in razas
         ]
         
-        return razas_response, total
\ No newline at end of file
+        return razas_response, total
+
+    async def repair_animal_counts(self) -> int:
+        """Recalcular el contador de animales de todas las razas; devuelve las razas corregidas
+
+        Las cachés que se actualizan son las del proceso que ejecuta la
+        reparación (y la caché de respuestas compartida, si se usa ese backend).
+        """
+        fixed = await self.db.execute_raw(
+            "UPDATE `Razas` r "
+            "LEFT JOIN (SELECT `CodRaza`, COUNT(*) AS total FROM `Animales` GROUP BY `CodRaza`) a "
+            "ON a.`CodRaza` = r.`CodRaza` "
+            "SET r.`TotalAnimales` = COALESCE(a.total, 0) "
+            "WHERE r.`TotalAnimales` <> COALESCE(a.total, 0)"
+        )
+        if fixed:
+            # No se sabe qué razas cambiaron: se descartan todas las respuestas
+            # y se recargan las razas embebidas en las respuestas de animales
+            table_versions.bump("raza")
+            count_cache.invalidate("raza")
+            await raza_snapshot.load(self.db)
+            await response_cache.clear()
+        logger.info("Contadores de animales reparados: %s razas corregidas", fixed)
+        return fixed
\ No newline at end of file
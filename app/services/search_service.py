@@ -0,0 +1,98 @@
+from prisma import Prisma
+from typing import List, Optional
+from ..core.config import settings
+from ..core.database import read_router
+from ..core.search_index import search_index
+from ..schemas.search import SearchResult, SearchType
+from ..utils.exceptions import ValidationError
+from ..utils.pagination import decode_cursor, encode_cursor
+from ..utils.metrics import instrument_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Una subconsulta por tabla: cada una usa su índice FULLTEXT y solo devuelve
+# las mejores `n` filas antes de combinar ambos rankings
+_FULLTEXT_QUERIES = {
+    "animal": (
+        "(SELECT 'animal' AS tipo, `CodAnimal` AS codigo, `Descripcion` AS descripcion, "
+        "MATCH(`Descripcion`) AGAINST (? IN NATURAL LANGUAGE MODE) AS score "
+        "FROM `Animales` WHERE MATCH(`Descripcion`) AGAINST (? IN NATURAL LANGUAGE MODE) "
+        "ORDER BY score DESC, codigo LIMIT ?)"
+    ),
+    "raza": (
+        "(SELECT 'raza' AS tipo, `CodRaza` AS codigo, `Descripcion` AS descripcion, "
+        "MATCH(`Descripcion`) AGAINST (? IN NATURAL LANGUAGE MODE) AS score "
+        "FROM `Razas` WHERE MATCH(`Descripcion`) AGAINST (? IN NATURAL LANGUAGE MODE) "
+        "ORDER BY score DESC, codigo LIMIT ?)"
+    ),
+}
+
+@instrument_service
+class SearchService:
+    def __init__(self, db: Prisma):
+        self.db = db
+
+    @property
+    def reader(self) -> Prisma:
+        """Cliente para lecturas: una réplica salvo que el cliente acabe de escribir"""
+        return read_router.reader(self.db)
+
+    async def search(
+        self,
+        q: str,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        tipo: Optional[SearchType] = None
+    ) -> tuple[List[SearchResult], Optional[str]]:
+        """Buscar texto en las descripciones de animales y razas, ordenado por relevancia"""
+        q = q.strip()
+        if not q:
+            raise ValidationError("La búsqueda no puede estar vacía")
+
+        # El cursor es la posición dentro del ranking
+        offset = decode_cursor(cursor, key_type=int) if cursor is not None else 0
+        if offset < 0 or offset >= settings.search_max_results:
+            raise ValidationError("Cursor de paginación inválido")
+        limit = min(limit, settings.search_max_results - offset)
+
+        if settings.search_backend == "memory":
+            rows = search_index.search(q, offset, limit + 1, tipo)
+        else:
+            rows = await self._search_fulltext(q, offset, limit + 1, tipo)
+
+        results = [
+            SearchResult(tipo=row[0], codigo=row[1], descripcion=row[2], score=row[3])
+            for row in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit and offset + limit < settings.search_max_results:
+            next_cursor = encode_cursor(offset + limit)
+
+        return results, next_cursor
+
+    async def _search_fulltext(
+        self,
+        q: str,
+        offset: int,
+        limit: int,
+        tipo: Optional[SearchType]
+    ) -> list:
+        """Buscar con los índices FULLTEXT de MySQL"""
+        tipos = [tipo] if tipo is not None else ["animal", "raza"]
+        top = offset + limit
+        query = (
+            "SELECT tipo, codigo, descripcion, score FROM ("
+            + " UNION ALL ".join(_FULLTEXT_QUERIES[name] for name in tipos)
+            + ") AS resultados ORDER BY score DESC, tipo, codigo LIMIT ? OFFSET ?"
+        )
+        params = []
+        for _ in tipos:
+            params.extend([q, q, top])
+        params.extend([limit, offset])
+
+        rows = await self.reader.query_raw(query, *params)
+        return [
+            (row["tipo"], row["codigo"], row["descripcion"], float(row["score"]))
+            for row in rows
+        ]
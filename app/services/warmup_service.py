@@ -0,0 +1,77 @@
+from prisma import Prisma
+from typing import List
+import asyncio
+import logging
+
+from ..core.config import settings
+from ..core.database import read_router, replicas
+from ..schemas.animal import AnimalFilter, AnimalListResponse, AnimalResponse, AnimalBatchResponse
+from ..schemas.raza import RazaListResponse, RazaResponse, RazaWithAnimalsResponse
+from ..utils.count_cache import count_cache
+from ..utils.metrics import instrument_service
+from ..utils.responses import fast_json_response
+from .animal_service import AnimalService
+from .raza_service import RazaService
+
+logger = logging.getLogger(__name__)
+
+@instrument_service
+class WarmupService:
+    def __init__(self, db: Prisma):
+        self.db = db
+
+    async def warm_up(self) -> None:
+        """Ejecutar las consultas más frecuentes antes de aceptar tráfico
+
+        Cada consulta se lanza `warmup_concurrency` veces a la vez para abrir
+        varias conexiones del pool y preparar sus sentencias, y las respuestas
+        se serializan una vez para compilar los esquemas de pydantic.
+
+        Las réplicas se calientan primero; después se vacía la caché de
+        totales y la pasada sobre la primaria (sin desviar lecturas a las
+        réplicas, que pueden ir atrasadas) la deja con valores de la primaria.
+        """
+        for replica in replicas:
+            if replica.is_connected():
+                await self._warm_client(replica)
+        count_cache.clear()
+        with read_router.primary_reads():
+            await self._warm_client(self.db)
+
+    async def _warm_client(self, client: Prisma) -> None:
+        results = await asyncio.gather(
+            *(self._representative_reads(client) for _ in range(settings.warmup_concurrency)),
+            return_exceptions=True
+        )
+        # Un fallo no impide arrancar: /ready refleja el estado real de la base de datos
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Consulta de calentamiento fallida: %s", result)
+
+    async def _representative_reads(self, client: Prisma) -> None:
+        animals = AnimalService(client)
+        razas = RazaService(client)
+
+        page, total, _ = await animals.get_all_animals(limit=10)
+        await animals.get_all_animals(
+            limit=10, include_total=False, filters=AnimalFilter(sexo=["M"], edad_min=0, edad_max=50)
+        )
+        fast_json_response(AnimalListResponse, dict(animals=page, total=total, page=1, size=10))
+
+        if page:
+            first = page[0]
+            fast_json_response(AnimalResponse, await animals.get_animal_by_code(first.codAnimal))
+            by_raza, _, _ = await animals.get_animals_by_raza(first.codRaza, limit=10)
+            found, missing = await animals.get_animals_by_codes([animal.codAnimal for animal in by_raza])
+            fast_json_response(AnimalBatchResponse, dict(animals=found, missing=missing))
+
+        razas_page, total, _ = await razas.get_all_razas(limit=10)
+        fast_json_response(RazaListResponse, dict(razas=razas_page, total=total, page=1, size=10))
+        with_count, _ = await razas.get_razas_with_animal_count(limit=10, include_total=False)
+        fast_json_response(List[RazaWithAnimalsResponse], with_count)
+
+        if razas_page:
+            fast_json_response(RazaResponse, await razas.get_raza_by_code(razas_page[0].codRaza))
+            fast_json_response(
+                RazaWithAnimalsResponse, await razas.get_raza_with_animals_count(razas_page[0].codRaza)
+            )
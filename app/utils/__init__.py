@@ -2,10 +2,12 @@
 
 from .exceptions import (
     BaseAPIException, NotFoundError, AlreadyExistsError,
-    ValidationError, DatabaseError, AuthenticationError, AuthorizationError
+    ValidationError, PreconditionFailedError, DatabaseError,
+    AuthenticationError, AuthorizationError, ServiceUnavailableError
 )
 
 __all__ = [
     "BaseAPIException", "NotFoundError", "AlreadyExistsError",
-    "ValidationError", "DatabaseError", "AuthenticationError", "AuthorizationError"
+    "ValidationError", "PreconditionFailedError", "DatabaseError",
+    "AuthenticationError", "AuthorizationError", "ServiceUnavailableError"
 ]
\ No newline at end of file
@@ -0,0 +1,220 @@
+import asyncio
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Deque, Dict, Optional
+
+from fastapi import Request
+
+from ..core.config import settings
+from .exceptions import ServiceUnavailableError
+from .metrics import Counter, Gauge, Histogram, registry
+
+# Rutas de lote, exportación e importación: pocas a la vez, cada una ocupa el motor mucho tiempo
+BULK_SUFFIXES = ("/bulk", "/export")
+BULK_PREFIXES = ("/api/v1/import/",)
+# Rutas POST que solo leen
+READ_SUFFIXES = ("/batch-get",)
+
+# AIMD: reducción multiplicativa si se supera la latencia objetivo, como mucho
+# una vez por intervalo de la latencia objetivo; +1/límite por solicitud rápida
+DECREASE_FACTOR = 0.9
+
+admission_in_flight = registry.register(Gauge(
+    "admission_in_flight", "Solicitudes admitidas en curso", ("budget",)
+))
+admission_queued = registry.register(Gauge(
+    "admission_queued", "Solicitudes esperando turno", ("budget",)
+))
+admission_limit = registry.register(Gauge(
+    "admission_limit", "Límite de concurrencia vigente", ("budget",)
+))
+admission_rejected_total = registry.register(Counter(
+    "admission_rejected_total", "Solicitudes rechazadas con 503", ("budget", "reason")
+))
+admission_wait_seconds = registry.register(Histogram(
+    "admission_wait_seconds", "Espera en la cola de admisión", ("budget",)
+))
+
+
+class AdmissionLimiter:
+    """Límite de concurrencia con cola de espera acotada y plazo máximo de espera
+
+    Si la cola está llena la solicitud se rechaza al momento; si no obtiene
+    turno antes de `timeout` segundos, también. Con `adaptive` el límite se
+    ajusta (AIMD) entre `min_limit` y `max_limit` según la duración de las
+    solicitudes admitidas, para que la latencia no crezca sin límite al
+    saturarse el motor.
+    """
+
+    def __init__(
+        self,
+        budget: str,
+        max_limit: int,
+        queue_size: int,
+        timeout: float,
+        adaptive: bool = False,
+        target_latency: float = 0.25,
+        min_limit: int = 1
+    ):
+        self.budget = budget
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.adaptive = adaptive
+        self.target_latency = target_latency
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        admission_limit.set(max_limit, budget)
+
+    async def acquire(self) -> float:
+        """Esperar turno; devuelve el momento de admisión o lanza ServiceUnavailableError"""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self._admit()
+            return time.perf_counter()
+        if len(self._waiters) >= self.queue_size:
+            self._reject("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        admission_queued.inc(self.budget)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            self._reject("timeout")
+        except asyncio.CancelledError:
+            # Cliente desconectado: devolver el turno si ya se había concedido
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            admission_queued.dec(self.budget)
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        now = time.perf_counter()
+        admission_wait_seconds.observe(now - start, self.budget)
+        return now
+
+    def release(self, admitted_at: Optional[float] = None) -> None:
+        """Liberar el turno y, si es adaptativo, ajustar el límite con la duración observada"""
+        self.in_flight -= 1
+        admission_in_flight.dec(self.budget)
+        if self.adaptive and admitted_at is not None:
+            self._adjust(time.perf_counter() - admitted_at)
+        self._wake()
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        admission_in_flight.inc(self.budget)
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._admit()
+            waiter.set_result(None)
+
+    def _adjust(self, duration: float) -> None:
+        if duration > self.target_latency:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.target_latency:
+                self._last_decrease = now
+                self.limit = max(float(self.min_limit), self.limit * DECREASE_FACTOR)
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+        admission_limit.set(round(self.limit, 2), self.budget)
+
+    def _reject(self, reason: str) -> None:
+        admission_rejected_total.inc(self.budget, reason)
+        raise ServiceUnavailableError(
+            f"Servicio saturado ({self.budget}), intente de nuevo más tarde",
+            retry_after=settings.admission_retry_after
+        )
+
+
+class AdmissionTicket:
+    """Turno de admisión de una solicitud, tomado con la primera consulta
+
+    Así las respuestas servidas desde la caché (o con 304) no ocupan turno ni
+    cuentan en la latencia del ajuste adaptativo. Las consultas concurrentes
+    de la misma solicitud comparten el turno.
+    """
+
+    def __init__(self, limiter: AdmissionLimiter):
+        self.limiter = limiter
+        self.admitted_at: Optional[float] = None
+        self.closed = False
+        self._lock = asyncio.Lock()
+
+    async def ensure(self) -> None:
+        """Esperar turno si aún no se tiene (o lanzar ServiceUnavailableError)"""
+        if self.admitted_at is not None or self.closed:
+            return
+        async with self._lock:
+            if self.admitted_at is None and not self.closed:
+                admitted_at = await self.limiter.acquire()
+                if self.closed:
+                    # La solicitud terminó mientras una tarea suya esperaba turno
+                    self.limiter.release()
+                else:
+                    self.admitted_at = admitted_at
+
+    def release(self) -> None:
+        """Devolver el turno al terminar la solicitud (si llegó a tomarse)"""
+        self.closed = True
+        if self.admitted_at is not None:
+            self.limiter.release(self.admitted_at)
+            self.admitted_at = None
+
+
+# Turno de la solicitud en curso (lo fija get_db; lo consume el cliente de Prisma)
+current_ticket: ContextVar[Optional[AdmissionTicket]] = ContextVar("current_ticket", default=None)
+
+
+def request_budget(request: Request) -> str:
+    """Presupuesto de una solicitud: read, write o bulk (lotes, exportación e importación)"""
+    path = getattr(request.scope.get("route"), "path_format", None) or request.url.path
+    if path.endswith(BULK_SUFFIXES) or path.startswith(BULK_PREFIXES):
+        return "bulk"
+    if request.method in ("GET", "HEAD", "OPTIONS") or path.endswith(READ_SUFFIXES):
+        return "read"
+    return "write"
+
+
+def _create_limiters() -> Dict[str, AdmissionLimiter]:
+    if not settings.admission_enabled:
+        return {}
+    adaptive = dict(
+        adaptive=settings.admission_adaptive,
+        target_latency=settings.admission_target_latency,
+        min_limit=settings.admission_min_limit
+    )
+    return {
+        "read": AdmissionLimiter(
+            "read", settings.admission_read_limit, settings.admission_read_queue,
+            settings.admission_queue_timeout, **adaptive
+        ),
+        "write": AdmissionLimiter(
+            "write", settings.admission_write_limit, settings.admission_write_queue,
+            settings.admission_queue_timeout, **adaptive
+        ),
+        # Lotes y exportaciones duran lo que dure el volumen: límite fijo
+        "bulk": AdmissionLimiter(
+            "bulk", settings.admission_bulk_limit, settings.admission_bulk_queue,
+            settings.admission_queue_timeout
+        ),
+    }
+
+
+# Limitadores globales del proceso, por presupuesto
+limiters = _create_limiters()
+
+
+def limiter_for(request: Request) -> Optional[AdmissionLimiter]:
+    """Limitador que corresponde a la solicitud (None si el control está desactivado)"""
+    return limiters.get(request_budget(request))
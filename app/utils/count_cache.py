@@ -0,0 +1,71 @@
+import time
+from typing import Awaitable, Callable, Dict, Literal, Optional, Tuple
+
+from ..core.config import settings
+
+# "exact": total vigente (invalidado por las escrituras de este proceso)
+# "estimated": se acepta un total invalidado mientras no supere la antigüedad máxima
+TotalMode = Literal["exact", "estimated"]
+
+
+class CountCache:
+    """Caché en memoria de totales por tabla y filtro"""
+
+    def __init__(self, ttl: float, max_staleness: float):
+        self.ttl = ttl
+        self.max_staleness = max_staleness
+        # (tabla, filtro) -> (total, momento del conteo, vigente)
+        self._entries: Dict[Tuple[str, str], Tuple[int, float, bool]] = {}
+
+    def get(self, table: str, key: str, mode: TotalMode = "exact") -> Optional[int]:
+        """Obtener un total cacheado si sigue siendo utilizable en el modo indicado"""
+        entry = self._entries.get((table, key))
+        if entry is None:
+            return None
+
+        total, counted_at, valid = entry
+        age = time.monotonic() - counted_at
+        if valid and age < self.ttl:
+            return total
+        if mode == "estimated" and age < self.max_staleness:
+            return total
+        return None
+
+    def set(self, table: str, key: str, total: int) -> None:
+        """Guardar un total recién contado"""
+        self._entries[(table, key)] = (total, time.monotonic(), True)
+
+    def invalidate(self, table: str, *keys: str) -> None:
+        """Marcar como obsoletos los totales de una tabla (o solo de los filtros indicados)
+
+        Las entradas no se borran: el modo "estimated" puede seguir usándolas
+        hasta que superen la antigüedad máxima permitida.
+        """
+        for entry_key, (total, counted_at, _) in list(self._entries.items()):
+            if entry_key[0] == table and (not keys or entry_key[1] in keys):
+                self._entries[entry_key] = (total, counted_at, False)
+
+    def clear(self) -> None:
+        """Vaciar la caché"""
+        self._entries.clear()
+
+    async def get_or_count(
+        self,
+        table: str,
+        key: str,
+        counter: Callable[[], Awaitable[int]],
+        mode: TotalMode = "exact"
+    ) -> int:
+        """Devolver el total cacheado o ejecutar el conteo y guardarlo"""
+        total = self.get(table, key, mode)
+        if total is None:
+            total = await counter()
+            self.set(table, key, total)
+        return total
+
+
+# Instancia global compartida por los servicios
+count_cache = CountCache(
+    ttl=settings.count_cache_ttl,
+    max_staleness=settings.count_estimate_max_age
+)
@@ -0,0 +1,89 @@
+import hashlib
+import time
+import uuid
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from ..core.config import settings
+from .exceptions import PreconditionFailedError
+
+
+class TableVersions:
+    """Contador de versión por tabla, incrementado por cada escritura de los servicios
+
+    El contador vive en el proceso: el ETag de los listados incluye un
+    identificador de proceso y una ventana de `list_etag_ttl` segundos para que
+    las escrituras hechas por otros workers o fuera de la aplicación no dejen
+    un 304 obsoleto más allá de esa ventana.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions: Dict[str, int] = {}
+
+    def bump(self, *tables: str) -> None:
+        """Registrar una escritura en las tablas indicadas"""
+        for table in tables:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    def get(self, table: str) -> int:
+        """Obtener la versión actual de una tabla"""
+        return self._versions.get(table, 0)
+
+
+# Instancia global compartida por los servicios
+table_versions = TableVersions()
+
+
+def row_etag(*versions: int) -> str:
+    """ETag fuerte de un recurso a partir de sus columnas de versión"""
+    return '"' + ".".join(str(version) for version in versions) + '"'
+
+
+def list_etag(request: Request, *tables: str) -> str:
+    """ETag débil de un listado calculado sin leer filas: versiones de tabla + URL normalizada
+
+    Es débil (W/) porque las versiones de tabla son del proceso: con varios
+    workers, uno puede no conocer aún una escritura atendida por otro y
+    responder 304 hasta que cambie la ventana de `list_etag_ttl`. No sirve
+    para If-Match, que exige comparación fuerte.
+    """
+    window = int(time.time() // settings.list_etag_ttl) if settings.list_etag_ttl > 0 else 0
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    versions = ",".join(f"{table}:{table_versions.get(table)}" for table in tables)
+    raw = f"{table_versions.epoch}|{window}|{versions}|{request.url.path}?{query}"
+    return 'W/"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+def _etag_values(header: str) -> list:
+    return [value.strip().removeprefix("W/") for value in header.split(",") if value.strip()]
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Comprobar si el If-None-Match de la solicitud coincide con el ETag actual (comparación débil)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    values = _etag_values(header)
+    return "*" in values or etag.removeprefix("W/") in values
+
+
+def not_modified_response(etag: str) -> Response:
+    """Respuesta 304 sin cuerpo"""
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def parse_if_match(request: Request) -> Optional[int]:
+    """Obtener la versión esperada del encabezado If-Match (primer componente del ETag)"""
+    header = request.headers.get("if-match")
+    if not header or header.strip() == "*":
+        return None
+
+    values = _etag_values(header)
+    if len(values) != 1:
+        raise PreconditionFailedError("If-Match debe contener un único ETag")
+    try:
+        return int(values[0].strip('"').split(".")[0])
+    except ValueError:
+        raise PreconditionFailedError("ETag inválido en If-Match")
@@ -20,6 +20,11 @@ class ValidationError(BaseAPIException):
     def __init__(self, detail: str = "Error de validación"):
         super().__init__(detail=detail, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
 
+class PreconditionFailedError(BaseAPIException):
+    """Error cuando no se cumple una precondición (If-Match)"""
+    def __init__(self, detail: str = "El recurso fue modificado por otra solicitud"):
+        super().__init__(detail=detail, status_code=status.HTTP_412_PRECONDITION_FAILED)
+
 class DatabaseError(BaseAPIException):
     """Error de base de datos"""
     def __init__(self, detail: str = "Error de base de datos"):
@@ -33,4 +38,10 @@ class AuthenticationError(BaseAPIException):
 class AuthorizationError(BaseAPIException):
     """Error de autorización"""
     def __init__(self, detail: str = "No tiene permisos para realizar esta acción"):
-        super().__init__(detail=detail, status_code=status.HTTP_403_FORBIDDEN)
\ No newline at end of file
+        super().__init__(detail=detail, status_code=status.HTTP_403_FORBIDDEN)
+
+class ServiceUnavailableError(BaseAPIException):
+    """Error cuando el servicio está saturado y rechaza la solicitud (503 con Retry-After)"""
+    def __init__(self, detail: str = "Servicio saturado, intente de nuevo más tarde", retry_after: int = 1):
+        super().__init__(detail=detail, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.headers = {"Retry-After": str(retry_after)}
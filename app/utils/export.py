@@ -0,0 +1,41 @@
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, List
+
+# Columnas exportadas, en el orden de la tabla Animales
+ANIMAL_EXPORT_FIELDS = [
+    "codAnimal",
+    "descripcion",
+    "sexo",
+    "edad",
+    "codRaza",
+    "colorPelaje",
+    "colorOjos",
+]
+
+
+async def encode_ndjson(chunks: AsyncIterator[List[Any]], fields: List[str]) -> AsyncIterator[bytes]:
+    """Codificar cada bloque de registros como líneas JSON a medida que llega"""
+    async for chunk in chunks:
+        lines = [
+            json.dumps({field: getattr(row, field) for field in fields}, ensure_ascii=False)
+            for row in chunk
+        ]
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def encode_csv(chunks: AsyncIterator[List[Any]], fields: List[str]) -> AsyncIterator[bytes]:
+    """Codificar cada bloque de registros como filas CSV a medida que llega"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(fields)
+    yield buffer.getvalue().encode("utf-8")
+
+    async for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([getattr(row, field) for field in fields] for row in chunk)
+        yield buffer.getvalue().encode("utf-8")
@@ -0,0 +1,86 @@
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional, Sequence, Type
+
+from pydantic import BaseModel, ConfigDict, create_model
+
+from .exceptions import ValidationError
+
+
+def _split(value: str) -> list:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def public_fields(model: Type[BaseModel], relations: Sequence[str] = ()) -> dict:
+    """Nombres públicos (alias) de los campos de un esquema, sin sus relaciones"""
+    return {
+        info.alias or name: name
+        for name, info in model.model_fields.items()
+        if name not in relations
+    }
+
+
+def parse_fields(
+    value: Optional[str],
+    model: Type[BaseModel],
+    relations: Sequence[str] = (),
+    required: Iterable[str] = ()
+) -> Optional[FrozenSet[str]]:
+    """Convertir `fields=a,b` en los atributos del esquema a devolver (None = todos)"""
+    if value is None:
+        return None
+
+    available = public_fields(model, relations)
+    names = _split(value)
+    unknown = [name for name in names if name not in available]
+    if unknown or not names:
+        raise ValidationError(
+            f"Campos no válidos en fields: {', '.join(unknown) or '(vacío)'}. "
+            f"Campos disponibles: {', '.join(available)}"
+        )
+    return frozenset(available[name] for name in names) | frozenset(required)
+
+
+def parse_include(value: Optional[str], relations: Sequence[str], default: Sequence[str]) -> FrozenSet[str]:
+    """Convertir `include=a,b` en las relaciones a incluir (`include=` no incluye ninguna)"""
+    if value is None:
+        return frozenset(default)
+
+    names = _split(value)
+    unknown = [name for name in names if name not in relations]
+    if unknown:
+        raise ValidationError(
+            f"Relaciones no válidas en include: {', '.join(unknown)}. "
+            f"Relaciones disponibles: {', '.join(relations)}"
+        )
+    return frozenset(names)
+
+
+@lru_cache(maxsize=None)
+def project_model(model: Type[BaseModel], exclude: FrozenSet[str]) -> Type[BaseModel]:
+    """Esquema derivado de `model` sin los campos excluidos (cacheado por combinación)"""
+    if not exclude:
+        return model
+
+    definitions = {
+        name: (info.annotation, info)
+        for name, info in model.model_fields.items()
+        if name not in exclude
+    }
+    return create_model(
+        f"{model.__name__}Projection",
+        __config__=ConfigDict(from_attributes=True, populate_by_name=True),
+        **definitions
+    )
+
+
+@lru_cache(maxsize=None)
+def with_items(model: Type[BaseModel], field: str, item: Type[BaseModel]) -> Type[BaseModel]:
+    """Esquema de lista cuyo campo `field` contiene elementos del esquema `item`"""
+    if model.model_fields[field].annotation == list[item]:
+        return model
+
+    return create_model(
+        f"{model.__name__}Projection",
+        __base__=model,
+        **{field: (list[item], ...)}
+    )
@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import Any, AsyncIterator, BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from pydantic import ValidationError as PydanticValidationError
+from starlette.concurrency import run_in_threadpool
+
+from .exceptions import ValidationError
+
+# (número de fila, registro leído o mensaje de error de lectura)
+ImportRow = Tuple[int, Union[Any, str]]
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+def detect_format(filename: Optional[str], formato: Optional[str] = None) -> str:
+    """Determinar el formato del archivo a partir del parámetro o de su extensión"""
+    if formato is not None:
+        return formato
+
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    if extension == "csv":
+        return "csv"
+    if extension in ("ndjson", "jsonl"):
+        return "ndjson"
+
+    raise ValidationError(
+        "No se pudo determinar el formato del archivo; use format=csv o format=ndjson"
+    )
+
+
+def iter_rows(file: BinaryIO, formato: str) -> Iterator[ImportRow]:
+    """Leer el archivo fila a fila sin cargarlo completo en memoria"""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    row_number = 0
+    try:
+        if formato == "csv":
+            for row_number, row in enumerate(csv.DictReader(text), start=1):
+                yield row_number, row
+        else:
+            for row_number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield row_number, json.loads(line)
+                except ValueError as e:
+                    yield row_number, f"JSON inválido: {e}"
+    except (UnicodeDecodeError, csv.Error) as e:
+        # La respuesta ya se está enviando: el error se informa como una fila más
+        yield row_number + 1, f"No se pudo leer el archivo a partir de esta fila: {e}"
+    finally:
+        # No cerrar el archivo subido: lo gestiona FastAPI
+        text.detach()
+
+
+async def iter_batches(rows: Iterator[ImportRow], batch_size: int) -> AsyncIterator[List[ImportRow]]:
+    """Agrupar las filas en bloques, leyendo el archivo fuera del event loop"""
+    while True:
+        batch = await run_in_threadpool(lambda: list(islice(rows, batch_size)))
+        if not batch:
+            return
+        yield batch
+
+
+def format_validation_error(error: PydanticValidationError) -> str:
+    """Resumir un error de validación de pydantic en una sola línea"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+        for err in error.errors()
+    )
@@ -0,0 +1,142 @@
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .admission import current_ticket
+from .metrics import Counter, Histogram, registry
+
+BatchFunction = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+
+class LoaderStats:
+    """Contadores de un loader, acumulados entre event loops"""
+
+    def __init__(self):
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.keys = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "keys": self.keys,
+            # Solicitudes atendidas por cada consulta enviada a la base de datos
+            "coalescing_ratio": round(self.requests / self.batches, 3) if self.batches else 0.0,
+        }
+
+
+loader_stats: Dict[str, LoaderStats] = {}
+
+# Los mismos contadores en /metrics: la agrupación se calcula como
+# loader_keys_requested_total / loader_batches_total
+loader_keys_requested_total = registry.register(Counter(
+    "loader_keys_requested_total", "Claves solicitadas a los loaders", ("loader",)
+))
+loader_singleflight_hits_total = registry.register(Counter(
+    "loader_singleflight_hits_total", "Claves que compartieron una búsqueda ya en curso", ("loader",)
+))
+loader_batches_total = registry.register(Counter(
+    "loader_batches_total", "Consultas enviadas a la base de datos por los loaders", ("loader",)
+))
+loader_batch_keys = registry.register(Histogram(
+    "loader_batch_keys", "Claves distintas por consulta de un loader", ("loader",),
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500)
+))
+
+
+class BatchLoader:
+    """Agrupa búsquedas concurrentes por clave (estilo DataLoader)
+
+    - Las búsquedas de una clave que ya está en curso comparten el mismo
+      resultado (singleflight).
+    - Las claves distintas que llegan dentro de `window` segundos, o hasta
+      completar `max_batch`, se resuelven con una única llamada a `batch_fn`.
+    """
+
+    def __init__(self, name: str, batch_fn: BatchFunction, window: float, max_batch: int):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch = max_batch
+        self.stats = loader_stats.setdefault(name, LoaderStats())
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Hashable] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def load(self, key: Hashable) -> Any:
+        """Obtener el valor de una clave (None si no existe)"""
+        # Cada solicitud toma su propio turno de admisión antes de esperar el
+        # resultado compartido: la consulta del lote se ejecuta sin turno
+        ticket = current_ticket.get()
+        if ticket is not None:
+            await ticket.ensure()
+        self.stats.requests += 1
+        loader_keys_requested_total.inc(self.name)
+        future = self._pending.get(key)
+        if future is not None:
+            self.stats.coalesced += 1
+            loader_singleflight_hits_total.inc(self.name)
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            self._queue.append(key)
+            if len(self._queue) >= self.max_batch:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+
+        # shield: cancelar una solicitud no debe cancelar el resultado compartido
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        keys, self._queue = self._queue, []
+        if keys:
+            asyncio.get_running_loop().create_task(self._run(keys))
+
+    async def _run(self, keys: List[Hashable]) -> None:
+        # La tarea hereda el contexto de la solicitud que disparó el lote, que
+        # puede terminar (y liberar su turno) antes que las demás que esperan
+        current_ticket.set(None)
+        self.stats.batches += 1
+        self.stats.keys += len(keys)
+        loader_batches_total.inc(self.name)
+        loader_batch_keys.observe(len(keys), self.name)
+        try:
+            results = await self.batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                future = self._pending.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+                    # Evitar el aviso "exception was never retrieved" si nadie espera
+                    future.exception()
+            return
+
+        for key in keys:
+            future = self._pending.pop(key)
+            if not future.done():
+                future.set_result(results.get(key))
+
+
+# Un juego de loaders por event loop: los futures no pueden cruzar loops
+_loaders: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, int], BatchLoader]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_loader(name: str, owner: Any, batch_fn: BatchFunction, window: float, max_batch: int) -> BatchLoader:
+    """Obtener (o crear) el loader `name` del event loop actual para un cliente dado"""
+    loaders = _loaders.setdefault(asyncio.get_running_loop(), {})
+    key = (name, id(owner))
+    loader = loaders.get(key)
+    if loader is None:
+        loader = BatchLoader(name, batch_fn, window, max_batch)
+        loaders[key] = loader
+    return loader
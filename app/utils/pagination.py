@@ -0,0 +1,39 @@
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Sequence, Tuple, Type, Union
+
+from .exceptions import ValidationError
+
+
+def encode_cursor(key: Union[str, int]) -> str:
+    """Codificar la última clave primaria de una página como cursor opaco"""
+    raw = json.dumps({"k": key}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, key_type: Type = str) -> Any:
+    """Decodificar un cursor opaco y devolver la clave primaria que contiene"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key = data["k"]
+    except (binascii.Error, ValueError, UnicodeError, KeyError, TypeError):
+        raise ValidationError("Cursor de paginación inválido")
+
+    if type(key) is not key_type:
+        raise ValidationError("Cursor de paginación inválido")
+
+    return key
+
+
+def split_page(rows: Sequence[Any], limit: int, key: str) -> Tuple[List[Any], Optional[str]]:
+    """Recortar una consulta de `limit + 1` filas y calcular el siguiente cursor
+
+    Si la consulta devolvió más de `limit` filas existe una página siguiente,
+    cuyo cursor es la clave de la última fila que se entrega.
+    """
+    page = list(rows[:limit])
+    if len(rows) > limit and page:
+        return page, encode_cursor(getattr(page[-1], key))
+    return page, None
@@ -0,0 +1,305 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import settings
+from ..core.database import current_client, read_router, replicas
+from .etags import is_not_modified, not_modified_response
+from .metrics import Counter, Gauge, registry
+
+# Etiquetas de las entradas: cada escritura de los servicios invalida las que afecta
+#   table:animal / table:raza  listados generales de la tabla
+#   animal:<código>            detalle del animal
+#   raza:<código>              datos de la raza (detalle y razas incluidas en animales)
+#   raza-animals:<código>      listado de animales de la raza
+#   raza-count:<código>        contador de animales de la raza
+ANIMAL_TABLE = "table:animal"
+RAZA_TABLE = "table:raza"
+
+
+def animal_tag(cod_animal: str) -> str:
+    return f"animal:{cod_animal}"
+
+
+def raza_tag(cod_raza: str) -> str:
+    return f"raza:{cod_raza}"
+
+
+def raza_animals_tag(cod_raza: str) -> str:
+    return f"raza-animals:{cod_raza}"
+
+
+def raza_count_tag(cod_raza: str) -> str:
+    return f"raza-count:{cod_raza}"
+
+
+# Cuerpo codificado y ETag de una respuesta cacheada
+CachedBody = Tuple[bytes, Optional[str]]
+
+
+class MemoryCacheBackend:
+    """LRU con TTL en memoria del proceso
+
+    Con varios workers cada uno tiene su propia caché: las escrituras atendidas
+    por otro worker solo se reflejan al expirar el TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # clave -> (cuerpo, ETag, expiración, etiquetas)
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[str], float, FrozenSet[str]]]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        # etiqueta -> momento de la última invalidación
+        self._invalidated: Dict[str, float] = {}
+
+    async def get(self, key: str) -> Optional[CachedBody]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        body, etag, expires, _ = entry
+        if expires <= time.time():
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return body, etag
+
+    async def set(self, key: str, body: bytes, etag: Optional[str], tags: FrozenSet[str], not_before: float) -> None:
+        if any(self._invalidated.get(tag, float("-inf")) >= not_before for tag in tags):
+            return
+        self._discard(key)
+        self._entries[key] = (body, etag, time.time() + self.ttl, tags)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        now = time.time()
+        for tag in tags:
+            self._invalidated[tag] = now
+            for key in self._keys_by_tag.pop(tag, ()):
+                self._discard(key)
+        if len(self._invalidated) > self.max_entries:
+            # Solo importan las invalidaciones recientes (lecturas aún en curso)
+            self._invalidated = {tag: at for tag, at in self._invalidated.items() if at > now - self.ttl}
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_tag.clear()
+        self._invalidated.clear()
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[3]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+class SharedCacheBackend:
+    """Caché compartida por todos los workers del host sobre un archivo SQLite
+
+    Sustituto local de un almacén compartido (Redis, Memcached): las
+    invalidaciones de cualquier worker llegan a todos. Las operaciones son
+    bloqueantes y se ejecutan en el pool de hilos.
+    """
+
+    # Escrituras entre purgas de entradas expiradas
+    PURGE_EVERY = 1000
+
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, body BLOB, etag TEXT, expires REAL);"
+            "CREATE TABLE IF NOT EXISTS entry_tags (tag TEXT, key TEXT, PRIMARY KEY (tag, key));"
+            "CREATE INDEX IF NOT EXISTS entry_tags_key ON entry_tags (key);"
+            "CREATE TABLE IF NOT EXISTS invalidations (tag TEXT PRIMARY KEY, at REAL);"
+        )
+
+    async def get(self, key: str) -> Optional[CachedBody]:
+        return await run_in_threadpool(self._get, key)
+
+    async def set(self, key: str, body: bytes, etag: Optional[str], tags: FrozenSet[str], not_before: float) -> None:
+        await run_in_threadpool(self._set, key, body, etag, tags, not_before)
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        await run_in_threadpool(self._invalidate, list(tags))
+
+    async def clear(self) -> None:
+        await run_in_threadpool(self._clear)
+
+    def _get(self, key: str) -> Optional[CachedBody]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag FROM entries WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _set(self, key: str, body: bytes, etag: Optional[str], tags: FrozenSet[str], not_before: float) -> None:
+        tags = list(tags)
+        marks = ",".join("?" * len(tags))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if tags and self._conn.execute(
+                    f"SELECT 1 FROM invalidations WHERE tag IN ({marks}) AND at >= ? LIMIT 1", (*tags, not_before)
+                ).fetchone():
+                    self._conn.execute("COMMIT")
+                    return
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, body, etag, expires) VALUES (?, ?, ?, ?)",
+                    (key, body, etag, time.time() + self.ttl)
+                )
+                self._conn.execute("DELETE FROM entry_tags WHERE key = ?", (key,))
+                self._conn.executemany(
+                    "INSERT INTO entry_tags (tag, key) VALUES (?, ?)", [(tag, key) for tag in tags]
+                )
+                self._writes += 1
+                if self._writes % self.PURGE_EVERY == 0:
+                    self._purge()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _invalidate(self, tags: list) -> None:
+        if not tags:
+            return
+        marks = ",".join("?" * len(tags))
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    f"DELETE FROM entries WHERE key IN (SELECT key FROM entry_tags WHERE tag IN ({marks}))", tags
+                )
+                self._conn.execute("DELETE FROM entry_tags WHERE key NOT IN (SELECT key FROM entries)")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO invalidations (tag, at) VALUES (?, ?)", [(tag, now) for tag in tags]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _purge(self) -> None:
+        now = time.time()
+        self._conn.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+        self._conn.execute("DELETE FROM entry_tags WHERE key NOT IN (SELECT key FROM entries)")
+        self._conn.execute("DELETE FROM invalidations WHERE at <= ?", (now - self.ttl,))
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._conn.executescript("DELETE FROM entries; DELETE FROM entry_tags; DELETE FROM invalidations;")
+
+
+response_cache_requests_total = registry.register(Counter(
+    "response_cache_requests_total", "Consultas a la caché de respuestas", ("route", "result")
+))
+response_cache_hit_ratio = registry.register(Gauge(
+    "response_cache_hit_ratio", "Proporción de aciertos de la caché de respuestas", ("route",)
+))
+
+
+def cache_key(request: Request) -> str:
+    """Clave de la respuesta: ruta y parámetros de consulta normalizados (ordenados)"""
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+class ResponseCache:
+    """Caché de cuerpos de respuesta codificados, invalidada por etiquetas
+
+    Las rutas consultan la caché antes de leer de la base de datos y guardan la
+    respuesta con las etiquetas de las entidades que contiene; los servicios
+    invalidan las etiquetas afectadas después de cada escritura. Una respuesta
+    no se guarda si alguna de sus etiquetas se invalidó después de empezar la
+    lectura (o durante la ventana de read-your-writes si hay réplicas, que
+    pueden devolver datos atrasados).
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.settle = settings.read_your_writes_seconds if replicas else 0.0
+        # ruta -> [aciertos, consultas]
+        self._stats: Dict[str, list] = {}
+
+    async def lookup(self, request: Request) -> Optional[Response]:
+        """Respuesta cacheada (o 304) para la solicitud; None si hay que generarla"""
+        # Un cliente recién fijado a la primaria no debe leer entradas de otros
+        if self.backend is None or read_router.is_pinned(current_client.get()):
+            return None
+        request.state.response_cache_started = time.time()
+        cached = await self.backend.get(cache_key(request))
+        self._record(request, cached is not None)
+        if cached is None:
+            return None
+
+        body, etag = cached
+        if etag is not None and is_not_modified(request, etag):
+            return not_modified_response(etag)
+        headers = {"X-Cache": "HIT"}
+        if etag is not None:
+            headers["ETag"] = etag
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def store(self, request: Request, response: Response, tags: Iterable[str]) -> Response:
+        """Guardar una respuesta 200 generada tras un `lookup` fallido"""
+        started = getattr(request.state, "response_cache_started", None)
+        if started is not None and response.status_code == 200:
+            await self.backend.set(
+                cache_key(request), response.body, response.headers.get("etag"),
+                frozenset(tags), started - self.settle
+            )
+            response.headers["X-Cache"] = "MISS"
+        return response
+
+    async def invalidate(self, *tags: str) -> None:
+        """Eliminar las entradas con alguna de las etiquetas"""
+        if self.backend is not None and tags:
+            await self.backend.invalidate(tags)
+
+    async def clear(self) -> None:
+        """Vaciar la caché"""
+        if self.backend is not None:
+            await self.backend.clear()
+
+    def _record(self, request: Request, hit: bool) -> None:
+        route = getattr(request.scope.get("route"), "path_format", None) or "unmatched"
+        stats = self._stats.setdefault(route, [0, 0])
+        stats[0] += hit
+        stats[1] += 1
+        response_cache_requests_total.inc(route, "hit" if hit else "miss")
+        response_cache_hit_ratio.set(stats[0] / stats[1], route)
+
+
+def _create_backend():
+    if settings.response_cache_backend == "memory":
+        return MemoryCacheBackend(settings.response_cache_max_entries, settings.response_cache_ttl)
+    if settings.response_cache_backend == "shared":
+        path = settings.response_cache_path or os.path.join(tempfile.gettempdir(), "animal-api-response-cache.sqlite3")
+        return SharedCacheBackend(path, settings.response_cache_ttl)
+    return None
+
+
+# Instancia global compartida por rutas y servicios
+response_cache = ResponseCache(_create_backend())
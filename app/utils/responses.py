@@ -0,0 +1,34 @@
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    """TypeAdapter precompilado por esquema de respuesta"""
+    return TypeAdapter(schema)
+
+
+def fast_json_response(
+    schema: Any,
+    data: Any,
+    status_code: int = 200,
+    headers: Optional[dict] = None
+) -> Response:
+    """Convertir datos leídos de Prisma al esquema de respuesta y serializarlos a bytes
+
+    Los datos se validan una única vez (desde atributos) y se serializan con
+    pydantic-core. Al devolver un `Response`, FastAPI omite la segunda
+    validación contra `response_model` y el paso por `jsonable_encoder`;
+    el `response_model` de la ruta se mantiene para la documentación OpenAPI.
+    """
+    adapter = _adapter(schema)
+    value = adapter.validate_python(data, from_attributes=True)
+    return Response(
+        content=adapter.dump_json(value, by_alias=True),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json"
+    )
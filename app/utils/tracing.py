@@ -0,0 +1,173 @@
+import json
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Entradas de consulta individuales como máximo en la cabecera Server-Timing
+SERVER_TIMING_MAX_QUERIES = 20
+
+
+def query_shape(model: Optional[str], operation: str, arguments: Any) -> str:
+    """Forma de una consulta: modelo, operación y estructura de argumentos sin valores"""
+    if isinstance(arguments, dict) and "query" in arguments and model is None:
+        # query_raw / execute_raw: la forma es el propio SQL parametrizado
+        return f"{operation} {arguments['query']}"
+    return f"{model or '-'}.{operation} {json.dumps(_strip_values(arguments), sort_keys=True)}"
+
+
+def _strip_values(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _strip_values(item) for key, item in value.items() if item is not None}
+    if isinstance(value, (list, tuple)):
+        return ["?"] if value else []
+    return "?"
+
+
+class Span:
+    """Una consulta de Prisma dentro de una solicitud"""
+
+    __slots__ = ("model", "operation", "shape", "start", "duration")
+
+    def __init__(self, model: Optional[str], operation: str, shape: str, start: float, duration: float):
+        self.model = model
+        self.operation = operation
+        self.shape = shape
+        self.start = start
+        self.duration = duration
+
+    @property
+    def name(self) -> str:
+        return f"{self.model}.{self.operation}" if self.model else self.operation
+
+
+class RequestTrace:
+    """Consultas registradas durante una solicitud"""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.started = time.perf_counter()
+        self.spans: List[Span] = []
+
+    def add(self, model: Optional[str], operation: str, arguments: Any, start: float, duration: float) -> None:
+        self.spans.append(Span(model, operation, query_shape(model, operation, arguments), start, duration))
+
+    def db_time(self) -> float:
+        return sum(span.duration for span in self.spans)
+
+    def server_timing(self) -> str:
+        """Valor de la cabecera Server-Timing (duraciones en milisegundos)"""
+        entries = [
+            f'db;dur={self.db_time() * 1000:.2f};desc="{len(self.spans)} consultas"',
+            f"app;dur={(time.perf_counter() - self.started) * 1000:.2f}",
+        ]
+        entries.extend(
+            f'q{index};dur={span.duration * 1000:.2f};desc="{span.name}"'
+            for index, span in enumerate(self.spans[:SERVER_TIMING_MAX_QUERIES], start=1)
+        )
+        return ", ".join(entries)
+
+    def repeated_shapes(self, threshold: int) -> Dict[str, int]:
+        """Formas de consulta que se repiten al menos `threshold` veces (N+1)"""
+        counts: Dict[str, int] = {}
+        for span in self.spans:
+            counts[span.shape] = counts.get(span.shape, 0) + 1
+        return {shape: count for shape, count in counts.items() if count >= threshold}
+
+    def as_records(self, status: str) -> List[dict]:
+        """Una línea JSON por consulta, con los datos de la solicitud"""
+        return [
+            {
+                "method": self.method,
+                "path": self.path,
+                "route": self.route,
+                "status": status,
+                "model": span.model,
+                "operation": span.operation,
+                "start_ms": round((span.start - self.started) * 1000, 3),
+                "duration_ms": round(span.duration * 1000, 3),
+            }
+            for span in self.spans
+        ]
+
+
+current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+
+
+def record_span(model: Optional[str], operation: str, arguments: Any, start: float, duration: float) -> None:
+    """Añadir una consulta a la traza de la solicitud en curso (si la hay)"""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.add(model, operation, arguments, start, duration)
+
+
+_write_lock = threading.Lock()
+
+
+def _write_spans(path: str, records: List[dict]) -> None:
+    lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    # Un único bloqueo evita que se mezclen las líneas de dos solicitudes
+    with _write_lock, open(path, "a", encoding="utf-8") as file:
+        file.write(lines)
+
+
+class TracingMiddleware:
+    """Middleware ASGI: traza de consultas por solicitud
+
+    - Añade la cabecera `Server-Timing` con el tiempo total de base de datos y
+      cada consulta realizada antes de empezar la respuesta.
+    - Si `trace_span_file` está configurado, escribe una línea JSON por consulta.
+    - En modo debug avisa cuando una solicitud repite la misma forma de consulta
+      `trace_n_plus_one_threshold` veces o más (patrón N+1).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(scope["method"], scope["path"])
+        token = current_trace.set(trace)
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_trace.reset(token)
+            trace.route = getattr(scope.get("route"), "path_format", None)
+            await self._finish(trace, status)
+
+    async def _finish(self, trace: RequestTrace, status: str) -> None:
+        if settings.debug:
+            for shape, count in trace.repeated_shapes(settings.trace_n_plus_one_threshold).items():
+                logger.warning(
+                    "Posible N+1 en %s %s: %s consultas con la forma %s",
+                    trace.method, trace.route or trace.path, count, shape
+                )
+
+        if settings.trace_span_file and trace.spans:
+            try:
+                await run_in_threadpool(_write_spans, settings.trace_span_file, trace.as_records(status))
+            except OSError as e:
+                logger.warning("No se pudo escribir el archivo de trazas: %s", e)
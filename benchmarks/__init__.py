@@ -0,0 +1,9 @@
+# benchmarks/__init__.py
+#
+# Scripts de medición de rendimiento. Requieren una base de datos real
+# (DATABASE_URL) y el cliente Prisma generado (`prisma generate`).
+#
+# Carga y latencia de la API:
+#   python -m benchmarks.seed --razas 100 --animals 1000000 --reset
+#   python -m benchmarks.api_load run --output benchmarks/results/baseline.json
+#   python -m benchmarks.api_load compare benchmarks/results/baseline.json benchmarks/results/latest.json
@@ -0,0 +1,378 @@
+"""Carga concurrente y latencias por endpoint de las rutas de animales y razas.
+
+`run` levanta la aplicación FastAPI en el mismo proceso (con su lifespan) y la
+llama con N clientes concurrentes durante --duration segundos. La mezcla de
+operaciones cubre todas las rutas de animal_routes y raza_routes; las escrituras
+solo tocan registros creados por el propio benchmark (y se limpian al final),
+así que los datos cargados con `benchmarks.seed` no cambian entre ejecuciones.
+Cada cliente usa una semilla propia derivada de --seed.
+
+El resultado (rps y p50/p95/p99 por endpoint) se imprime y se guarda como JSON.
+`compare` contrasta dos resultados y termina con código 1 si algún endpoint
+empeora más que --threshold por ciento en p95 o en rendimiento.
+
+Uso:
+    python -m benchmarks.seed --razas 100 --animals 1000000 --reset
+    python -m benchmarks.api_load run --razas 100 --animals 1000000 --concurrency 32 \\
+        --duration 60 --output benchmarks/results/baseline.json
+    python -m benchmarks.api_load compare benchmarks/results/baseline.json benchmarks/results/actual.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.asgi import AsgiClient
+from benchmarks.seed import animal_code, raza_code, SEXOS, PELAJES, OJOS
+
+API = "/api/v1"
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Percentil por rango más cercano sobre valores ordenados"""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+class Worker:
+    """Un cliente concurrente con su propio generador y sus registros temporales"""
+
+    def __init__(self, client: AsgiClient, index: int, args, run_id: str, samples: Dict[str, list]):
+        self.client = client
+        self.rng = random.Random(args.seed * 1000 + index)
+        self.args = args
+        self.prefix = f"B{run_id}{index:03d}"
+        # Identidad propia por cliente: si todos compartieran una, la primera
+        # escritura fijaría a todos a la primaria y saltarían la caché de respuestas
+        self.headers = {"X-Client-Id": f"benchmark-{run_id}-{index}"}
+        self.samples = samples
+        self.created_animals: List[str] = []
+        self.created_razas: List[str] = []
+        self.counter = 0
+
+    def _new_code(self) -> str:
+        self.counter += 1
+        return f"{self.prefix}-{self.counter}"
+
+    def _animal(self) -> str:
+        return animal_code(self.rng.randrange(self.args.animals))
+
+    def _raza(self) -> str:
+        return raza_code(self.rng.randrange(self.args.razas))
+
+    def _animal_body(self, code: str) -> dict:
+        return {
+            "codAnimal": code,
+            "descripcion": f"Animal de benchmark {code}",
+            "sexo": self.rng.choice(SEXOS),
+            "edad": self.rng.randint(0, 20),
+            "codRaza": self._raza(),
+            "colorPelaje": self.rng.choice(PELAJES),
+            "colorOjos": self.rng.choice(OJOS),
+        }
+
+    async def _call(self, name: str, method: str, path: str, expected: Tuple[int, ...], **kwargs) -> Optional[bytes]:
+        start = time.perf_counter()
+        status, body = await self.client.request(method, API + path, headers=self.headers, **kwargs)
+        elapsed = time.perf_counter() - start
+        self.samples.setdefault(name, []).append((elapsed, status in expected))
+        return body if status in expected else None
+
+    # --- Animales ---
+
+    async def listar_animales(self):
+        await self._call("GET /animales", "GET", "/animales/", (200,), params={
+            "page": self.rng.randint(1, 50), "size": 20
+        })
+
+    async def listar_animales_filtrados(self):
+        edad = self.rng.randint(0, 15)
+        await self._call("GET /animales?filtros", "GET", "/animales/", (200,), params={
+            "sexo": self.rng.choice(SEXOS), "edad_min": edad, "edad_max": edad + 3,
+            "cod_raza": self._raza(), "size": 20
+        })
+
+    async def listar_animales_campos(self):
+        await self._call("GET /animales?fields", "GET", "/animales/", (200,), params={
+            "fields": "codAnimal,descripcion", "size": 50, "include_total": "false"
+        })
+
+    async def obtener_animal(self):
+        await self._call("GET /animales/{cod_animal}", "GET", f"/animales/{self._animal()}", (200,))
+
+    async def listar_por_raza(self):
+        await self._call("GET /animales/raza/{cod_raza}", "GET", f"/animales/raza/{self._raza()}", (200,), params={
+            "size": 20
+        })
+
+    async def batch_get_post(self):
+        await self._call("POST /animales/batch-get", "POST", "/animales/batch-get", (200,), json_body={
+            "codes": [self._animal() for _ in range(20)]
+        })
+
+    async def batch_get_query(self):
+        await self._call("GET /animales/batch-get", "GET", "/animales/batch-get", (200,), params={
+            "codes": ",".join(self._animal() for _ in range(20))
+        })
+
+    async def estadisticas(self):
+        await self._call("GET /animales/stats", "GET", "/animales/stats", (200,), params={
+            "group_by": self.rng.choice(["codRaza,sexo", "edad", "sexo,colorPelaje"])
+        })
+
+    async def exportar(self):
+        await self._call("GET /animales/export", "GET", "/animales/export", (200,), params={
+            "format": self.rng.choice(["ndjson", "csv"]), "cod_raza": self._raza()
+        })
+
+    async def crear_animal(self):
+        code = self._new_code()
+        if await self._call("POST /animales", "POST", "/animales/", (201,), json_body=self._animal_body(code)) is not None:
+            self.created_animals.append(code)
+
+    async def crear_animales_lote(self):
+        codes = [self._new_code() for _ in range(20)]
+        body = {"animals": [self._animal_body(code) for code in codes]}
+        if await self._call("POST /animales/bulk", "POST", "/animales/bulk", (200,), json_body=body) is not None:
+            self.created_animals.extend(codes)
+
+    async def actualizar_animal(self):
+        if not self.created_animals:
+            return await self.crear_animal()
+        code = self.rng.choice(self.created_animals)
+        await self._call("PUT /animales/{cod_animal}", "PUT", f"/animales/{code}", (200,), json_body={
+            "edad": self.rng.randint(0, 20), "colorPelaje": self.rng.choice(PELAJES)
+        })
+
+    async def eliminar_animal(self):
+        if not self.created_animals:
+            return await self.crear_animal()
+        code = self.created_animals.pop(self.rng.randrange(len(self.created_animals)))
+        await self._call("DELETE /animales/{cod_animal}", "DELETE", f"/animales/{code}", (204,))
+
+    # --- Razas ---
+
+    async def listar_razas(self):
+        await self._call("GET /razas", "GET", "/razas/", (200,), params={"size": 20})
+
+    async def listar_razas_con_conteo(self):
+        await self._call("GET /razas/with-count", "GET", "/razas/with-count", (200,), params={"size": 20})
+
+    async def obtener_raza(self):
+        await self._call("GET /razas/{cod_raza}", "GET", f"/razas/{self._raza()}", (200,))
+
+    async def obtener_raza_con_conteo(self):
+        await self._call("GET /razas/{cod_raza}/with-count", "GET", f"/razas/{self._raza()}/with-count", (200,))
+
+    async def crear_raza(self):
+        code = self._new_code()
+        body = {"cod_raza": code, "descripcion": f"Raza de benchmark {code}"}
+        if await self._call("POST /razas", "POST", "/razas/", (201,), json_body=body) is not None:
+            self.created_razas.append(code)
+
+    async def actualizar_raza(self):
+        if not self.created_razas:
+            return await self.crear_raza()
+        code = self.rng.choice(self.created_razas)
+        await self._call("PUT /razas/{cod_raza}", "PUT", f"/razas/{code}", (200,), json_body={
+            "descripcion": f"Raza de benchmark {code} ({self.rng.randint(0, 999)})"
+        })
+
+    async def eliminar_raza(self):
+        if not self.created_razas:
+            return await self.crear_raza()
+        code = self.created_razas.pop(self.rng.randrange(len(self.created_razas)))
+        await self._call("DELETE /razas/{cod_raza}", "DELETE", f"/razas/{code}", (204,))
+
+    async def cleanup(self):
+        """Borrar lo que el benchmark creó (fuera de la medición)"""
+        for code in self.created_animals:
+            await self.client.request("DELETE", f"{API}/animales/{code}", headers=self.headers)
+        for code in self.created_razas:
+            await self.client.request("DELETE", f"{API}/razas/{code}", headers=self.headers)
+
+
+# Mezcla de operaciones: (peso, método de Worker). Mayoritariamente lecturas.
+WORKLOAD: List[Tuple[int, Callable]] = [
+    (20, Worker.obtener_animal),
+    (12, Worker.listar_animales),
+    (8, Worker.listar_animales_filtrados),
+    (6, Worker.listar_animales_campos),
+    (10, Worker.listar_por_raza),
+    (4, Worker.batch_get_post),
+    (4, Worker.batch_get_query),
+    (3, Worker.estadisticas),
+    (1, Worker.exportar),
+    (6, Worker.obtener_raza),
+    (3, Worker.obtener_raza_con_conteo),
+    (3, Worker.listar_razas),
+    (3, Worker.listar_razas_con_conteo),
+    (5, Worker.crear_animal),
+    (1, Worker.crear_animales_lote),
+    (4, Worker.actualizar_animal),
+    (4, Worker.eliminar_animal),
+    (1, Worker.crear_raza),
+    (1, Worker.actualizar_raza),
+    (1, Worker.eliminar_raza),
+]
+
+
+async def run(args) -> dict:
+    from app.main import app
+
+    samples: Dict[str, list] = {}
+    run_id = uuid.uuid4().hex[:6]
+    weights = [weight for weight, _ in WORKLOAD]
+    operations = [operation for _, operation in WORKLOAD]
+
+    async with app.router.lifespan_context(app):
+        client = AsgiClient(app)
+        workers = [Worker(client, index, args, run_id, samples) for index in range(args.concurrency)]
+
+        # Calentamiento: cada operación una vez, sin medir
+        for operation in operations:
+            await operation(workers[0])
+        samples.clear()
+
+        deadline = time.perf_counter() + args.duration
+
+        async def loop(worker: Worker):
+            while time.perf_counter() < deadline:
+                operation = worker.rng.choices(operations, weights)[0]
+                await operation(worker)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(loop(worker) for worker in workers))
+        wall = time.perf_counter() - start
+
+        for worker in workers:
+            await worker.cleanup()
+
+    endpoints = {}
+    total = errors = 0
+    for name, values in sorted(samples.items()):
+        latencies = sorted(elapsed * 1000 for elapsed, _ in values)
+        failed = sum(1 for _, ok in values if not ok)
+        total += len(values)
+        errors += failed
+        endpoints[name] = {
+            "count": len(values),
+            "errors": failed,
+            "rps": round(len(values) / wall, 2),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+        }
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "razas": args.razas,
+            "animals": args.animals,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "seed": args.seed,
+        },
+        "total": {"count": total, "errors": errors, "rps": round(total / wall, 2)},
+        "endpoints": endpoints,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result: dict) -> None:
+    print(f"{'endpoint':<36} {'n':>7} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in result["endpoints"].items():
+        print(
+            f"{name:<36} {stats['count']:>7} {stats['errors']:>5} {stats['rps']:>9.1f} "
+            f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+        )
+    total = result["total"]
+    print(f"{'total':<36} {total['count']:>7} {total['errors']:>5} {total['rps']:>9.1f}")
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[str]:
+    """Endpoints que empeoran más que `threshold` % en p95, rendimiento o errores"""
+    regressions = []
+    print(f"{'endpoint':<36} {'p95 base':>9} {'p95 act':>9} {'Δ%':>7} {'rps base':>9} {'rps act':>9} {'Δ%':>7}")
+    for name, base in baseline["endpoints"].items():
+        now = current["endpoints"].get(name)
+        if now is None:
+            continue
+        p95_delta = (now["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100 if base["p95_ms"] else 0.0
+        rps_delta = (now["rps"] - base["rps"]) / base["rps"] * 100 if base["rps"] else 0.0
+        flags = []
+        if p95_delta > threshold:
+            flags.append("p95")
+        if rps_delta < -threshold:
+            flags.append("rps")
+        if now["errors"] > base["errors"]:
+            flags.append("errores")
+        if flags:
+            regressions.append(f"{name}: {', '.join(flags)}")
+        print(
+            f"{name:<36} {base['p95_ms']:>9.2f} {now['p95_ms']:>9.2f} {p95_delta:>+7.1f} "
+            f"{base['rps']:>9.1f} {now['rps']:>9.1f} {rps_delta:>+7.1f}"
+            + (f"  <- {', '.join(flags)}" if flags else "")
+        )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Ejecutar la carga y guardar el resultado")
+    run_parser.add_argument("--razas", type=int, default=100, help="Razas cargadas con benchmarks.seed")
+    run_parser.add_argument("--animals", type=int, default=100_000, help="Animales cargados con benchmarks.seed")
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--duration", type=float, default=30.0, help="Segundos de medición")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--output", default="benchmarks/results/latest.json")
+
+    compare_parser = commands.add_parser("compare", help="Comparar un resultado con una línea base")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="Empeoramiento máximo en %%")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        result = asyncio.run(run(args))
+        print_report(result)
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2, ensure_ascii=False)
+        print(f"Resultado guardado en {args.output}")
+        return 1 if result["total"]["errors"] else 0
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.current, encoding="utf-8") as file:
+        current = json.load(file)
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print("Regresiones:\n  " + "\n  ".join(regressions))
+        return 1
+    print("Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Rendimiento de un endpoint de escritura según la configuración de logging.
+
+Compara la configuración anterior (logging.basicConfig: formato y escritura
+síncronos en el event loop) con setup_logging (cola + hilo escritor, JSON) y
+con setup_logging más muestreo del 10 % de los INFO de app.services. El
+endpoint imita una escritura de AnimalService: una espera (la consulta) y un
+logger.info. Los registros van a un archivo temporal; --sink-latency-us
+simula un destino lento (pipe de stderr con contrapresión, driver de logs).
+
+No necesita base de datos.
+
+Uso:
+    python -m benchmarks.logging_throughput --requests 5000 --concurrency 32 --sink-latency-us 100
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+from app.core.logging_config import (
+    RequestIdMiddleware, log_records_dropped_total, setup_logging, stop_logging
+)
+from benchmarks.asgi import AsgiClient
+
+
+class SlowStream:
+    """Archivo cuya escritura tarda al menos `latency` segundos"""
+
+    def __init__(self, file, latency: float):
+        self.file = file
+        self.latency = latency
+
+    def write(self, data: str) -> int:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.file.write(data)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+    logger = logging.getLogger("app.services.animal_service")
+
+    @app.post("/api/v1/animales/")
+    async def crear(animal: dict):
+        await asyncio.sleep(0)
+        logger.info("Animal creado: %s", animal["codAnimal"])
+        return Response(content=b'{"ok":true}', status_code=201, media_type="application/json")
+
+    return app
+
+
+def configure(mode: str, stream: SlowStream) -> None:
+    stop_logging()
+    if mode == "basicConfig":
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            stream=stream,
+            force=True
+        )
+    else:
+        setup_logging(
+            level="INFO", log_format="json", stream=stream,
+            sampling={"app.services": 0.1} if mode == "cola + muestreo 10 %" else {}
+        )
+
+
+async def measure(client: AsgiClient, requests: int, concurrency: int) -> float:
+    """Solicitudes por segundo"""
+    counter = iter(range(requests))
+
+    async def worker():
+        for index in counter:
+            status, _ = await client.request("POST", "/api/v1/animales/", json_body={"codAnimal": f"A{index:07d}"})
+            assert status == 201, status
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--sink-latency-us", type=float, default=100.0, help="Latencia simulada por escritura")
+    args = parser.parse_args()
+
+    client = AsgiClient(build_app())
+    modes = ["basicConfig", "cola + JSON", "cola + muestreo 10 %"]
+    results = {mode: [] for mode in modes}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.log")
+        with open(path, "a", encoding="utf-8") as file:
+            stream = SlowStream(file, args.sink_latency_us / 1_000_000)
+            for mode in modes:
+                configure(mode, stream)
+                await measure(client, 200, args.concurrency)
+            # Rondas alternadas para repartir el ruido
+            for _ in range(args.rounds):
+                for mode in modes:
+                    configure(mode, stream)
+                    results[mode].append(await measure(client, args.requests, args.concurrency))
+                    # Vaciar la cola fuera de la medición
+                    stop_logging()
+
+    logging.basicConfig(stream=sys.stderr, force=True)
+    base = max(results["basicConfig"])
+    for mode in modes:
+        rps = max(results[mode])
+        print(f"{mode:<24} {rps:10.0f} sol/s  ({(rps / base - 1) * 100:+6.1f} %)")
+    dropped = log_records_dropped_total._values.get(("queue_full",), 0)
+    print(f"registros descartados por cola llena: {dropped:.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
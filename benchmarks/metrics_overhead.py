@@ -0,0 +1,101 @@
+"""Medir el costo de la instrumentación de /metrics sobre una solicitud típica.
+
+Se llama a la aplicación ASGI directamente (sin red) con y sin
+`MetricsMiddleware`. El endpoint serializa una página de animales y registra
+`--queries` consultas con `record_query`, como hace el cliente instrumentado.
+Sin red ni base de datos el costo de la solicitud es el mínimo posible, así que
+el porcentaje obtenido es una cota superior del sobrecosto real.
+
+No necesita base de datos.
+
+Uso:
+    python -m benchmarks.metrics_overhead --rows 10 --requests 5000 --max-overhead 5
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from fastapi import FastAPI
+
+from app.schemas.animal import AnimalListResponse
+from app.utils.metrics import MetricsMiddleware, record_query, registry
+from app.utils.responses import fast_json_response
+from benchmarks.serialization import make_rows
+
+
+def build_app(rows: list, queries: int, instrumented: bool) -> FastAPI:
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+
+    @app.get("/api/v1/animales/raza/{cod_raza}")
+    async def listar(cod_raza: str):
+        if instrumented:
+            for _ in range(queries):
+                record_query("findMany", 0.002)
+        return fast_json_response(
+            AnimalListResponse,
+            dict(animals=rows, total=len(rows), page=1, size=len(rows))
+        )
+
+    return app
+
+
+async def call(app: FastAPI, path: str) -> None:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    """Microsegundos de CPU por solicitud"""
+    start = time.process_time()
+    for i in range(requests):
+        await call(app, f"/api/v1/animales/raza/R{i % 50:03d}")
+    return (time.process_time() - start) * 1_000_000 / requests
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=2, help="Consultas registradas por solicitud")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-overhead", type=float, default=5.0, help="Porcentaje máximo aceptado")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    plain = build_app(rows, args.queries, instrumented=False)
+    instrumented = build_app(rows, args.queries, instrumented=True)
+
+    # Calentamiento (TypeAdapter, rutas) y rondas alternadas para repartir el ruido
+    await measure(plain, 200)
+    await measure(instrumented, 200)
+    base, metered = [], []
+    for _ in range(args.rounds):
+        base.append(await measure(plain, args.requests))
+        metered.append(await measure(instrumented, args.requests))
+
+    base_us, metered_us = min(base), min(metered)
+    overhead = (metered_us - base_us) / base_us * 100
+    series = len(registry.render().splitlines())
+    print(f"sin métricas  {base_us:8.1f} µs/solicitud")
+    print(f"con métricas  {metered_us:8.1f} µs/solicitud  ({series} líneas en /metrics)")
+    print(f"sobrecosto    {overhead:8.2f} %  (máximo {args.max_overhead} %)")
+    return 0 if overhead <= args.max_overhead else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
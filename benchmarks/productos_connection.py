@@ -0,0 +1,62 @@
+"""Comparar el costo por solicitud de conectar/desconectar Prisma en cada llamada
+(el patrón anterior de ProductoService) frente al cliente compartido del lifespan.
+
+Uso:
+    python -m benchmarks.productos_connection --iterations 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from prisma import Prisma
+
+
+async def connect_per_request(iterations: int) -> list[float]:
+    """Patrón anterior: un connect() y disconnect() alrededor de cada consulta"""
+    client = Prisma()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await client.connect()
+        await client.producto.find_many(take=10, order={"id": "asc"})
+        await client.disconnect()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def shared_client(iterations: int) -> list[float]:
+    """Patrón actual: un único cliente conectado durante toda la vida de la app"""
+    client = Prisma()
+    await client.connect()
+    timings = []
+    try:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await client.producto.find_many(take=10, order={"id": "asc"})
+            timings.append(time.perf_counter() - start)
+    finally:
+        await client.disconnect()
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    timings_ms = sorted(t * 1000 for t in timings)
+    p95 = timings_ms[int(len(timings_ms) * 0.95) - 1]
+    print(
+        f"{name:<22} media={statistics.mean(timings_ms):8.2f} ms  "
+        f"p50={statistics.median(timings_ms):8.2f} ms  p95={p95:8.2f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    report("conexión por solicitud", await connect_per_request(args.iterations))
+    report("cliente compartido", await shared_client(args.iterations))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
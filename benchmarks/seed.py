@@ -0,0 +1,108 @@
+"""Cargar un conjunto de datos reproducible en una base de datos local para los benchmarks.
+
+Los códigos son deterministas (R0000..., A0000000...) y el resto de columnas
+se genera con una semilla fija, así que dos cargas con los mismos parámetros
+producen exactamente los mismos datos.
+
+La base de datos es la de DATABASE_URL (con las migraciones aplicadas). Por
+seguridad solo se aceptan servidores locales salvo que se indique
+--allow-remote, y --reset vacía las tablas antes de cargar.
+
+Uso:
+    python -m benchmarks.seed --razas 100 --animals 1000000 --reset
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+from urllib.parse import urlparse
+
+from app.core.config import settings
+from app.core.database import connect_db, disconnect_db, prisma
+from app.services.raza_service import RazaService
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "db", "mysql"}
+
+SEXOS = ["M", "F"]
+PELAJES = ["Negro", "Blanco", "Marrón", "Gris", "Atigrado", "Manchado", "Dorado", "Canela"]
+OJOS = ["Negro", "Marrón", "Azul", "Verde", "Ámbar"]
+PALABRAS = ["pastor", "dócil", "guardián", "cazador", "compañero", "rápido", "tranquilo", "juguetón", "grande", "pequeño"]
+
+
+def raza_code(index: int) -> str:
+    return f"R{index:04d}"
+
+
+def animal_code(index: int) -> str:
+    return f"A{index:07d}"
+
+
+def make_animals(start: int, count: int, razas: int, rng: random.Random) -> List[dict]:
+    return [
+        {
+            "codAnimal": animal_code(index),
+            "descripcion": f"Animal {index} {' '.join(rng.sample(PALABRAS, 2))}",
+            "sexo": rng.choice(SEXOS),
+            "edad": rng.randint(0, 20),
+            "codRaza": raza_code(rng.randrange(razas)),
+            "colorPelaje": rng.choice(PELAJES),
+            "colorOjos": rng.choice(OJOS),
+        }
+        for index in range(start, start + count)
+    ]
+
+
+async def seed(razas: int, animals: int, batch_size: int, seed_value: int, reset: bool) -> None:
+    rng = random.Random(seed_value)
+
+    if reset:
+        await prisma.animal.delete_many()
+        await prisma.raza.delete_many()
+
+    await prisma.raza.create_many(
+        data=[
+            {"codRaza": raza_code(index), "descripcion": f"Raza {index} {rng.choice(PALABRAS)}"}
+            for index in range(razas)
+        ],
+        skip_duplicates=True
+    )
+
+    start = time.perf_counter()
+    for offset in range(0, animals, batch_size):
+        await prisma.animal.create_many(
+            data=make_animals(offset, min(batch_size, animals - offset), razas, rng),
+            skip_duplicates=True
+        )
+        done = min(offset + batch_size, animals)
+        print(f"\ranimales: {done}/{animals} ({done / (time.perf_counter() - start):,.0f}/s)", end="", flush=True)
+    print()
+
+    # Dejar exacto el contador denormalizado de cada raza
+    fixed = await RazaService(prisma).repair_animal_counts()
+    print(f"razas: {razas}, contadores corregidos: {fixed}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--razas", type=int, default=100)
+    parser.add_argument("--animals", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Vaciar Animales y Razas antes de cargar")
+    parser.add_argument("--allow-remote", action="store_true", help="Permitir servidores que no son locales")
+    args = parser.parse_args()
+
+    host = urlparse(settings.database_url).hostname or ""
+    if host not in LOCAL_HOSTS and not args.allow_remote:
+        parser.error(f"DATABASE_URL apunta a '{host}'; use --allow-remote si es intencional")
+
+    await connect_db()
+    try:
+        await seed(args.razas, args.animals, args.batch_size, args.seed, args.reset)
+    finally:
+        await disconnect_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
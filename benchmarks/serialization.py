@@ -0,0 +1,113 @@
+"""Comparar el costo de CPU y memoria de serializar una página de animales con el
+camino anterior (modelo de respuesta + validación de FastAPI + JSONResponse) y con
+`fast_json_response` (una validación desde atributos + serialización de pydantic-core).
+
+No necesita base de datos: las filas imitan los modelos que devuelve Prisma.
+
+Uso:
+    python -m benchmarks.serialization --rows 100 --iterations 2000
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import List, Optional
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+from app.schemas.animal import AnimalListResponse
+from app.utils.responses import fast_json_response
+
+
+class RazaRow(BaseModel):
+    """Forma de prisma.models.Raza"""
+    codRaza: str
+    descripcion: str
+    animales: Optional[List["AnimalRow"]] = None
+
+
+class AnimalRow(BaseModel):
+    """Forma de prisma.models.Animal"""
+    codAnimal: str
+    descripcion: str
+    sexo: str
+    edad: int
+    codRaza: str
+    colorPelaje: str
+    colorOjos: str
+    raza: Optional[RazaRow] = None
+
+
+RazaRow.model_rebuild()
+
+
+def make_rows(count: int) -> List[AnimalRow]:
+    raza = RazaRow(codRaza="R001", descripcion="Raza de prueba")
+    return [
+        AnimalRow(
+            codAnimal=f"A{i:07d}",
+            descripcion=f"Animal de prueba {i}",
+            sexo="F" if i % 2 else "M",
+            edad=i % 15,
+            codRaza="R001",
+            colorPelaje="Marrón",
+            colorOjos="Negro",
+            raza=raza,
+        )
+        for i in range(count)
+    ]
+
+
+RESPONSE_FIELD = create_response_field(name="Response_listar_animales", type_=AnimalListResponse)
+
+
+async def legacy_path(rows: List[AnimalRow]) -> bytes:
+    """Camino anterior: construir el modelo, validar de nuevo y codificar con json"""
+    body = AnimalListResponse(animals=rows, total=len(rows), page=1, size=len(rows))
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=body)
+    return JSONResponse(content).body
+
+
+async def fast_path(rows: List[AnimalRow]) -> bytes:
+    """Camino nuevo: una validación desde atributos y serialización en Rust"""
+    return fast_json_response(
+        AnimalListResponse,
+        dict(animals=rows, total=len(rows), page=1, size=len(rows))
+    ).body
+
+
+async def measure(name: str, path, rows: List[AnimalRow], iterations: int) -> None:
+    await path(rows)  # calentamiento (compila el TypeAdapter)
+
+    start = time.process_time()
+    for _ in range(iterations):
+        await path(rows)
+    cpu_ms = (time.process_time() - start) * 1000 / iterations
+
+    tracemalloc.start()
+    await path(rows)
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocations = sum(stat.count for stat in snapshot.statistics("filename"))
+
+    print(f"{name:<10} cpu/página={cpu_ms:8.3f} ms  pico={peak / 1024:8.1f} KiB  bloques vivos={allocations}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    assert await legacy_path(rows) is not None
+    await measure("anterior", legacy_path, rows, args.iterations)
+    await measure("rápido", fast_path, rows, args.iterations)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,5 @@
+-- AlterTable
+ALTER TABLE `Animales` ADD COLUMN `Version` INTEGER NOT NULL DEFAULT 1;
+
+-- AlterTable
+ALTER TABLE `Razas` ADD COLUMN `Version` INTEGER NOT NULL DEFAULT 1;
@@ -0,0 +1,11 @@
+-- CreateIndex
+CREATE INDEX `Animales_CodRaza_Sexo_Edad_idx` ON `Animales`(`CodRaza`, `Sexo`, `Edad`);
+
+-- CreateIndex
+CREATE INDEX `Animales_Sexo_Edad_idx` ON `Animales`(`Sexo`, `Edad`);
+
+-- CreateIndex
+CREATE INDEX `Animales_ColorPelaje_idx` ON `Animales`(`ColorPelaje`);
+
+-- CreateIndex
+CREATE INDEX `Animales_ColorOjos_idx` ON `Animales`(`Color Ojos`);
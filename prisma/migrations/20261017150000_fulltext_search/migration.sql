@@ -0,0 +1,5 @@
+-- CreateIndex
+CREATE FULLTEXT INDEX `Razas_Descripcion_idx` ON `Razas`(`Descripcion`);
+
+-- CreateIndex
+CREATE FULLTEXT INDEX `Animales_Descripcion_idx` ON `Animales`(`Descripcion`);
@@ -0,0 +1,8 @@
+-- AlterTable
+ALTER TABLE `Razas` ADD COLUMN `TotalAnimales` INTEGER NOT NULL DEFAULT 0;
+
+-- Backfill
+UPDATE `Razas` r
+    LEFT JOIN (SELECT `CodRaza`, COUNT(*) AS total FROM `Animales` GROUP BY `CodRaza`) a
+    ON a.`CodRaza` = r.`CodRaza`
+SET r.`TotalAnimales` = COALESCE(a.total, 0);
@@ -0,0 +1,185 @@
+# tests/fakes.py
+# Base de datos en memoria con la parte de la API de Prisma que usan los servicios
+import copy
+import re
+from datetime import datetime
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from prisma.errors import UniqueViolationError
+
+
+def make_raza(cod_raza: str, descripcion: str = "Raza", **fields):
+    values = dict(codRaza=cod_raza, descripcion=descripcion, totalAnimales=0, version=1)
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+def make_animal(cod_animal: str, cod_raza: str = "R1", **fields):
+    values = dict(
+        codAnimal=cod_animal, descripcion=f"Animal {cod_animal}", sexo="M", edad=3,
+        codRaza=cod_raza, colorPelaje="Negro", colorOjos="Marrón", version=1, raza=None
+    )
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+def make_producto(producto_id: int, **fields):
+    values = dict(
+        id=producto_id, codigo=f"P{producto_id:03d}", nombre=f"Producto {producto_id}", descripcion="",
+        cantidad=1, precio=1000, impuesto=19, imagenUrl=None,
+        createdAt=datetime(2024, 1, 1), updatedAt=datetime(2024, 1, 1)
+    )
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+def _matches(row, where: dict) -> bool:
+    for field, condition in where.items():
+        value = getattr(row, field)
+        if isinstance(condition, dict):
+            if "in" in condition and value not in condition["in"]:
+                return False
+            if "gt" in condition and not value > condition["gt"]:
+                return False
+            if "gte" in condition and not value >= condition["gte"]:
+                return False
+            if "lte" in condition and not value <= condition["lte"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _apply(row, data: dict) -> None:
+    for field, value in data.items():
+        if isinstance(value, dict) and "increment" in value:
+            value = getattr(row, field) + value["increment"]
+        setattr(row, field, value)
+
+
+class FakeTable:
+    def __init__(self, db: "FakeDb", name: str, key: str):
+        self.db = db
+        self.name = name
+        self.key = key
+        self.rows: Dict[str, SimpleNamespace] = {}
+
+    def _log(self, method: str, **arguments) -> None:
+        self.db.calls.append((self.name, method, arguments))
+
+    async def find_many(
+        self, where: Optional[dict] = None, take: Optional[int] = None, **kwargs
+    ) -> List[SimpleNamespace]:
+        """Filas que cumplen el WHERE, siempre ordenadas por clave primaria"""
+        self._log("find_many", where=where, take=take)
+        rows = [row for row in self.rows.values() if _matches(row, where or {})]
+        rows.sort(key=lambda row: getattr(row, self.key))
+        return [copy.copy(row) for row in rows[:take]]
+
+    async def count(self, where: Optional[dict] = None, **kwargs) -> int:
+        self._log("count", where=where)
+        return sum(1 for row in self.rows.values() if _matches(row, where or {}))
+
+    async def group_by(self, by: List[str], **kwargs) -> List[dict]:
+        """GROUP BY con conteo (solo count=True, como lo usa el resumen de animales)"""
+        self._log("group_by", by=by)
+        groups: Dict[tuple, int] = {}
+        for row in self.rows.values():
+            key = tuple(getattr(row, name) for name in by)
+            groups[key] = groups.get(key, 0) + 1
+        return [{**dict(zip(by, key)), "_count": {"_all": count}} for key, count in groups.items()]
+
+    async def find_unique(self, where: dict, **kwargs) -> Optional[SimpleNamespace]:
+        self._log("find_unique", where=where)
+        if self.key in where:
+            row = self.rows.get(where[self.key])
+        else:
+            # Búsqueda por otra columna única (p. ej. el código de un producto)
+            row = next((row for row in self.rows.values() if _matches(row, where)), None)
+        return copy.copy(row) if row is not None else None
+
+    async def create(self, data: dict, **kwargs) -> SimpleNamespace:
+        self._log("create", data=data)
+        if data[self.key] in self.rows:
+            raise UniqueViolationError({"user_facing_error": {"message": "Unique constraint failed"}})
+        row = self.db.factories[self.name](**data)
+        self.rows[data[self.key]] = row
+        return copy.copy(row)
+
+    async def create_many(self, data: List[dict], **kwargs) -> int:
+        self._log("create_many", data=data)
+        for item in data:
+            if item[self.key] in self.rows:
+                raise UniqueViolationError({"user_facing_error": {"message": "Unique constraint failed"}})
+            self.rows[item[self.key]] = self.db.factories[self.name](**item)
+        return len(data)
+
+    async def update(self, where: dict, data: dict, **kwargs) -> Optional[SimpleNamespace]:
+        self._log("update", where=where, data=data)
+        row = self.rows.get(where[self.key])
+        if row is None or not _matches(row, where):
+            return None
+        _apply(row, data)
+        return copy.copy(row)
+
+    async def delete(self, where: dict, **kwargs) -> Optional[SimpleNamespace]:
+        self._log("delete", where=where)
+        return self.rows.pop(where[self.key], None)
+
+
+class FakeDb:
+    """Tablas Animales y Razas en memoria; las transacciones se revierten al fallar"""
+
+    def __init__(self):
+        self.calls: list = []
+        self.factories = {
+            "animal": lambda codAnimal, codRaza, **data: make_animal(codAnimal, codRaza, **data),
+            "raza": lambda codRaza, **data: make_raza(codRaza, **data),
+        }
+        self.animal = FakeTable(self, "animal", "codAnimal")
+        self.raza = FakeTable(self, "raza", "codRaza")
+        self.producto = FakeTable(self, "producto", "id")
+
+    def add_razas(self, *razas) -> None:
+        for raza in razas:
+            self.raza.rows[raza.codRaza] = raza
+
+    def add_productos(self, *productos) -> None:
+        for producto in productos:
+            self.producto.rows[producto.id] = producto
+
+    def add_animals(self, *animals) -> None:
+        for animal in animals:
+            self.animal.rows[animal.codAnimal] = animal
+
+    @asynccontextmanager
+    async def tx(self, **kwargs):
+        saved = (copy.deepcopy(self.animal.rows), copy.deepcopy(self.raza.rows))
+        self.calls.append(("tx", "begin", {}))
+        try:
+            yield self
+        except BaseException:
+            self.animal.rows, self.raza.rows = saved
+            self.calls.append(("tx", "rollback", {}))
+            raise
+        self.calls.append(("tx", "commit", {}))
+
+    async def query_raw(self, query: str, *params) -> List[dict]:
+        """Solo las lecturas con bloqueo (FOR UPDATE) que emiten los servicios"""
+        self.calls.append(("raw", "query_raw", {"query": query, "params": params}))
+        if re.search(r"FROM `Animales` WHERE `CodAnimal` = \?", query):
+            row = self.animal.rows.get(params[0])
+            if row is None:
+                return []
+            return [{
+                "codRaza": row.codRaza, "sexo": row.sexo, "edad": row.edad, "colorPelaje": row.colorPelaje
+            }]
+        if re.search(r"FROM `Razas` WHERE `CodRaza` IN", query):
+            return [{"codRaza": code} for code in sorted(params) if code in self.raza.rows]
+        raise NotImplementedError(query)
+
+    def methods(self, table: str) -> List[str]:
+        """Métodos llamados sobre una tabla, en orden"""
+        return [method for name, method, _ in self.calls if name == table]
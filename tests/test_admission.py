@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from app.core import database
+from app.core.config import settings
+from app.utils import admission
+from app.utils.admission import AdmissionLimiter, AdmissionTicket, current_ticket, request_budget
+from app.utils.exceptions import ServiceUnavailableError
+
+
+def test_waiters_are_admitted_in_order_as_turns_are_released():
+    limiter = AdmissionLimiter("test", max_limit=1, queue_size=5, timeout=1)
+    order = []
+
+    async def request(name):
+        await limiter.acquire()
+        order.append(name)
+        await asyncio.sleep(0)
+        limiter.release()
+
+    async def run():
+        await asyncio.gather(*(request(name) for name in "abc"))
+
+    asyncio.run(run())
+    assert order == ["a", "b", "c"]
+    assert limiter.in_flight == 0
+
+
+def test_full_queue_and_timeout_reject_with_retry_after(monkeypatch):
+    monkeypatch.setattr(settings, "admission_retry_after", 3)
+    limiter = AdmissionLimiter("test", max_limit=1, queue_size=1, timeout=0.01)
+
+    async def run():
+        await limiter.acquire()
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(ServiceUnavailableError) as full:
+            await limiter.acquire()
+        with pytest.raises(ServiceUnavailableError):
+            await waiting
+        return full.value
+
+    error = asyncio.run(run())
+    assert error.status_code == 503
+    assert error.headers == {"Retry-After": "3"}
+    assert limiter.in_flight == 1 and not limiter._waiters
+
+
+def test_adaptive_limit_backs_off_and_recovers(monkeypatch):
+    limiter = AdmissionLimiter("test", max_limit=10, queue_size=5, timeout=1, adaptive=True,
+                               target_latency=0.1, min_limit=2)
+    now = [100.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now[0])
+
+    limiter._adjust(0.5)
+    assert limiter.limit == pytest.approx(9.0)
+    # Como mucho una reducción por intervalo de la latencia objetivo
+    limiter._adjust(0.5)
+    assert limiter.limit == pytest.approx(9.0)
+    for _ in range(50):
+        now[0] += 1
+        limiter._adjust(0.5)
+    assert limiter.limit == 2.0
+
+    for _ in range(200):
+        limiter._adjust(0.01)
+    assert limiter.limit == 10.0
+
+
+def test_tickets_take_a_turn_only_when_a_query_needs_it():
+    limiter = AdmissionLimiter("test", max_limit=1, queue_size=1, timeout=1)
+
+    async def run():
+        cached = AdmissionTicket(limiter)
+        cached.release()
+        assert limiter.in_flight == 0
+
+        ticket = AdmissionTicket(limiter)
+        await asyncio.gather(ticket.ensure(), ticket.ensure())
+        assert limiter.in_flight == 1
+        ticket.release()
+        await ticket.ensure()
+        assert limiter.in_flight == 0 and ticket.closed
+
+    asyncio.run(run())
+
+
+def _request(method: str, path: str) -> Request:
+    return Request({"type": "http", "method": method, "path": path, "headers": []})
+
+
+@pytest.mark.parametrize("method, path, budget", [
+    ("GET", "/api/v1/animales/", "read"),
+    ("POST", "/api/v1/animales/batch-get", "read"),
+    ("POST", "/api/v1/animales/", "write"),
+    ("DELETE", "/api/v1/razas/R1", "write"),
+    ("POST", "/api/v1/animales/bulk", "bulk"),
+    ("GET", "/api/v1/animales/export", "bulk"),
+    ("POST", "/api/v1/import/razas", "bulk"),
+])
+def test_request_budget(method, path, budget):
+    assert request_budget(_request(method, path)) == budget
+
+
+def test_reads_wait_for_their_first_query_and_writes_admit_upfront(monkeypatch):
+    limiter = AdmissionLimiter("read", max_limit=4, queue_size=4, timeout=1)
+    monkeypatch.setattr(database, "limiter_for", lambda request: limiter)
+
+    async def use(dependency, budget):
+        limiter.budget = budget
+        seen = []
+        async for _ in dependency(_request("GET", "/")):
+            seen.append(limiter.in_flight)
+            await current_ticket.get().ensure()
+            seen.append(limiter.in_flight)
+        seen.append(limiter.in_flight)
+        return seen
+
+    assert asyncio.run(use(database.get_db, "read")) == [0, 1, 0]
+    assert asyncio.run(use(database.get_write_db, "write")) == [1, 1, 0]
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.animal import AnimalCreate
+from app.services.animal_service import AnimalService
+from app.utils.exceptions import ValidationError
+from fakes import FakeDb, make_animal, make_raza
+
+
+def animal_create(code, cod_raza="R1"):
+    return AnimalCreate(
+        codAnimal=code, descripcion=f"Animal {code}", sexo="F", edad=2,
+        codRaza=cod_raza, colorPelaje="Blanco", colorOjos="Azul"
+    )
+
+
+@pytest.fixture
+def db(fresh_snapshot):
+    db = FakeDb()
+    db.add_razas(make_raza("R1"), make_raza("R2"))
+    db.add_animals(make_animal("EXISTE", "R1"))
+    return db
+
+
+def test_rejects_requests_over_the_limit(db, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_max_items", 2)
+    with pytest.raises(ValidationError):
+        asyncio.run(AnimalService(db).create_animals_bulk([animal_create(f"A{i}") for i in range(3)]))
+    assert db.calls == []
+
+
+def test_reports_each_item_and_inserts_the_valid_ones(db):
+    items = [
+        animal_create("A1", "R1"),
+        animal_create("A1", "R2"),
+        animal_create("EXISTE", "R1"),
+        animal_create("A2", "NO-EXISTE"),
+        animal_create("A3", "R2"),
+    ]
+    report = asyncio.run(AnimalService(db).create_animals_bulk(items))
+
+    assert (report.created, report.failed) == (2, 3)
+    assert [result.success for result in report.results] == [True, False, False, False, True]
+    assert "duplicado" in report.results[1].error
+    assert "ya existe" in report.results[2].error
+    assert "no encontrada" in report.results[3].error
+    assert set(db.animal.rows) == {"EXISTE", "A1", "A3"}
+
+
+def test_inserts_in_batches_within_one_transaction(db, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_batch_size", 2)
+    report = asyncio.run(AnimalService(db).create_animals_bulk([animal_create(f"A{i}") for i in range(5)]))
+
+    assert report.created == 5
+    assert db.methods("animal").count("create_many") == 3
+    assert db.methods("tx") == ["begin", "commit"]
@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+from app.schemas.animal import AnimalFilter
+from app.services.animal_service import AnimalService
+from fakes import FakeDb, make_animal
+
+
+def test_filters_translate_to_a_single_where():
+    service = AnimalService(FakeDb())
+    assert service._filter_where(None) == {}
+    assert service._filter_where(AnimalFilter(
+        sexo=["F"], cod_raza=["R1", "R2"], edad_min=2, edad_max=5, color_ojos=["Azul"]
+    )) == {
+        "sexo": "F",
+        "codRaza": {"in": ["R1", "R2"]},
+        "colorOjos": "Azul",
+        "edad": {"gte": 2, "lte": 5},
+    }
+    assert service._filter_where(AnimalFilter(edad_max=4)) == {"edad": {"lte": 4}}
+
+
+def _herd() -> FakeDb:
+    db = FakeDb()
+    db.add_animals(
+        make_animal("A1", "R1", sexo="F", edad=1),
+        make_animal("A2", "R1", sexo="F", edad=4),
+        make_animal("A3", "R2", sexo="M", edad=4),
+        make_animal("A4", "R3", sexo="F", edad=7),
+    )
+    return db
+
+
+def test_filtered_listing_counts_with_the_same_where(fresh_snapshot):
+    db = _herd()
+    filters = AnimalFilter(sexo=["F"], edad_min=2)
+
+    animals, total, next_cursor = asyncio.run(
+        AnimalService(db).get_all_animals(limit=1, include_raza=False, filters=filters)
+    )
+
+    assert [animal.codAnimal for animal in animals] == ["A2"]
+    assert total == 2
+    assert next_cursor is not None
+    find_where = next(args["where"] for _, method, args in db.calls if method == "find_many")
+    count_where = next(args["where"] for _, method, args in db.calls if method == "count")
+    assert find_where == count_where == {"sexo": "F", "edad": {"gte": 2}}
+
+
+def test_list_route_parses_comma_separated_filters(api):
+    api.db.add_animals(*_herd().animal.rows.values())
+
+    status, body = asyncio.run(api.request(
+        "GET", "/api/v1/animales/", params={"cod_raza": "R1, R2", "edad_min": 4, "fields": "codRaza"}
+    ))
+    page = json.loads(body)
+    assert status == 200
+    assert [animal["codAnimal"] for animal in page["animals"]] == ["A2", "A3"]
+    assert page["total"] == 2
+
+    status, _ = asyncio.run(api.request("GET", "/api/v1/animales/", params={"edad_min": 5, "edad_max": 2}))
+    assert status == 422
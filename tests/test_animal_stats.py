@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.animal_stats import AnimalStats
+from app.schemas.animal import AnimalUpdate
+from app.services import animal_service
+from app.services.animal_service import AnimalService
+from fakes import FakeDb, make_animal
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    """Resumen vacío y sin cargar para AnimalService"""
+    stats = AnimalStats()
+    monkeypatch.setattr(animal_service, "animal_stats", stats)
+    return stats
+
+
+def _herd() -> FakeDb:
+    db = FakeDb()
+    db.add_animals(
+        make_animal("A1", "R1", sexo="F", edad=1),
+        make_animal("A2", "R1", sexo="F", edad=4),
+        make_animal("A3", "R1", sexo="M", edad=6),
+        make_animal("A4", "R2", sexo="F", edad=7, colorPelaje="Blanco"),
+    )
+    return db
+
+
+def test_updates_are_ignored_until_loaded():
+    stats = AnimalStats()
+    stats.add(make_animal("A1"))
+    assert stats.summarize([]) == (0, [])
+
+
+def test_summarize_groups_and_buckets_ages():
+    stats = AnimalStats()
+    asyncio.run(stats.rebuild(_herd()))
+
+    assert stats.summarize(["codRaza", "sexo"]) == (4, [
+        {"codRaza": "R1", "sexo": "F", "count": 2},
+        {"codRaza": "R1", "sexo": "M", "count": 1},
+        {"codRaza": "R2", "sexo": "F", "count": 1},
+    ])
+    assert stats.summarize(["edad"], edad_bucket=5) == (4, [{"edad": 0, "count": 2}, {"edad": 5, "count": 2}])
+
+
+def test_add_and_move_keep_cells_consistent():
+    stats = AnimalStats()
+    asyncio.run(stats.rebuild(_herd()))
+
+    before = make_animal("A4", "R2", sexo="F", edad=7, colorPelaje="Blanco")
+    stats.move(before, make_animal("A4", "R1", sexo="F", edad=7, colorPelaje="Blanco"))
+    stats.add(make_animal("A1", "R1", sexo="F", edad=1), -1)
+    stats.add({"codRaza": "R3", "sexo": "M", "edad": 2, "colorPelaje": "Negro"})
+
+    assert stats.summarize(["codRaza"]) == (4, [{"codRaza": "R1", "count": 3}, {"codRaza": "R3", "count": 1}])
+
+
+def test_rebuild_keeps_writes_made_while_grouping():
+    db = _herd()
+    stats = AnimalStats()
+    group_by = db.animal.group_by
+
+    async def group_by_during_writes(**kwargs):
+        rows = await group_by(**kwargs)
+        # Escrituras confirmadas mientras la consulta estaba en curso
+        stats.add(make_animal("A5", "R3"))
+        stats.add(make_animal("A3", "R1", sexo="M", edad=6), -1)
+        return rows
+
+    db.animal.group_by = group_by_during_writes
+    asyncio.run(stats.rebuild(db))
+
+    assert stats.summarize(["codRaza"]) == (4, [
+        {"codRaza": "R1", "count": 2}, {"codRaza": "R2", "count": 1}, {"codRaza": "R3", "count": 1}
+    ])
+
+
+def test_update_moves_the_animal_under_a_row_lock(fresh_snapshot, stats):
+    db = _herd()
+    asyncio.run(stats.rebuild(db))
+
+    asyncio.run(AnimalService(db).update_animal("A2", AnimalUpdate(sexo="M")))
+
+    assert any("FOR UPDATE" in args.get("query", "") for _, _, args in db.calls)
+    assert stats.summarize(["sexo"])[1] == [{"sexo": "F", "count": 2}, {"sexo": "M", "count": 2}]
+
+
+def test_stats_route_projects_the_requested_dimensions(api, stats):
+    api.db.add_animals(*_herd().animal.rows.values())
+
+    status, body = asyncio.run(api.request("GET", "/api/v1/animales/stats", params={"group_by": "sexo"}))
+    assert status == 200
+    assert json.loads(body) == {
+        "total": 4, "group_by": ["sexo"], "edad_bucket": 5,
+        "groups": [{"sexo": "F", "count": 3}, {"sexo": "M", "count": 1}],
+    }
+
+    status, _ = asyncio.run(api.request("GET", "/api/v1/animales/stats", params={"group_by": "peso"}))
+    assert status == 422
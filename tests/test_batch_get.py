@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services.animal_service import AnimalService
+from app.utils.exceptions import ValidationError
+from fakes import FakeDb, make_animal, make_raza
+
+
+def _db() -> FakeDb:
+    db = FakeDb()
+    db.add_razas(make_raza("R1", "Holstein"))
+    db.add_animals(*(make_animal(code) for code in ("A1", "A2", "A3")))
+    return db
+
+
+def test_returns_requested_order_and_missing_codes_in_one_query(fresh_snapshot):
+    db = _db()
+    asyncio.run(fresh_snapshot.load(db))
+    db.calls.clear()
+
+    animals, missing = asyncio.run(AnimalService(db).get_animals_by_codes(["A3", "X", "A1", "A3"]))
+
+    assert [animal.codAnimal for animal in animals] == ["A3", "A1"]
+    assert missing == ["X"]
+    assert animals[0].raza.descripcion == "Holstein"
+    assert db.methods("animal") == ["find_many"]
+    assert db.calls[0][2]["where"] == {"codAnimal": {"in": ["A3", "X", "A1"]}}
+
+
+def test_rejects_too_many_codes(fresh_snapshot, monkeypatch):
+    monkeypatch.setattr(settings, "batch_get_max_codes", 2)
+    with pytest.raises(ValidationError):
+        asyncio.run(AnimalService(_db()).get_animals_by_codes(["A1", "A2", "A3"]))
+    # Los repetidos no cuentan para el límite
+    animals, _ = asyncio.run(AnimalService(_db()).get_animals_by_codes(["A1", "A2", "A1"]))
+    assert len(animals) == 2
+
+
+def test_post_and_get_routes_agree(api):
+    api.db.add_razas(make_raza("R1"))
+    api.db.add_animals(make_animal("A1"), make_animal("A2"))
+
+    status, body = asyncio.run(api.request("POST", "/api/v1/animales/batch-get", json_body={"codes": ["A2", "Z"]}))
+    assert status == 200
+    posted = json.loads(body)
+    assert [animal["codAnimal"] for animal in posted["animals"]] == ["A2"]
+    assert posted["missing"] == ["Z"]
+
+    status, body = asyncio.run(api.request("GET", "/api/v1/animales/batch-get", params={"codes": "A2, Z"}))
+    assert status == 200 and json.loads(body) == posted
+
+    status, _ = asyncio.run(api.request("GET", "/api/v1/animales/batch-get", params={"codes": " , "}))
+    assert status == 422
@@ -0,0 +1,71 @@
+import asyncio
+from types import SimpleNamespace
+
+from benchmarks.api_load import WORKLOAD, Worker, compare, percentile
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def _result(p95_ms: float, rps: float, errors: int = 0) -> dict:
+    return {"endpoints": {"GET /animales": {"p95_ms": p95_ms, "rps": rps, "errors": errors}}}
+
+
+def test_compare_flags_latency_throughput_and_errors():
+    baseline = _result(10.0, 100.0)
+    assert compare(baseline, _result(10.5, 97.0), threshold=10) == []
+    assert compare(baseline, _result(12.0, 80.0, errors=1), threshold=10) == ["GET /animales: p95, rps, errores"]
+    # Endpoints que ya no existen en el resultado actual no cuentan
+    assert compare(baseline, {"endpoints": {}}, threshold=10) == []
+
+
+class RecordingClient:
+    """Cliente que responde con éxito a todo y guarda cada solicitud"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def request(self, method, path, params=None, json_body=None, headers=None):
+        self.requests.append((method, path, params, json_body, headers))
+        if method == "DELETE":
+            return 204, b""
+        if method == "POST" and path.endswith(("/animales/", "/razas/")):
+            return 201, b"{}"
+        return 200, b"{}"
+
+
+def _run_workload(index: int, seed: int = 1):
+    client = RecordingClient()
+    args = SimpleNamespace(seed=seed, animals=1000, razas=10)
+    worker = Worker(client, index, args, "run1", {})
+
+    async def run():
+        for _, operation in WORKLOAD:
+            await operation(worker)
+
+    asyncio.run(run())
+    return client.requests, worker.samples
+
+
+def test_each_worker_sends_its_own_client_id():
+    first, _ = _run_workload(0)
+    second, _ = _run_workload(1)
+    assert {request[4]["X-Client-Id"] for request in first} == {"benchmark-run1-0"}
+    assert {request[4]["X-Client-Id"] for request in second} == {"benchmark-run1-1"}
+
+
+def test_workload_is_reproducible_for_a_seed():
+    assert _run_workload(0, seed=7)[0] == _run_workload(0, seed=7)[0]
+    assert _run_workload(0, seed=7)[0] != _run_workload(0, seed=8)[0]
+
+
+def test_every_operation_records_a_sample():
+    _, samples = _run_workload(0)
+    assert len(samples) == len({operation for _, operation in WORKLOAD})
+    assert all(values for values in samples.values())
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from app.utils import count_cache as count_cache_module
+from app.utils.count_cache import CountCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(count_cache_module.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def test_total_expires_after_ttl(clock):
+    cache = CountCache(ttl=10, max_staleness=60)
+    cache.set("animal", "*", 42)
+    assert cache.get("animal", "*") == 42
+    clock.now += 10
+    assert cache.get("animal", "*") is None
+
+
+def test_invalidate_keeps_estimate_until_max_staleness(clock):
+    cache = CountCache(ttl=10, max_staleness=60)
+    cache.set("animal", "*", 42)
+    cache.set("animal", "raza:R1", 5)
+    cache.set("raza", "*", 3)
+
+    cache.invalidate("animal", "raza:R1")
+    assert cache.get("animal", "raza:R1") is None
+    assert cache.get("animal", "raza:R1", "estimated") == 5
+    assert cache.get("animal", "*") == 42
+
+    cache.invalidate("animal")
+    assert cache.get("animal", "*") is None
+    assert cache.get("raza", "*") == 3
+
+    clock.now += 60
+    assert cache.get("animal", "*", "estimated") is None
+
+
+def test_get_or_count_counts_once(clock):
+    cache = CountCache(ttl=10, max_staleness=60)
+    calls = []
+
+    async def counter():
+        calls.append(1)
+        return 7
+
+    async def run():
+        first = await cache.get_or_count("animal", "*", counter)
+        second = await cache.get_or_count("animal", "*", counter)
+        return first, second
+
+    assert asyncio.run(run()) == (7, 7)
+    assert len(calls) == 1
+
+    cache.clear()
+    assert cache.get("animal", "*", "estimated") is None
@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import pytest
+from starlette.requests import Request
+
+from app.schemas.raza import RazaUpdate
+from app.services.raza_service import RazaService
+from app.utils.etags import is_not_modified, list_etag, parse_if_match, row_etag, table_versions
+from app.utils.exceptions import NotFoundError, PreconditionFailedError
+from fakes import FakeDb, make_raza
+
+
+def make_request(path: str = "/api/v1/razas/", query: str = "", **headers) -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": path, "query_string": query.encode(),
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_row_etag_joins_versions():
+    assert row_etag(3) == '"3"'
+    assert row_etag(3, 7) == '"3.7"'
+
+
+def test_list_etag_is_weak_and_ignores_parameter_order():
+    first = list_etag(make_request(query="page=1&size=10"), "raza")
+    assert first.startswith('W/"')
+    assert list_etag(make_request(query="size=10&page=1"), "raza") == first
+    assert list_etag(make_request(query="page=2&size=10"), "raza") != first
+
+
+def test_list_etag_changes_after_a_write():
+    before = list_etag(make_request(), "raza", "animal")
+    table_versions.bump("animal")
+    assert list_etag(make_request(), "raza", "animal") != before
+
+
+def test_if_none_match_uses_weak_comparison():
+    assert not is_not_modified(make_request(), '"2"')
+    assert is_not_modified(make_request(if_none_match='"1", W/"2"'), '"2"')
+    assert is_not_modified(make_request(if_none_match='"abc"'), 'W/"abc"')
+    assert is_not_modified(make_request(if_none_match="*"), '"9"')
+    assert not is_not_modified(make_request(if_none_match='"3"'), '"2"')
+
+
+def test_parse_if_match_returns_the_row_version():
+    assert parse_if_match(make_request()) is None
+    assert parse_if_match(make_request(if_match="*")) is None
+    assert parse_if_match(make_request(if_match='"4.2"')) == 4
+    with pytest.raises(PreconditionFailedError):
+        parse_if_match(make_request(if_match='"1", "2"'))
+    with pytest.raises(PreconditionFailedError):
+        parse_if_match(make_request(if_match='"x"'))
+
+
+def test_update_with_stale_version_is_rejected(fresh_snapshot):
+    db = FakeDb()
+    db.add_razas(make_raza("R1", "Holstein", version=2))
+    service = RazaService(db)
+
+    with pytest.raises(PreconditionFailedError):
+        asyncio.run(service.update_raza("R1", RazaUpdate(descripcion="Angus"), expected_version=1))
+    assert db.raza.rows["R1"].descripcion == "Holstein"
+
+    raza = asyncio.run(service.update_raza("R1", RazaUpdate(descripcion="Angus"), expected_version=2))
+    assert (raza.descripcion, raza.version) == ("Angus", 3)
+
+    with pytest.raises(NotFoundError):
+        asyncio.run(service.update_raza("R9", RazaUpdate(descripcion="Angus"), expected_version=1))
+
+
+def test_detail_route_answers_304_for_the_current_etag(api):
+    api.db.add_razas(make_raza("R1", "Holstein", version=5))
+
+    status, body = asyncio.run(api.request("GET", "/api/v1/razas/R1"))
+    assert status == 200 and json.loads(body)["codRaza"] == "R1"
+
+    status, body = asyncio.run(api.request("GET", "/api/v1/razas/R1", headers={"If-None-Match": '"5"'}))
+    assert (status, body) == (304, b"")
+
+
+def test_update_route_maps_a_stale_if_match_to_412(api):
+    api.db.add_razas(make_raza("R1", "Holstein", version=5))
+    status, _ = asyncio.run(api.request(
+        "PUT", "/api/v1/razas/R1", json_body={"descripcion": "Angus"}, headers={"If-Match": '"4"'}
+    ))
+    assert status == 412
+    status, _ = asyncio.run(api.request(
+        "PUT", "/api/v1/razas/R1", json_body={"descripcion": "Angus"}, headers={"If-Match": '"5"'}
+    ))
+    assert status == 200
@@ -0,0 +1,51 @@
+import asyncio
+import csv
+import io
+import json
+
+from app.services.animal_service import AnimalService
+from app.utils.export import ANIMAL_EXPORT_FIELDS, encode_csv, encode_ndjson
+from fakes import FakeDb, make_animal
+
+
+async def chunks_of(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(stream):
+    return [part async for part in stream]
+
+
+ROWS = [
+    make_animal("A1", "R1", descripcion="Vaca, \"lechera\""),
+    make_animal("A2", "R2", descripcion="Ñandú"),
+]
+
+
+def test_ndjson_emits_one_line_per_row_and_skips_empty_chunks():
+    parts = asyncio.run(collect(encode_ndjson(chunks_of(ROWS[:1], [], ROWS[1:]), ANIMAL_EXPORT_FIELDS)))
+    assert len(parts) == 2
+    lines = b"".join(parts).decode("utf-8").splitlines()
+    assert [json.loads(line)["codAnimal"] for line in lines] == ["A1", "A2"]
+    assert list(json.loads(lines[1])) == ANIMAL_EXPORT_FIELDS
+    assert "Ñandú" in lines[1]
+
+
+def test_csv_writes_header_first_and_quotes_values():
+    parts = asyncio.run(collect(encode_csv(chunks_of(ROWS), ANIMAL_EXPORT_FIELDS)))
+    assert parts[0].decode("utf-8").strip() == ",".join(ANIMAL_EXPORT_FIELDS)
+    rows = list(csv.reader(io.StringIO(b"".join(parts).decode("utf-8"))))
+    assert rows[1][1] == 'Vaca, "lechera"'
+    assert [row[0] for row in rows[1:]] == ["A1", "A2"]
+
+
+def test_iter_animals_walks_the_table_by_key(fresh_snapshot):
+    db = FakeDb()
+    db.add_animals(*(make_animal(f"A{i:02d}", "R1" if i % 2 else "R2") for i in range(7)))
+
+    async def run(**kwargs):
+        return [[animal.codAnimal for animal in chunk] async for chunk in AnimalService(db).iter_animals(**kwargs)]
+
+    assert asyncio.run(run(chunk_size=3)) == [["A00", "A01", "A02"], ["A03", "A04", "A05"], ["A06"]]
+    assert asyncio.run(run(cod_raza="R1", chunk_size=3)) == [["A01", "A03", "A05"]]
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+
+from app.schemas.animal import AnimalListResponse, AnimalResponse
+from app.utils.exceptions import ValidationError
+from app.utils.fieldsets import parse_fields, parse_include, project_model, public_fields, with_items
+from fakes import make_animal, make_raza
+
+
+def test_public_fields_use_the_aliases():
+    fields = public_fields(AnimalResponse, ("raza",))
+    assert fields["codAnimal"] == "cod_animal"
+    assert fields["descripcion"] == "descripcion"
+    assert "raza" not in fields
+
+
+def test_parse_fields_maps_aliases_and_adds_required():
+    assert parse_fields(None, AnimalResponse) is None
+    selected = parse_fields("descripcion, colorOjos", AnimalResponse, ("raza",), required=("cod_animal",))
+    assert selected == {"descripcion", "color_ojos", "cod_animal"}
+
+
+@pytest.mark.parametrize("value", ["", " , ", "descripcion,precio", "raza"])
+def test_parse_fields_rejects_unknown_or_empty_lists(value):
+    with pytest.raises(ValidationError):
+        parse_fields(value, AnimalResponse, ("raza",))
+
+
+def test_parse_include():
+    assert parse_include(None, ("raza",), default=("raza",)) == {"raza"}
+    assert parse_include("", ("raza",), default=("raza",)) == frozenset()
+    with pytest.raises(ValidationError):
+        parse_include("productos", ("raza",), default=())
+
+
+def test_projected_models_are_cached_and_serialize_only_selected_fields():
+    exclude = frozenset({"raza", "sexo", "edad", "cod_raza", "color_pelaje", "color_ojos"})
+    projection = project_model(AnimalResponse, exclude)
+    assert projection is project_model(AnimalResponse, exclude)
+    assert project_model(AnimalResponse, frozenset()) is AnimalResponse
+
+    value = projection.model_validate(make_animal("A1"), from_attributes=True)
+    assert value.model_dump(by_alias=True) == {"descripcion": "Animal A1", "codAnimal": "A1"}
+
+    listing = with_items(AnimalListResponse, "animals", projection)
+    assert listing is with_items(AnimalListResponse, "animals", projection)
+    assert with_items(AnimalListResponse, "animals", AnimalResponse) is AnimalListResponse
+
+
+def test_detail_route_applies_fields_and_include(api, fresh_snapshot):
+    api.db.add_razas(make_raza("R1", "Holstein"))
+    api.db.add_animals(make_animal("A1"))
+    asyncio.run(fresh_snapshot.load(api.db))
+
+    status, body = asyncio.run(api.request("GET", "/api/v1/animales/A1", params={"fields": "descripcion"}))
+    assert status == 200
+    assert json.loads(body) == {"descripcion": "Animal A1", "codAnimal": "A1"}
+
+    status, body = asyncio.run(
+        api.request("GET", "/api/v1/animales/A1", params={"fields": "edad", "include": "raza"})
+    )
+    assert json.loads(body) == {"edad": 3, "codAnimal": "A1", "raza": {"descripcion": "Holstein", "codRaza": "R1"}}
+
+    status, _ = asyncio.run(api.request("GET", "/api/v1/animales/A1", params={"fields": "precio"}))
+    assert status == 422
@@ -0,0 +1,72 @@
+import asyncio
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.raza import RazaCreate
+from app.services.import_service import ImportService
+from app.utils.exceptions import NotFoundError, ValidationError
+from app.utils.importers import detect_format, iter_batches, iter_rows
+
+
+def read(content: bytes, formato: str):
+    return list(iter_rows(io.BytesIO(content), formato))
+
+
+def test_detect_format_prefers_parameter_then_extension():
+    assert detect_format("datos.CSV") == "csv"
+    assert detect_format("datos.jsonl") == "ndjson"
+    assert detect_format("datos.csv", "ndjson") == "ndjson"
+    with pytest.raises(ValidationError):
+        detect_format("datos.xlsx")
+
+
+def test_iter_rows_reads_csv_with_bom():
+    rows = read("\ufeffcod_raza,descripcion\nR1,Holstein\nR2,Angus\n".encode("utf-8"), "csv")
+    assert rows == [(1, {"cod_raza": "R1", "descripcion": "Holstein"}), (2, {"cod_raza": "R2", "descripcion": "Angus"})]
+
+
+def test_iter_rows_reports_bad_json_lines_and_skips_blank_ones():
+    rows = read(b'{"cod_raza": "R1"}\n\n{roto\n{"cod_raza": "R2"}\n', "ndjson")
+    assert [number for number, _ in rows] == [1, 3, 4]
+    assert rows[1][1].startswith("JSON inválido")
+    assert rows[2][1] == {"cod_raza": "R2"}
+
+
+def test_iter_rows_reports_undecodable_content_as_a_row():
+    rows = read(b"cod_raza,descripcion\nR1,ok\nR2,\xff\xfe\n", "csv")
+    assert rows[-1][1].startswith("No se pudo leer el archivo")
+
+
+def test_iter_batches_groups_rows():
+    async def run():
+        return [batch async for batch in iter_batches(iter(range(5)), 2)]
+
+    assert asyncio.run(run()) == [[0, 1], [2, 3], [4]]
+
+
+def test_import_reports_failed_blocks_and_keeps_streaming():
+    calls = []
+
+    async def create_bulk(items):
+        calls.append([item.cod_raza for item in items])
+        if len(calls) == 1:
+            raise NotFoundError("Raza eliminada durante la importación")
+        return SimpleNamespace(created=len(items), results=[])
+
+    async def batches():
+        yield [(1, {"cod_raza": "R1", "descripcion": "Uno"}), (2, {"cod_raza": "R2"})]
+        yield [(3, "JSON inválido: x"), (4, {"cod_raza": "R4", "descripcion": "Cuatro"})]
+
+    async def run():
+        service = ImportService(db=None)
+        return [progress async for progress in service._import(batches(), RazaCreate, create_bulk)]
+
+    first, second, summary = asyncio.run(run())
+    assert calls == [["R1"], ["R4"]]
+    assert [(error.row, error.error) for error in first.errors][0] == (1, "Raza eliminada durante la importación")
+    assert [error.row for error in first.errors] == [1, 2]
+    assert (second.processed, second.created, second.failed) == (4, 1, 3)
+    assert [error.row for error in second.errors] == [3]
+    assert summary.done and (summary.processed, summary.created, summary.failed) == (4, 1, 3)
@@ -0,0 +1,111 @@
+import asyncio
+
+
+from app.services.animal_service import AnimalService
+from app.utils.admission import current_ticket
+from app.utils.exceptions import NotFoundError
+from app.utils.loader import BatchLoader, get_loader
+from fakes import FakeDb, make_animal
+
+
+class RecordingBatch:
+    """Función de lote que registra las claves de cada llamada"""
+
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, keys):
+        self.calls.append(list(keys))
+        if self.fail:
+            raise RuntimeError("consulta fallida")
+        return {key: key.upper() for key in keys if key != "nada"}
+
+
+def test_concurrent_loads_share_one_batch():
+    batch = RecordingBatch()
+    loader = BatchLoader("test-coalesce", batch, window=0.01, max_batch=100)
+
+    async def run():
+        return await asyncio.gather(*(loader.load(key) for key in ("a", "b", "a", "nada")))
+
+    assert asyncio.run(run()) == ["A", "B", "A", None]
+    assert batch.calls == [["a", "b", "nada"]]
+    stats = loader.stats.as_dict()
+    assert (stats["requests"], stats["coalesced"], stats["batches"], stats["keys"]) == (4, 1, 1, 3)
+    assert stats["coalescing_ratio"] == 4.0
+
+
+def test_max_batch_dispatches_without_waiting_for_the_window():
+    batch = RecordingBatch()
+    loader = BatchLoader("test-max-batch", batch, window=60, max_batch=2)
+
+    async def run():
+        return await asyncio.wait_for(asyncio.gather(*(loader.load(key) for key in "abcd")), timeout=1)
+
+    assert asyncio.run(run()) == ["A", "B", "C", "D"]
+    assert batch.calls == [["a", "b"], ["c", "d"]]
+
+
+def test_batch_errors_reach_every_waiter():
+    loader = BatchLoader("test-errors", RecordingBatch(fail=True), window=0.001, max_batch=100)
+
+    async def run():
+        return await asyncio.gather(loader.load("a"), loader.load("b"), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_batch_runs_without_the_callers_admission_ticket():
+    seen = []
+
+    class Ticket:
+        def __init__(self):
+            self.ensured = 0
+
+        async def ensure(self):
+            self.ensured += 1
+
+    async def batch(keys):
+        seen.append(current_ticket.get())
+        return {}
+
+    loader = BatchLoader("test-ticket", batch, window=0.001, max_batch=100)
+    ticket = Ticket()
+
+    async def run():
+        current_ticket.set(ticket)
+        await loader.load("a")
+
+    asyncio.run(run())
+    assert ticket.ensured == 1
+    assert seen == [None]
+
+
+def test_get_loader_is_per_owner_and_per_loop():
+    async def loaders(owner):
+        first = get_loader("test-owner", owner, RecordingBatch(), 0.001, 10)
+        return first, get_loader("test-owner", owner, RecordingBatch(), 0.001, 10)
+
+    owner = object()
+    first, second = asyncio.run(loaders(owner))
+    assert first is second
+    assert asyncio.run(loaders(owner))[0] is not first
+
+
+def test_concurrent_animal_lookups_issue_one_query(fresh_snapshot):
+    db = FakeDb()
+    db.add_animals(make_animal("A1"), make_animal("A2"))
+    service = AnimalService(db)
+
+    async def run():
+        return await asyncio.gather(
+            service.get_animal_by_code("A1"), service.get_animal_by_code("A2"),
+            service.get_animal_by_code("A9"), return_exceptions=True
+        )
+
+    first, second, missing = asyncio.run(run())
+    assert (first.codAnimal, second.codAnimal) == ("A1", "A2")
+    assert isinstance(missing, NotFoundError)
+    assert db.methods("animal") == ["find_many"]
@@ -0,0 +1,116 @@
+import asyncio
+import io
+import json
+import logging
+import queue
+
+import pytest
+
+from app.core import logging_config
+from app.core.logging_config import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestIdMiddleware,
+    SamplingFilter,
+    current_request_id,
+    log_records_dropped_total,
+    setup_logging,
+    stop_logging,
+)
+
+
+def make_record(name="app.services", level=logging.INFO, msg="hola %s", args=("mundo",), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_request_and_extra_fields():
+    record = make_record(request_id="abc", cod_animal="A1")
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "hola mundo"
+    assert (entry["level"], entry["logger"], entry["request_id"]) == ("INFO", "app.services", "abc")
+    assert entry["cod_animal"] == "A1"
+    assert entry["ts"].endswith("+00:00")
+
+
+def test_sampling_uses_the_longest_prefix_and_keeps_warnings(monkeypatch):
+    sampling = SamplingFilter({"app": 1.0, "app.services": 0.0})
+    assert not sampling.filter(make_record("app.services.animal_service"))
+    assert sampling.filter(make_record("app.routes"))
+    assert sampling.filter(make_record("app.servicesx"))
+    assert sampling.filter(make_record("app.services", level=logging.WARNING))
+
+    monkeypatch.setattr(logging_config.random, "random", lambda: 0.3)
+    half = SamplingFilter({"app": 0.5})
+    assert half.filter(make_record("app"))
+    monkeypatch.setattr(logging_config.random, "random", lambda: 0.7)
+    assert not half.filter(make_record("app"))
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(1))
+    before = log_records_dropped_total._values.get(("queue_full",), 0)
+    handler.handle(make_record())
+    handler.handle(make_record())
+
+    assert handler.queue.qsize() == 1
+    assert log_records_dropped_total._values[("queue_full",)] == before + 1
+    queued = handler.queue.get_nowait()
+    assert (queued.msg, queued.args) == ("hola mundo", None)
+
+
+def test_exceptions_are_rendered_before_queueing():
+    handler = NonBlockingQueueHandler(queue.Queue(1))
+    try:
+        raise ValueError("roto")
+    except ValueError:
+        record = logging.LogRecord("app", logging.ERROR, __file__, 1, "fallo", (), __import__("sys").exc_info())
+    handler.handle(record)
+    queued = handler.queue.get_nowait()
+    assert queued.exc_info is None and "ValueError: roto" in queued.exc_text
+
+
+@pytest.fixture
+def log_stream():
+    """Logging de la aplicación escribiendo en memoria; se restaura al terminar"""
+    stream = io.StringIO()
+    setup_logging(level="INFO", log_format="json", sampling={}, stream=stream)
+    yield stream
+    setup_logging()
+
+
+def test_records_reach_the_writer_thread_with_the_request_id(log_stream):
+    stream = log_stream
+    token = current_request_id.set("req-1")
+    try:
+        logging.getLogger("app.test").info("creado %s", "A1", extra={"cod_animal": "A1"})
+    finally:
+        current_request_id.reset(token)
+    # Detener el hilo escritor vacía la cola
+    stop_logging()
+
+    entry = json.loads(stream.getvalue().splitlines()[-1])
+    assert (entry["message"], entry["request_id"], entry["cod_animal"]) == ("creado A1", "req-1", "A1")
+
+
+async def _echo_request_id(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": current_request_id.get().encode()})
+
+
+@pytest.mark.parametrize("received, kept", [("proxy-123", True), ("no válido \n", False), (None, False)])
+def test_request_id_middleware(received, kept):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    headers = [(b"x-request-id", received.encode("utf-8"))] if received else []
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": headers}
+    asyncio.run(RequestIdMiddleware(_echo_request_id)(scope, None, send))
+
+    request_id = dict(messages[0]["headers"])[b"x-request-id"].decode()
+    assert messages[1]["body"].decode() == request_id
+    assert (request_id == received) is kept
+    assert current_request_id.get() is None
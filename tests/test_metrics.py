@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from app.utils.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    current_operation,
+    db_queries_total,
+    instrument_service,
+    record_query,
+)
+from fakes import make_producto
+
+
+def test_counter_and_gauge_render_one_sample_per_label_set():
+    registry = Registry()
+    counter = registry.register(Counter("peticiones_total", "Peticiones", ("route",)))
+    gauge = registry.register(Gauge("en_curso", "En curso"))
+    counter.inc("/b")
+    counter.inc("/a", amount=2)
+    counter.inc("/b")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    assert registry.render().splitlines() == [
+        "# HELP peticiones_total Peticiones",
+        "# TYPE peticiones_total counter",
+        'peticiones_total{route="/a"} 2',
+        'peticiones_total{route="/b"} 2',
+        "# HELP en_curso En curso",
+        "# TYPE en_curso gauge",
+        "en_curso 1",
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latencia", "Latencia", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/a")
+
+    assert histogram.samples() == [
+        'latencia_bucket{route="/a",le="0.1"} 2',
+        'latencia_bucket{route="/a",le="1"} 3',
+        'latencia_bucket{route="/a",le="+Inf"} 4',
+        'latencia_sum{route="/a"} 3.65',
+        'latencia_count{route="/a"} 4',
+    ]
+
+
+def test_label_values_are_escaped_and_names_unique():
+    counter = Counter("errores_total", "Errores", ("message",))
+    counter.inc('dice "hola"\nfin')
+    assert counter.samples() == ['errores_total{message="dice \\"hola\\"\\nfin"} 1']
+
+    registry = Registry()
+    registry.register(Counter("x", "X"))
+    with pytest.raises(ValueError):
+        registry.register(Counter("x", "X"))
+
+
+def test_instrumented_services_label_their_queries():
+    @instrument_service
+    class DemoService:
+        async def listar(self):
+            record_query("findMany", 0.002)
+            return current_operation.get()
+
+        async def _privado(self):
+            return current_operation.get()
+
+    service = DemoService()
+    assert asyncio.run(service.listar()) == ("DemoService", "listar")
+    assert asyncio.run(service._privado()) == ("none", "none")
+    assert db_queries_total._values[("DemoService", "listar", "findMany")] == 1
+
+
+def test_http_metrics_use_the_route_template(api):
+    api.db.add_productos(make_producto(1))
+    asyncio.run(api.request("GET", "/api/v1/productos/1"))
+    asyncio.run(api.request("GET", "/api/v1/productos/2"))
+
+    status, body = asyncio.run(api.request("GET", "/metrics"))
+    text = body.decode("utf-8")
+    assert status == 200
+    assert 'http_requests_total{method="GET",route="/api/v1/productos/{producto_id}",status="200"}' in text
+    assert 'http_requests_total{method="GET",route="/api/v1/productos/{producto_id}",status="404"}' in text
+    assert "/api/v1/productos/1" not in text
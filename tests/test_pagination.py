@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.exceptions import ValidationError
+from app.utils.pagination import decode_cursor, encode_cursor, split_page
+
+
+@pytest.mark.parametrize("key", ["A001", "ñandú-7", 0, 125])
+def test_cursor_roundtrip(key):
+    cursor = encode_cursor(key)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, key_type=type(key)) == key
+
+
+@pytest.mark.parametrize("cursor", ["", "no-es-base64!", encode_cursor("A001")[:-3], "e30"])
+def test_decode_rejects_malformed_cursor(cursor):
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor)
+
+
+def test_decode_rejects_wrong_key_type():
+    with pytest.raises(ValidationError):
+        decode_cursor(encode_cursor("A001"), key_type=int)
+    with pytest.raises(ValidationError):
+        decode_cursor(encode_cursor(7), key_type=str)
+
+
+def _rows(*codes):
+    return [SimpleNamespace(codAnimal=code) for code in codes]
+
+
+def test_split_page_with_next_page():
+    page, cursor = split_page(_rows("A1", "A2", "A3"), 2, "codAnimal")
+    assert [row.codAnimal for row in page] == ["A1", "A2"]
+    assert decode_cursor(cursor) == "A2"
+
+
+def test_split_page_last_page():
+    page, cursor = split_page(_rows("A1", "A2"), 2, "codAnimal")
+    assert len(page) == 2
+    assert cursor is None
+    assert split_page([], 10, "codAnimal") == ([], None)
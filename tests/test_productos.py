@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.producto_service import ProductoService
+from app.utils.exceptions import NotFoundError, ValidationError
+from app.utils.pagination import encode_cursor
+from fakes import FakeDb, make_producto
+
+
+def _db(count: int) -> FakeDb:
+    db = FakeDb()
+    db.add_productos(*(make_producto(producto_id) for producto_id in range(1, count + 1)))
+    return db
+
+
+def test_listing_walks_every_page_by_id():
+    service = ProductoService(_db(5))
+    seen, cursor = [], None
+    while True:
+        productos, cursor = asyncio.run(service.get_all_productos(limit=2, cursor=cursor))
+        seen.append([producto.id for producto in productos])
+        if cursor is None:
+            break
+    assert seen == [[1, 2], [3, 4], [5]]
+
+
+def test_listing_rejects_a_text_cursor():
+    with pytest.raises(ValidationError):
+        asyncio.run(ProductoService(_db(1)).get_all_productos(cursor=encode_cursor("P001")))
+
+
+def test_lookups_raise_not_found():
+    service = ProductoService(_db(2))
+    assert asyncio.run(service.get_producto_by_codigo("P002")).id == 2
+    with pytest.raises(NotFoundError):
+        asyncio.run(service.get_producto_by_id(9))
+    with pytest.raises(NotFoundError):
+        asyncio.run(service.get_producto_by_codigo("P009"))
+
+
+def test_list_route_returns_the_next_cursor(api):
+    api.db.add_productos(*(make_producto(producto_id) for producto_id in range(1, 4)))
+
+    status, body = asyncio.run(api.request("GET", "/api/v1/productos/", params={"size": 2}))
+    page = json.loads(body)
+    assert status == 200
+    assert [producto["codigo"] for producto in page["productos"]] == ["P001", "P002"]
+
+    status, body = asyncio.run(
+        api.request("GET", "/api/v1/productos/", params={"size": 2, "cursor": page["next_cursor"]})
+    )
+    page = json.loads(body)
+    assert [producto["id"] for producto in page["productos"]] == [3]
+    assert page["next_cursor"] is None
+
+
+def test_detail_route_maps_not_found_to_404(api):
+    status, body = asyncio.run(api.request("GET", "/api/v1/productos/7"))
+    assert status == 404
+    assert json.loads(body)["message"] == "Producto con id 7 no encontrado"
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from app.schemas.animal import AnimalCreate, AnimalUpdate
+from app.services.animal_service import AnimalService
+from app.services.raza_service import RazaService
+from app.utils.exceptions import NotFoundError, PreconditionFailedError
+from fakes import FakeDb, make_animal, make_raza
+
+
+def animal_create(code, cod_raza="R1"):
+    return AnimalCreate(
+        codAnimal=code, descripcion=f"Animal {code}", sexo="F", edad=2,
+        codRaza=cod_raza, colorPelaje="Blanco", colorOjos="Azul"
+    )
+
+
+@pytest.fixture
+def db(fresh_snapshot):
+    db = FakeDb()
+    db.add_razas(make_raza("R1", totalAnimales=1), make_raza("R2"))
+    db.add_animals(make_animal("A1", "R1"))
+    return db
+
+
+def totals(db):
+    return {code: raza.totalAnimales for code, raza in db.raza.rows.items()}
+
+
+def test_adjust_updates_in_code_order_and_skips_zero_deltas(db):
+    asyncio.run(AnimalService._adjust_raza_counts(db, {"R2": 2, "R1": -1, "R3": 0}))
+    assert totals(db) == {"R1": 0, "R2": 2}
+    assert [args["where"]["codRaza"] for _, method, args in db.calls if method == "update"] == ["R1", "R2"]
+
+    with pytest.raises(NotFoundError):
+        asyncio.run(AnimalService._adjust_raza_counts(db, {"R9": 1}))
+
+
+def test_create_increments_the_counter_before_inserting(db):
+    asyncio.run(AnimalService(db).create_animal(animal_create("A2", "R2")))
+
+    assert totals(db) == {"R1": 1, "R2": 1}
+    writes = [(table, method) for table, method, _ in db.calls if method in ("update", "create")]
+    assert writes == [("raza", "update"), ("animal", "create")]
+
+
+def test_delete_decrements_the_counter(db):
+    asyncio.run(AnimalService(db).delete_animal("A1"))
+    assert totals(db) == {"R1": 0, "R2": 0}
+
+
+def test_moving_an_animal_moves_the_counter(db):
+    animal = asyncio.run(AnimalService(db).update_animal("A1", AnimalUpdate(codRaza="R2")))
+    assert animal.codRaza == "R2"
+    assert totals(db) == {"R1": 0, "R2": 1}
+
+
+def test_stale_move_rolls_the_counters_back(db):
+    with pytest.raises(PreconditionFailedError):
+        asyncio.run(AnimalService(db).update_animal("A1", AnimalUpdate(codRaza="R2"), expected_version=7))
+    assert totals(db) == {"R1": 1, "R2": 0}
+    assert db.animal.rows["A1"].codRaza == "R1"
+
+
+def test_bulk_reports_razas_deleted_behind_the_snapshot(db, fresh_snapshot):
+    asyncio.run(fresh_snapshot.load(db))
+    # Otro worker eliminó la raza: el snapshot de este proceso aún la tiene
+    del db.raza.rows["R2"]
+
+    report = asyncio.run(AnimalService(db).create_animals_bulk([
+        animal_create("A2", "R1"), animal_create("A3", "R2")
+    ]))
+
+    assert (report.created, report.failed) == (1, 1)
+    assert report.results[1].error == "Raza con código R2 no encontrada"
+    assert fresh_snapshot.get("R2") is None
+    assert totals(db) == {"R1": 2}
+
+
+def test_repair_reloads_the_caches_when_counters_changed(db, fresh_snapshot):
+    calls = []
+
+    async def execute_raw(query, *params):
+        calls.append(query)
+        return 2
+
+    db.execute_raw = execute_raw
+    assert asyncio.run(RazaService(db).repair_animal_counts()) == 2
+    assert "COUNT(*)" in calls[0]
+    assert fresh_snapshot.loaded and fresh_snapshot.get("R1") is not None
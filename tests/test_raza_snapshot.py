@@ -0,0 +1,59 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core.raza_snapshot import RazaSnapshot
+
+
+def raza(cod_raza, descripcion="Raza"):
+    return SimpleNamespace(codRaza=cod_raza, descripcion=descripcion)
+
+
+class FakeDb:
+    """Cliente mínimo: find_many devuelve las filas tras ceder el control"""
+
+    def __init__(self, rows, delay=0.01):
+        self.raza = self
+        self.rows = rows
+        self.delay = delay
+
+    async def find_many(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        return list(self.rows)
+
+
+def test_writes_bump_version_and_keep_order():
+    snapshot = RazaSnapshot()
+    snapshot.put(raza("B"))
+    snapshot.put_many([raza("C"), raza("A")])
+    assert [r.codRaza for r in snapshot.all()] == ["A", "B", "C"]
+    assert snapshot.version == 2
+
+    snapshot.remove("B")
+    snapshot.remove("missing")
+    assert snapshot.get("B") is None
+    assert snapshot.version == 3
+
+
+def test_load_replaces_contents():
+    snapshot = RazaSnapshot()
+    snapshot.put(raza("OLD"))
+    asyncio.run(snapshot.load(FakeDb([raza("A"), raza("B")])))
+    assert snapshot.loaded
+    assert [r.codRaza for r in snapshot.all()] == ["A", "B"]
+
+
+def test_load_reapplies_writes_made_during_the_query():
+    snapshot = RazaSnapshot()
+
+    async def run():
+        async def concurrent_writes():
+            await asyncio.sleep(0.002)
+            snapshot.remove("A")
+            snapshot.put(raza("C"))
+            snapshot.put(raza("B", "Actualizada"))
+
+        await asyncio.gather(snapshot.load(FakeDb([raza("A"), raza("B")])), concurrent_writes())
+
+    asyncio.run(run())
+    assert [r.codRaza for r in snapshot.all()] == ["B", "C"]
+    assert snapshot.get("B").descripcion == "Actualizada"
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+
+from app.core import database
+from app.core.database import ReadRouter, current_client, get_db, get_write_db
+
+
+class Client:
+    """Cliente de Prisma mínimo: solo importa si está conectado"""
+
+    def __init__(self, name: str, connected: bool = True):
+        self.name = name
+        self.connected = connected
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+
+@pytest.fixture
+def router():
+    return ReadRouter(Client("primaria"), [Client("r1"), Client("r2")], window=5.0)
+
+
+def names(router, count: int):
+    return [router.reader(router.primary).name for _ in range(count)]
+
+
+def test_reads_rotate_over_connected_replicas(router):
+    assert names(router, 4) == ["r1", "r2", "r1", "r2"]
+    router.replicas[0].connected = False
+    assert names(router, 2) == ["r2", "r2"]
+    router.replicas[1].connected = False
+    assert names(router, 1) == ["primaria"]
+
+
+def test_transactions_and_routers_without_replicas_keep_their_client(router):
+    tx = Client("tx")
+    assert router.reader(tx) is tx
+    solo = ReadRouter(Client("primaria"), [], window=5.0)
+    solo.mark_write("cliente")
+    assert not solo.is_pinned("cliente")
+    assert solo.reader(solo.primary) is solo.primary
+
+
+def test_a_writer_reads_from_the_primary_until_the_window_ends(router, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(database.time, "monotonic", lambda: now[0])
+
+    async def read_as(client):
+        current_client.set(client)
+        return router.reader(router.primary).name
+
+    router.mark_write("escritor")
+    assert asyncio.run(read_as("escritor")) == "primaria"
+    assert asyncio.run(read_as("otro")) == "r1"
+    now[0] += 5.1
+    assert asyncio.run(read_as("escritor")) == "r2"
+
+
+def test_primary_reads_block_applies_to_tasks_created_inside(router):
+    async def run():
+        with router.primary_reads():
+            inner = await asyncio.create_task(asyncio.sleep(0, result=router.reader(router.primary).name))
+            direct = router.reader(router.primary).name
+        return inner, direct, router.reader(router.primary).name
+
+    assert asyncio.run(run()) == ("primaria", "primaria", "r1")
+
+
+def test_expired_pins_are_purged_at_the_limit(router, monkeypatch):
+    monkeypatch.setattr(database, "MAX_PINNED_CLIENTS", 2)
+    now = [0.0]
+    monkeypatch.setattr(database.time, "monotonic", lambda: now[0])
+    router.mark_write("a")
+    router.mark_write("b")
+    now[0] += 10
+    router.mark_write("c")
+    assert set(router._pinned) == {"c"}
+
+
+def _request(client_id: str) -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": "/", "headers": [(b"x-client-id", client_id.encode())],
+        "client": ("10.0.0.1", 1234),
+    })
+
+
+def test_only_the_write_dependency_pins_the_client(router, monkeypatch):
+    monkeypatch.setattr(database, "read_router", router)
+    monkeypatch.setattr(database, "limiter_for", lambda request: None)
+
+    async def use(dependency, client_id):
+        async for _ in dependency(_request(client_id)):
+            pass
+
+    asyncio.run(use(get_db, "lector"))
+    asyncio.run(use(get_write_db, "escritor"))
+    assert not router.is_pinned("lector")
+    assert router.is_pinned("escritor")
+
+
+def test_mutating_routes_use_the_write_dependency():
+    from app.main import app
+
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        dependencies = {dependency.call for dependency in route.dependant.dependencies}
+        writes = route.methods & {"POST", "PUT", "PATCH", "DELETE"} and not route.path.endswith("/batch-get")
+        if writes:
+            assert get_write_db in dependencies and get_db not in dependencies, route.path
+        elif dependencies & {get_db, get_write_db}:
+            assert get_write_db not in dependencies, route.path
@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.core.readiness import Readiness, StartupTimer
+from app.services import warmup_service
+from app.services.warmup_service import WarmupService
+from fakes import FakeDb, make_animal, make_raza
+
+
+class PingDb:
+    """Cliente con un SELECT 1 configurable"""
+
+    def __init__(self, connected=True, delay=0.0, error=None):
+        self.connected = connected
+        self.delay = delay
+        self.error = error
+        self.pings = 0
+
+    def is_connected(self):
+        return self.connected
+
+    async def query_raw(self, query):
+        self.pings += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [{"1": 1}]
+
+
+def test_ping_is_cached_and_shared_by_concurrent_checks():
+    readiness = Readiness(ttl=2.0, timeout=1.0)
+    db = PingDb(delay=0.01)
+
+    async def run():
+        return await asyncio.gather(*(readiness.ping(db) for _ in range(5)))
+
+    assert asyncio.run(run()) == [(True, None)] * 5
+    assert asyncio.run(readiness.ping(db)) == (True, None)
+    assert db.pings == 1
+    # El ping vigente caduca a los `ttl` segundos
+    readiness._checked_at -= 2.5
+    asyncio.run(readiness.ping(db))
+    assert db.pings == 2
+
+
+@pytest.mark.parametrize("db, error", [
+    (PingDb(connected=False), "sin conexión"),
+    (PingDb(delay=0.2), "sin respuesta en 0.05 s"),
+    (PingDb(error=RuntimeError("Can't reach database server")), "Can't reach database server"),
+])
+def test_ping_failures_are_reported(db, error):
+    readiness = Readiness(ttl=0.0, timeout=0.05)
+    assert asyncio.run(readiness.ping(db)) == (False, error)
+
+
+def test_startup_timer_records_phases_even_when_they_fail():
+    timer = StartupTimer()
+    with timer.phase("conexión"):
+        pass
+    with pytest.raises(RuntimeError):
+        with timer.phase("snapshot"):
+            raise RuntimeError("fallo")
+    timer.finish()
+    assert set(timer.phases) == {"conexión", "snapshot", "total"}
+    assert timer.phases["total"] >= timer.phases["conexión"]
+
+
+def test_ready_route_requires_startup_and_database(api, monkeypatch):
+    from app import main
+
+    readiness = Readiness(ttl=0.0, timeout=1.0)
+    monkeypatch.setattr(main, "readiness", readiness)
+    monkeypatch.setattr(main, "prisma", PingDb())
+
+    status, body = asyncio.run(api.request("GET", "/ready"))
+    assert status == 503
+    assert json.loads(body)["status"] == "not_ready"
+
+    readiness.mark_ready()
+    status, body = asyncio.run(api.request("GET", "/ready"))
+    assert status == 200
+    assert json.loads(body)["database"] == "ok"
+
+
+def test_warm_up_reads_replicas_then_the_primary(fresh_snapshot, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(warmup_service.logger, "warning", lambda message, *args: warnings.append(message % args))
+    monkeypatch.setattr(settings, "warmup_concurrency", 2)
+    primary, replica = FakeDb(), FakeDb()
+    for db in (primary, replica):
+        db.add_razas(make_raza("R1"))
+        db.add_animals(make_animal("A1"), make_animal("A2"))
+    replica.is_connected = lambda: True
+    monkeypatch.setattr(warmup_service, "replicas", [replica])
+
+    asyncio.run(WarmupService(primary).warm_up())
+
+    assert warnings == []
+    assert replica.methods("animal") and primary.methods("animal")
+
+
+def test_warm_up_failures_do_not_abort_startup(fresh_snapshot, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(warmup_service.logger, "warning", lambda message, *args: warnings.append(message % args))
+    monkeypatch.setattr(settings, "warmup_concurrency", 2)
+    monkeypatch.setattr(warmup_service, "replicas", [])
+    db = FakeDb()
+
+    async def broken(**kwargs):
+        raise RuntimeError("sin conexión")
+
+    db.animal.find_many = broken
+    asyncio.run(WarmupService(db).warm_up())
+    assert warnings == ["Consulta de calentamiento fallida: sin conexión"] * 2
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+
+from app.utils import response_cache as response_cache_module
+from app.utils.response_cache import MemoryCacheBackend, SharedCacheBackend
+from fakes import make_raza
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_memory_backend_invalidates_by_tag(clock):
+    backend = MemoryCacheBackend(max_entries=10, ttl=30)
+    run(backend.set("/a", b"a", '"1"', frozenset({"table:raza", "raza:R1"}), not_before=clock[0]))
+    run(backend.set("/b", b"b", None, frozenset({"table:raza"}), not_before=clock[0]))
+
+    assert run(backend.get("/a")) == (b"a", '"1"')
+    run(backend.invalidate(["raza:R1"]))
+    assert run(backend.get("/a")) is None
+    assert run(backend.get("/b")) == (b"b", None)
+
+
+def test_memory_backend_expires_and_evicts_least_recently_used(clock):
+    backend = MemoryCacheBackend(max_entries=2, ttl=30)
+    for key in ("/a", "/b"):
+        run(backend.set(key, key.encode(), None, frozenset(), not_before=clock[0]))
+    run(backend.get("/a"))
+    run(backend.set("/c", b"/c", None, frozenset(), not_before=clock[0]))
+    assert run(backend.get("/b")) is None
+    assert run(backend.get("/a")) is not None
+
+    clock[0] += 31
+    assert run(backend.get("/a")) is None
+
+
+def test_reads_started_before_an_invalidation_are_not_stored(clock):
+    backend = MemoryCacheBackend(max_entries=10, ttl=30)
+    started = clock[0]
+    clock[0] += 1
+    run(backend.invalidate(["raza:R1"]))
+    run(backend.set("/a", b"viejo", None, frozenset({"raza:R1"}), not_before=started))
+    assert run(backend.get("/a")) is None
+
+    run(backend.set("/a", b"nuevo", None, frozenset({"raza:R1"}), not_before=clock[0] + 1))
+    assert run(backend.get("/a")) == (b"nuevo", None)
+
+
+def test_shared_backend_sees_other_workers_invalidations(tmp_path):
+    path = str(tmp_path / "cache" / "responses.sqlite3")
+    first, second = SharedCacheBackend(path, ttl=30), SharedCacheBackend(path, ttl=30)
+    started = response_cache_module.time.time()
+
+    run(first.set("/a", b"a", '"1"', frozenset({"raza:R1"}), not_before=started))
+    assert run(second.get("/a")) == (b"a", '"1"')
+
+    run(second.invalidate(["raza:R1"]))
+    assert run(first.get("/a")) is None
+    # Una lectura iniciada antes de la invalidación no vuelve a guardar datos viejos
+    run(first.set("/a", b"viejo", None, frozenset({"raza:R1"}), not_before=started))
+    assert run(first.get("/a")) is None
+
+    run(first.set("/b", b"b", None, frozenset(), not_before=started))
+    run(second.clear())
+    assert run(first.get("/b")) is None
+
+
+def test_detail_route_serves_hits_until_a_write_invalidates(api):
+    api.db.add_razas(make_raza("R1", "Holstein"))
+
+    def get():
+        status, body = run(api.request("GET", "/api/v1/razas/R1"))
+        assert status == 200
+        return json.loads(body)["descripcion"]
+
+    def reads():
+        return sum(method.startswith("find") for method in api.db.methods("raza"))
+
+    assert get() == "Holstein"
+    assert get() == "Holstein"
+    assert reads() == 1
+
+    status, _ = run(api.request("PUT", "/api/v1/razas/R1", json_body={"descripcion": "Angus"}))
+    assert status == 200
+    # Sin invalidar, la entrada cacheada seguiría devolviendo la descripción anterior
+    assert get() == "Angus"
+
+
+def test_cached_entries_answer_conditional_requests(api):
+    api.db.add_razas(make_raza("R1", version=3))
+    run(api.request("GET", "/api/v1/razas/R1"))
+
+    status, body = run(api.request("GET", "/api/v1/razas/R1", headers={"If-None-Match": '"3"'}))
+    assert (status, body) == (304, b"")
+    assert len(api.db.methods("raza")) == 1
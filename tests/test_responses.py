@@ -0,0 +1,37 @@
+import json
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.schemas.animal import AnimalListResponse, AnimalResponse
+from app.schemas.raza import RazaResponse
+from app.utils.responses import _adapter, fast_json_response
+from fakes import make_animal, make_raza
+
+
+def test_matches_the_response_model_output():
+    animals = [make_animal("A1", raza=make_raza("R1", "Holstein")), make_animal("A2")]
+    data = dict(animals=animals, total=2, page=1, size=10)
+
+    response = fast_json_response(AnimalListResponse, data)
+
+    # Lo que habría devuelto FastAPI validando contra response_model
+    expected = jsonable_encoder(AnimalListResponse.model_validate(data, from_attributes=True), by_alias=True)
+    assert json.loads(response.body) == expected
+    assert expected["animals"][0]["raza"] == {"descripcion": "Holstein", "codRaza": "R1"}
+    assert response.media_type == "application/json"
+
+
+def test_keeps_status_and_headers():
+    response = fast_json_response(
+        AnimalResponse, make_animal("A1"), status_code=201, headers={"ETag": '"1"'}
+    )
+    assert response.status_code == 201
+    assert response.headers["etag"] == '"1"'
+    assert json.loads(response.body)["codAnimal"] == "A1"
+
+
+def test_serializes_plain_lists_and_reuses_the_adapter():
+    response = fast_json_response(List[RazaResponse], [make_raza("R1"), make_raza("R2")])
+    assert [raza["codRaza"] for raza in json.loads(response.body)] == ["R1", "R2"]
+    assert _adapter(List[RazaResponse]) is _adapter(List[RazaResponse])
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.search_index import SearchIndex, tokenize
+from app.services import search_service
+from app.services.search_service import SearchService
+from app.utils.exceptions import ValidationError
+from fakes import FakeDb, make_animal, make_raza
+
+
+def loaded_index(*documents) -> SearchIndex:
+    index = SearchIndex()
+    index.loaded = True
+    for document in documents:
+        index.put(*document)
+    return index
+
+
+def test_tokenize_lowercases_and_strips_accents():
+    assert tokenize("Toro ÑANDÚ, pelaje-marrón") == ["toro", "nandu", "pelaje", "marron"]
+
+
+def test_search_ranks_rare_terms_first_and_filters_by_type():
+    index = loaded_index(
+        ("animal", "A1", "vaca negra"),
+        ("animal", "A2", "vaca blanca"),
+        ("animal", "A3", "vaca lechera negra"),
+        ("raza", "R1", "Lechera holandesa"),
+    )
+
+    ranked = index.search("negra lechera", 0, 10)
+    assert [row[1] for row in ranked] == ["A3", "A1", "R1"]
+    assert [row[1] for row in index.search("lechera", 0, 10, tipo="raza")] == ["R1"]
+    assert [row[1] for row in index.search("vaca", 1, 1)] == ["A2"]
+
+
+def test_updates_replace_terms_and_are_ignored_until_loaded():
+    index = loaded_index(("animal", "A1", "vaca negra"))
+    index.put("animal", "A1", "toro")
+    assert index.search("vaca", 0, 10) == []
+    index.remove("animal", "A1")
+    assert len(index) == 0
+
+    unloaded = SearchIndex()
+    unloaded.put("animal", "A1", "vaca")
+    assert len(unloaded) == 0
+
+
+def test_load_pages_the_table_and_keeps_writes_made_meanwhile():
+    db = FakeDb()
+    db.add_razas(make_raza("R1", "Holstein"))
+    db.add_animals(*(make_animal(f"A{i}", descripcion=f"vaca {i}") for i in range(5)))
+    index = SearchIndex()
+    find_razas = db.raza.find_many
+
+    async def find_razas_during_writes(**kwargs):
+        # Escrituras de otras solicitudes mientras se construye el índice
+        index.put("animal", "A9", "toro nuevo")
+        index.remove("animal", "A0")
+        return await find_razas(**kwargs)
+
+    db.raza.find_many = find_razas_during_writes
+    asyncio.run(index.load(db, chunk_size=2))
+
+    assert index.loaded
+    assert [args["take"] for table, method, args in db.calls if table == "animal"] == [2, 2, 2]
+    assert {row[1] for row in index.search("vaca", 0, 10)} == {"A1", "A2", "A3", "A4"}
+    assert [row[1] for row in index.search("toro", 0, 10)] == ["A9"]
+    assert index.search("holstein", 0, 10)[0][:2] == ("raza", "R1")
+
+
+def test_service_pages_the_memory_ranking(monkeypatch):
+    monkeypatch.setattr(settings, "search_backend", "memory")
+    monkeypatch.setattr(search_service, "search_index", loaded_index(
+        *(("animal", f"A{i}", "vaca") for i in range(3))
+    ))
+    service = SearchService(FakeDb())
+
+    results, cursor = asyncio.run(service.search("vaca", limit=2))
+    assert [result.codigo for result in results] == ["A0", "A1"]
+    results, cursor = asyncio.run(service.search("vaca", limit=2, cursor=cursor))
+    assert [result.codigo for result in results] == ["A2"]
+    assert cursor is None
+
+    with pytest.raises(ValidationError):
+        asyncio.run(service.search("   "))
+
+
+def test_fulltext_backend_sends_one_subquery_per_type(monkeypatch):
+    monkeypatch.setattr(settings, "search_backend", "fulltext")
+
+    class RawDb:
+        async def query_raw(self, query, *params):
+            self.query, self.params = query, params
+            return [{"tipo": "raza", "codigo": "R1", "descripcion": "Holstein", "score": "1.5"}]
+
+    db = RawDb()
+    results, cursor = asyncio.run(SearchService(db).search("holstein", limit=5, tipo="raza"))
+
+    assert db.query.count("MATCH(`Descripcion`)") == 2 and "`Animales`" not in db.query
+    assert db.params == ("holstein", "holstein", 6, 6, 0)
+    assert results[0].score == 1.5 and cursor is None
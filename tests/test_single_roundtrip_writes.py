@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from prisma.errors import ForeignKeyViolationError
+
+from app.schemas.animal import AnimalCreate
+from app.schemas.raza import RazaCreate
+from app.services.animal_service import AnimalService
+from app.services.raza_service import RazaService
+from app.utils.exceptions import AlreadyExistsError, NotFoundError, ValidationError
+from fakes import FakeDb, make_animal, make_raza
+
+
+def new_animal(cod_animal: str, cod_raza: str = "R1") -> AnimalCreate:
+    return AnimalCreate(
+        codAnimal=cod_animal, descripcion="Nuevo", sexo="F", edad=2,
+        codRaza=cod_raza, colorPelaje="Blanco", colorOjos="Azul"
+    )
+
+
+def test_create_animal_writes_without_a_pre_check(fresh_snapshot):
+    db = FakeDb()
+    db.add_razas(make_raza("R1"))
+
+    animal = asyncio.run(AnimalService(db).create_animal(new_animal("A1")))
+
+    assert animal.codAnimal == "A1"
+    assert db.methods("animal") == ["create"]
+    assert db.raza.rows["R1"].totalAnimales == 1
+
+
+def test_duplicate_animal_maps_to_already_exists_and_rolls_back(fresh_snapshot):
+    db = FakeDb()
+    db.add_razas(make_raza("R1", totalAnimales=1))
+    db.add_animals(make_animal("A1"))
+
+    with pytest.raises(AlreadyExistsError):
+        asyncio.run(AnimalService(db).create_animal(new_animal("A1")))
+    assert db.raza.rows["R1"].totalAnimales == 1
+    assert ("tx", "rollback", {}) in db.calls
+
+
+def test_missing_raza_maps_to_not_found(fresh_snapshot):
+    db = FakeDb()
+    with pytest.raises(NotFoundError):
+        asyncio.run(AnimalService(db).create_animal(new_animal("A1", "R9")))
+    assert db.animal.rows == {}
+
+
+def test_duplicate_raza_maps_to_already_exists(fresh_snapshot):
+    db = FakeDb()
+    db.add_razas(make_raza("R1"))
+    with pytest.raises(AlreadyExistsError):
+        asyncio.run(RazaService(db).create_raza(RazaCreate(cod_raza="R1", descripcion="Otra")))
+    assert db.methods("raza") == ["create"]
+
+
+def test_delete_maps_missing_rows_and_foreign_keys(fresh_snapshot):
+    db = FakeDb()
+    service = RazaService(db)
+    with pytest.raises(NotFoundError):
+        asyncio.run(service.delete_raza("R9"))
+    with pytest.raises(NotFoundError):
+        asyncio.run(AnimalService(db).delete_animal("A9"))
+
+    async def restricted(**kwargs):
+        raise ForeignKeyViolationError({"user_facing_error": {"message": "Foreign key constraint failed"}})
+
+    db.raza.delete = restricted
+    with pytest.raises(ValidationError):
+        asyncio.run(service.delete_raza("R1"))
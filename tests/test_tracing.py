@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+from app.core.config import settings
+from app.utils import tracing
+from app.utils.tracing import (
+    SERVER_TIMING_MAX_QUERIES,
+    RequestTrace,
+    TracingMiddleware,
+    query_shape,
+    record_span,
+)
+
+
+def test_query_shape_drops_values():
+    first = query_shape("Animal", "find_many", {"where": {"codRaza": "R1"}, "take": 11, "include": None})
+    second = query_shape("Animal", "find_many", {"take": 5, "where": {"codRaza": "R2"}})
+    assert first == second == 'Animal.find_many {"take": "?", "where": {"codRaza": "?"}}'
+    assert query_shape("Animal", "find_many", {"where": {"codAnimal": {"in": ["A", "B"]}}}).endswith(
+        '{"where": {"codAnimal": {"in": ["?"]}}}'
+    )
+    assert query_shape(None, "query_raw", {"query": "SELECT 1", "args": [1]}) == "query_raw SELECT 1"
+
+
+def test_repeated_shapes_flag_n_plus_one():
+    trace = RequestTrace("GET", "/api/v1/razas/")
+    for code in ("R1", "R2", "R3"):
+        trace.add("Raza", "find_unique", {"where": {"codRaza": code}}, 0.0, 0.001)
+    trace.add("Animal", "count", {}, 0.0, 0.001)
+
+    assert trace.repeated_shapes(3) == {'Raza.find_unique {"where": {"codRaza": "?"}}': 3}
+    assert trace.repeated_shapes(4) == {}
+
+
+def test_server_timing_totals_and_caps_entries():
+    trace = RequestTrace("GET", "/")
+    for _ in range(SERVER_TIMING_MAX_QUERIES + 5):
+        trace.add("Animal", "find_many", {}, 0.0, 0.002)
+
+    header = trace.server_timing()
+    entries = header.split(", ")
+    assert entries[0] == f'db;dur={0.002 * (SERVER_TIMING_MAX_QUERIES + 5) * 1000:.2f};desc="25 consultas"'
+    assert entries[1].startswith("app;dur=")
+    assert len(entries) == 2 + SERVER_TIMING_MAX_QUERIES
+    assert entries[2] == 'q1;dur=2.00;desc="Animal.find_many"'
+
+
+async def _app_with_queries(scope, receive, send):
+    """Aplicación ASGI mínima que registra dos consultas iguales"""
+    for code in ("A1", "A2"):
+        record_span("Animal", "find_unique", {"where": {"codAnimal": code}}, 0.0, 0.003)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def test_middleware_adds_the_header_writes_spans_and_warns(tmp_path, monkeypatch):
+    span_file = tmp_path / "spans.ndjson"
+    warnings = []
+    monkeypatch.setattr(settings, "trace_span_file", str(span_file))
+    monkeypatch.setattr(settings, "trace_n_plus_one_threshold", 2)
+    monkeypatch.setattr(settings, "debug", True)
+    monkeypatch.setattr(tracing.logger, "warning", lambda message, *args: warnings.append(message % args))
+
+    headers = {}
+
+    async def run():
+        async def send(message):
+            if message["type"] == "http.response.start":
+                headers.update(message["headers"])
+
+        scope = {"type": "http", "method": "GET", "path": "/x", "headers": []}
+        await TracingMiddleware(_app_with_queries)(scope, None, send)
+
+    asyncio.run(run())
+
+    assert headers[b"server-timing"].startswith(b'db;dur=6.00;desc="2 consultas"')
+    records = [json.loads(line) for line in span_file.read_text(encoding="utf-8").splitlines()]
+    assert [(record["status"], record["model"], record["duration_ms"]) for record in records] == [
+        ("200", "Animal", 3.0), ("200", "Animal", 3.0)
+    ]
+    assert len(warnings) == 1 and "Posible N+1 en GET /x: 2 consultas" in warnings[0]
+